@@ -6,25 +6,32 @@ Apply the v5.7 SEO enhancements to already-published blog posts:
 
   1. Reviewer line in the article header + reviewedBy / MedicalWebPage
      fields in the Article JSON-LD.
-  2. "Related from the SteadiDay Blog" footer block (3 same-category
-     posts when possible, falling back to the curated related-category
-     graph, then most-recent).
+  2. "Related from the SteadiDay Blog" footer block (the 3 posts with
+     the most similar text, from the cached related_posts.py neighbour
+     table; without NumPy, same-category posts, falling back to the
+     curated related-category graph, then most-recent).
   3. FAQPage JSON-LD synthesized from each post's H2 headings + the
      first paragraph that follows. Only emitted when at least 2 usable
      pairs are extracted — otherwise the post is left without FAQ
      schema rather than shipping a low-quality version.
 
 Idempotent: re-running the script is safe; existing blocks are
-detected and skipped. Run from the repo root:
+detected and skipped. Publishing a post refreshes the related blocks
+it affects; --refresh-related recomputes every post's block instead
+(e.g. after changing the related-posts rules). Files are processed in
+parallel. Run from the repo root:
 
     python3 scripts/backfill_post_enhancements.py
+    python3 scripts/backfill_post_enhancements.py --refresh-related
 """
 
 from __future__ import annotations
 
+import argparse
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from html import escape
 from pathlib import Path
 
@@ -38,11 +45,13 @@ from generate_blog import (  # noqa: E402
     build_reviewer_jsonld,
     pick_related_posts,
     render_related_posts_block,
+    set_related_posts_block,
     _RELATED_CATEGORIES,
 )
+from post_catalog import CATALOG_PATH, load_posts  # noqa: E402
+from related_posts import neighbour_table  # noqa: E402
 
 BLOG_DIR = Path("blog")
-INDEX_PATH = BLOG_DIR / "index.html"
 
 # Markers we drop so re-runs detect prior work and skip it.
 REVIEWER_MARKER = 'class="article-reviewer"'
@@ -50,33 +59,6 @@ RELATED_MARKER = 'class="related-posts"'
 FAQ_MARKER = '"@type":"FAQPage"'
 
 
-def parse_index_categories(index_path: Path) -> dict[str, dict[str, str]]:
-    """Return {filename: {"title": ..., "category": ...}} pulled from the
-    blog index cards. The index is the only place category survives after
-    publish, so it's the source of truth for backfilling related-posts."""
-    if not index_path.exists():
-        return {}
-    content = index_path.read_text(encoding="utf-8")
-    cards = re.findall(
-        r'<article class="blog-card[^"]*">.*?</article>',
-        content,
-        re.DOTALL,
-    )
-    out: dict[str, dict[str, str]] = {}
-    for card in cards:
-        href_m = re.search(r'href="([^"]+\.html)"', card)
-        tag_m = re.search(r'class="blog-card-tag">([^<]+)</span>', card)
-        title_m = re.search(r'<h2><a [^>]+>([^<]+)</a></h2>', card)
-        if not href_m:
-            continue
-        fname = href_m.group(1).strip()
-        out[fname] = {
-            "title": title_m.group(1).strip() if title_m else "",
-            "category": tag_m.group(1).strip() if tag_m else "",
-        }
-    return out
-
-
 def parse_post(path: Path) -> dict:
     """Extract the fields the backfill needs: title (from <title>),
     h2 list, h1, and the body slice we'll splice into."""
@@ -234,25 +216,8 @@ def inject_related_posts(content: str, related_html: str) -> str:
     return content.replace(target, related_html + "\n    " + target, 1)
 
 
-def collect_existing_posts(index_map: dict) -> list[dict]:
-    """Build the post-list shape pick_related_posts() expects."""
-    posts = []
-    for fname, meta in index_map.items():
-        if not fname.startswith("20"):
-            continue
-        date_m = re.match(r'(\d{4}-\d{2}-\d{2})', fname)
-        posts.append({
-            "filename": fname,
-            "title": meta.get("title", ""),
-            "category": meta.get("category", ""),
-            "slug": re.sub(r'^\d{4}-\d{2}-\d{2}-', '', fname.replace('.html', '')),
-            "date": date_m.group(1) if date_m else "",
-        })
-    posts.sort(key=lambda p: p.get('date', ''), reverse=True)
-    return posts
-
-
-def process_file(path: Path, index_map: dict, existing_posts: list[dict]) -> dict:
+def process_file(path: Path, catalog: dict, existing_posts: list[dict],
+                 refresh_related: bool = False) -> dict:
     post = parse_post(path)
     original = post["content"]
     content = original
@@ -278,13 +243,16 @@ def process_file(path: Path, index_map: dict, existing_posts: list[dict]) -> dic
             content = inject_faq_jsonld(content, faqs)
             actions["faq"] = len(faqs)
 
-    if RELATED_MARKER not in content:
-        category = index_map.get(path.name, {}).get("category", "")
+    if refresh_related or RELATED_MARKER not in content:
+        category = catalog.get(path.name, {}).get("category", "")
         related = pick_related_posts(
             category, existing_posts, current_filename=path.name, n=RELATED_POSTS_COUNT,
         )
         related_html = render_related_posts_block(related)
-        new_content = inject_related_posts(content, related_html)
+        if refresh_related:
+            new_content = set_related_posts_block(content, related_html)
+        else:
+            new_content = inject_related_posts(content, related_html)
         if new_content != content:
             content = new_content
             actions["related"] = len(related)
@@ -294,15 +262,37 @@ def process_file(path: Path, index_map: dict, existing_posts: list[dict]) -> dic
     return actions
 
 
+_worker_state: dict = {}
+
+
+def _init_worker(catalog: dict, existing_posts: list[dict], refresh_related: bool) -> None:
+    # Shipped once per worker process rather than once per file.
+    _worker_state.update(catalog=catalog, existing_posts=existing_posts, refresh_related=refresh_related)
+
+
+def _process_in_worker(path: Path) -> dict:
+    return process_file(path, _worker_state["catalog"], _worker_state["existing_posts"],
+                        _worker_state["refresh_related"])
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Backfill the v5.7 SEO enhancements into published posts.")
+    parser.add_argument("--refresh-related", action="store_true",
+                        help="recompute every post's related-posts block, not just missing ones")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="files processed in parallel (default: CPU count)")
+    args = parser.parse_args()
     if not BLOG_DIR.is_dir():
         print(f"❌ {BLOG_DIR} not found — run from repo root.")
         sys.exit(1)
 
-    index_map = parse_index_categories(INDEX_PATH)
-    existing_posts = collect_existing_posts(index_map)
-    print(f"Loaded category map for {len(index_map)} posts from {INDEX_PATH}")
+    existing_posts = load_posts(str(BLOG_DIR))
+    catalog = {p["filename"]: p for p in existing_posts}
+    print(f"Loaded {len(catalog)} posts from {CATALOG_PATH}")
     print(f"Building related-posts pool from {len(existing_posts)} posts")
+    # Computed (or loaded) once here; forked workers inherit it and
+    # spawned ones read it back from the cache file.
+    neighbour_table(existing_posts, str(BLOG_DIR))
     print()
 
     targets = sorted(
@@ -310,8 +300,12 @@ def main():
         if p.name != "index.html"
     )
     totals = {"reviewer": 0, "schema": 0, "faq": 0, "related": 0}
-    for path in targets:
-        a = process_file(path, index_map, existing_posts)
+    workers = max(1, args.workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(catalog, existing_posts, args.refresh_related)) as pool:
+        results = list(pool.map(_process_in_worker, targets,
+                                chunksize=max(1, len(targets) // (4 * workers))))
+    for path, a in zip(targets, results):
         if any(a.values()):
             print(f"  [✓] {path.name}: {', '.join(k for k, v in a.items() if v)}")
             for k in totals:
@@ -325,7 +319,7 @@ def main():
     print(f"  reviewer line added: {totals['reviewer']}")
     print(f"  MedicalWebPage / reviewedBy added: {totals['schema']}")
     print(f"  FAQPage schema added: {totals['faq']}")
-    print(f"  related-posts block added: {totals['related']}")
+    print(f"  related-posts block {'rewritten' if args.refresh_related else 'added'}: {totals['related']}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark DedupIndex against the linear is_duplicate scan.
+
+Builds a synthetic corpus (default 10,000 posts) of titles in the blog's
+style, seeded with the real catalog, then checks a set of proposed
+titles (the real ones, reworded near-duplicates and unrelated topics)
+both ways. Every verdict, reason and matched filename must agree; the
+script exits non-zero on the first mismatch.
+
+    python3 scripts/bench_dedup.py               # 10k posts, 100 queries
+    python3 scripts/bench_dedup.py --posts 2000 --queries 500
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from dedup_index import DedupIndex, is_duplicate_scan
+from post_catalog import CATALOG_PATH
+
+SUBJECTS = [
+    "Balance", "Sleep", "Memory", "Blood Pressure", "Hearing", "Vision", "Arthritis",
+    "Walking", "Strength Training", "Hydration", "Medication", "Loneliness", "Gardening",
+    "Heart Health", "Bone Density", "Diabetes", "Stretching", "Tai Chi", "Nutrition",
+    "Fall Prevention", "Caregiving", "Retirement", "Volunteering", "Travel", "Brain Games",
+    "Vitamin D", "Cholesterol", "Posture", "Grip Strength", "Dental Care", "Skin Care",
+    "Breathing", "Meditation", "Budgeting", "Scams", "Smartphones", "Grandparenting",
+    "Shingles", "Cataracts", "Glaucoma", "Tinnitus", "Gout", "Osteoporosis", "Sciatica",
+    "Constipation", "Heartburn", "Insomnia", "Snoring", "Dementia", "Parkinson's", "Stroke",
+    "Atrial Fibrillation", "Anemia", "Thyroid", "Kidney Health", "Prostate Health",
+    "Menopause", "Hot Flashes", "Incontinence", "Neuropathy", "Plantar Fasciitis",
+    "Swimming", "Cycling", "Pilates", "Dancing", "Pickleball", "Golf", "Rowing",
+    "Fiber", "Protein", "Sodium", "Sugar", "Coffee", "Alcohol", "Fermented Foods",
+    "Mediterranean Diet", "Intermittent Fasting", "Supplements", "Probiotics", "Omega-3",
+    "Hobbies", "Friendship", "Grief", "Downsizing", "Home Safety", "Driving", "Pets",
+    "Telehealth", "Medicare", "Vaccines", "Flu Season", "Heat Waves", "Cold Weather",
+]
+ANGLES = [
+    "What the Research Says", "A Practical Plan", "Myths and Facts", "Questions to Ask Your Doctor",
+    "Small Daily Habits", "Warning Signs to Know", "A Beginner's Routine", "How It Changes With Age",
+    "What to Try First", "Simple Home Checks", "Mistakes to Avoid", "A Weekly Checklist",
+]
+LEADS = ["", "Why", "How", "The Truth About", "Rethinking", "Understanding", "Your Guide to"]
+OPENERS = ["", "New", "Daily", "Better", "Safer", "Morning", "Evening", "Winter", "Summer"]
+
+
+def _slugify(title):
+    return "-".join("".join(c for c in w.lower() if c.isalnum()) for w in title.split())[:60].strip("-")
+
+
+def synth_title(rng):
+    subject = rng.choice(SUBJECTS)
+    if rng.random() < 0.2:
+        subject = f"{subject} and {rng.choice(SUBJECTS)}"
+    head = " ".join(w for w in (rng.choice(LEADS), rng.choice(OPENERS), subject) if w)
+    return f"{head}: {rng.choice(ANGLES)}"
+
+
+def build_corpus(n, rng):
+    try:
+        with open(CATALOG_PATH, encoding="utf-8") as f:
+            real = list(json.load(f)["posts"].values())
+    except (OSError, ValueError, KeyError):
+        real = []
+    posts = [{"filename": p["filename"], "title": p["title"], "slug": p["slug"], "date": p["date"]}
+             for p in real]
+    today = datetime.now()
+    while len(posts) < n:
+        title = synth_title(rng)
+        date = (today - timedelta(days=rng.randint(0, 5 * 365))).strftime("%Y-%m-%d")
+        slug = _slugify(title)
+        posts.append({"filename": f"{date}-{slug}.html", "title": title, "slug": slug, "date": date})
+    return posts[:n]
+
+
+def build_queries(corpus, n, rng):
+    queries = []
+    for post in rng.sample(corpus, min(len(corpus), n // 3)):
+        words = post["title"].split()
+        rng.shuffle(words)  # reworded near-duplicate
+        queries.append(" ".join(words))
+    while len(queries) < n:
+        if rng.random() < 0.5:
+            queries.append(synth_title(rng))
+        else:
+            queries.append(f"{rng.choice(['Pickleball', 'Sourdough', 'Birdwatching', 'Ukulele'])} "
+                           f"for {rng.choice(['Beginners', 'Grandparents', 'Couples'])} Over 60")
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the indexed duplicate check.")
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    rng = random.Random(args.seed)
+    corpus = build_corpus(args.posts, rng)
+    queries = build_queries(corpus, args.queries, rng)
+
+    t0 = time.perf_counter()
+    index = DedupIndex(corpus)
+    build_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    indexed = [index.check(q, _slugify(q)) for q in queries]
+    index_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    scanned = [is_duplicate_scan(q, _slugify(q), corpus) for q in queries]
+    scan_s = time.perf_counter() - t0
+
+    for q, a, b in zip(queries, indexed, scanned):
+        if a != b:
+            print(f"❌ Mismatch for {q!r}:\n   index: {a}\n   scan:  {b}")
+            sys.exit(1)
+    dups = sum(1 for v in scanned if v[0])
+    print(f"✅ {len(queries)} queries x {len(corpus)} posts: verdicts identical ({dups} duplicates)")
+    print(f"   index build  {build_s * 1000:8.1f} ms")
+    print(f"   indexed      {index_s * 1000 / len(queries):8.2f} ms/query")
+    print(f"   linear scan  {scan_s * 1000 / len(queries):8.2f} ms/query "
+          f"({scan_s / max(index_s, 1e-9):.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Body-level near-duplicate detection: word shingles and MinHash.
+
+Every other dedup check (is_duplicate, the recent-theme list, the
+semantic check) looks at titles, slugs and meta descriptions, so two
+posts with different headlines and mostly the same advice both ship;
+the two daytime-napping posts are the known case.
+
+- article_text() takes the <div class="article-content"> body of a post
+  (or a bare content fragment, as the generator has it before render),
+  and shingles() turns it into the set of adjacent stemmed content-word
+  pairs, stop words dropped.
+- body_signature() is a NUM_PERM-value MinHash of that set, each value cut to
+  its low 16 bits (b-bit MinHash: a chance collision is 1 in 65536,
+  negligible next to the similarities that matter) and stored as hex in
+  the post's catalog entry ("body_minhash", post_catalog.py).
+- SignatureIndex estimates Jaccard from the signatures against every
+  indexed post (no banding; see below).
+- near_duplicates() only uses the estimate to screen: candidates at
+  BODY_SCREEN_THRESHOLD or more get their exact Jaccard from the
+  published pages' shingle sets, and only that is compared with
+  BODY_DUP_THRESHOLD.
+
+The generator writes every article fresh, so two posts on one subject
+share few exact word pairs: on the current corpus the napping pair
+scores 0.060 exactly, the distinct screening pair 0.036 and the median
+0.005. The MinHash estimate is too noisy to decide on at that spacing
+(the screening pair estimates at 0.043, sigma ~0.009), hence the exact
+second step. BODY_DUP_THRESHOLD sits between the two: a draft as close
+to a published post as the napping pair is rejected, one as close as
+the screening pair is not.
+
+There is no LSH banding. At similarities this low no split of NUM_PERM
+values into bands works: 64 bands of one row make an unrelated pair
+(0.005) a candidate 27% of the time and still miss the napping pair 2%
+of the time, and 128 bands of two rows miss it 63% of the time. A full
+scan is NUM_PERM comparisons per post, trivial at blog scale, and
+never misses.
+
+    python3 scripts/body_similarity.py                  # near-duplicate report
+    python3 scripts/body_similarity.py --threshold 0.03
+"""
+
+import argparse
+import hashlib
+import html
+import os
+import random
+import re
+import sys
+
+from dedup_index import STOP_WORDS, _stem
+
+NUM_PERM = 512
+# Estimated Jaccard at which a post gets an exact comparison.
+BODY_SCREEN_THRESHOLD = 0.03
+# Exact Jaccard at which a body is a near-duplicate and a draft is
+# rejected: above the distinct screening pair (0.036), at or below the
+# napping pair (0.060).
+BODY_DUP_THRESHOLD = 0.05
+# Drafts and stubs with fewer shingles than this get no signature.
+MIN_SHINGLES = 50
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5D1D)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def article_html(content):
+    """The article-content div up to the CTA box when present, otherwise
+    the whole fragment."""
+    start = content.find('<div class="article-content">')
+    if start >= 0:
+        content = content[start:]
+        end = content.find('<div class="cta-box">')
+        if end >= 0:
+            content = content[:end]
+    return content
+
+
+def article_text(content):
+    """Plain text of the article body (see article_html())."""
+    content = re.sub(r'(?is)<(script|style)\b.*?</\1>', ' ', article_html(content))
+    return html.unescape(re.sub(r'<[^>]+>', ' ', content))
+
+
+def shingles(text):
+    words = [_stem(w) for w in re.findall(r'[a-z0-9]+', text.lower().replace("'", ""))
+             if w not in STOP_WORDS]
+    return {int.from_bytes(hashlib.blake2b(f"{a} {b}".encode(), digest_size=8).digest(), "big") % _PRIME
+            for a, b in zip(words, words[1:])}
+
+
+def exact_similarity(a, b):
+    """Exact Jaccard similarity of two shingle sets."""
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def page_shingles(filename, blog_dir="blog"):
+    try:
+        with open(os.path.join(blog_dir, filename), encoding="utf-8") as f:
+            return shingles(article_text(f.read()))
+    except OSError:
+        return set()
+
+
+def body_signature(content):
+    """Hex MinHash signature of an article body, or "" when it is too short
+    to compare."""
+    values = shingles(article_text(content))
+    if len(values) < MIN_SHINGLES:
+        return ""
+    return "".join(f"{min((a * x + b) % _PRIME for x in values) & 0xFFFF:04x}" for a, b in _PERMS)
+
+
+def _values(sig):
+    return [sig[i:i + 4] for i in range(0, len(sig), 4)]
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two bodies from their signatures."""
+    a, b = _values(sig_a), _values(sig_b)
+    if not a or len(a) != len(b):
+        return 0.0
+    matches = sum(x == y for x, y in zip(a, b)) / len(a)
+    chance = 1 / 65536
+    return max(0.0, (matches - chance) / (1 - chance))
+
+
+class SignatureIndex:
+    """Signatures by key. query() estimates similarity against all of
+    them."""
+
+    def __init__(self):
+        self.signatures = {}
+
+    def add(self, key, sig):
+        if sig and key not in self.signatures:
+            self.signatures[key] = sig
+
+    def query(self, sig, threshold=BODY_DUP_THRESHOLD):
+        """[(estimated similarity, key)] at or above threshold, most
+        similar first."""
+        if not sig:
+            return []
+        hits = [(similarity(sig, other), k) for k, other in self.signatures.items()]
+        return sorted((h for h in hits if h[0] >= threshold), key=lambda h: (-h[0], h[1]))
+
+    def pairs(self, threshold=BODY_DUP_THRESHOLD):
+        """Every indexed pair at or above threshold, most similar first."""
+        out = {}
+        for key, sig in self.signatures.items():
+            for sim, other in self.query(sig, threshold):
+                if other != key:
+                    out[tuple(sorted((key, other)))] = sim
+        return sorted(((sim, a, b) for (a, b), sim in out.items()), key=lambda p: (-p[0], p[1], p[2]))
+
+
+_index_cache = (None, 0, None)
+
+
+def body_index_for(posts):
+    """SignatureIndex over catalog entries' body_minhash, keyed by filename.
+    Reused while the same list is passed in unchanged."""
+    global _index_cache
+    cached_posts, size, index = _index_cache
+    if cached_posts is not posts or size != len(posts):
+        index = SignatureIndex()
+        for post in posts:
+            index.add(post['filename'], post.get('body_minhash', ""))
+        _index_cache = (posts, len(posts), index)
+    return index
+
+
+def near_duplicates(content, posts, blog_dir="blog", threshold=BODY_DUP_THRESHOLD):
+    """[(exact similarity, filename)] for published posts whose body shares
+    at least `threshold` of its word pairs with content, most similar
+    first. Posts estimated below BODY_SCREEN_THRESHOLD are skipped; the
+    rest are compared exactly."""
+    values = shingles(article_text(content))
+    if len(values) < MIN_SHINGLES:
+        return []
+    sig = body_signature(content)
+    hits = [(exact_similarity(values, page_shingles(key, blog_dir)), key)
+            for _, key in body_index_for(posts).query(sig, BODY_SCREEN_THRESHOLD)]
+    return sorted((h for h in hits if h[0] >= threshold), key=lambda h: (-h[0], h[1]))
+
+
+def main():
+    from post_catalog import load_posts
+
+    parser = argparse.ArgumentParser(description="List blog posts whose bodies are near-duplicates.")
+    parser.add_argument("--blog-dir", default="blog")
+    parser.add_argument("--threshold", type=float, default=BODY_DUP_THRESHOLD,
+                        help=f"exact Jaccard similarity of the bodies' word pairs (default {BODY_DUP_THRESHOLD})")
+    args = parser.parse_args()
+    if not os.path.isdir(args.blog_dir):
+        print(f"❌ {args.blog_dir} not found — run from repo root.")
+        sys.exit(1)
+    posts = load_posts(args.blog_dir)
+    titles = {p['filename']: p['title'] for p in posts}
+    index = body_index_for(posts)
+    shingle_sets = {}
+
+    def exact(a, b):
+        for key in (a, b):
+            if key not in shingle_sets:
+                shingle_sets[key] = page_shingles(key, args.blog_dir)
+        return exact_similarity(shingle_sets[a], shingle_sets[b])
+
+    pairs = [(exact(a, b), a, b) for _, a, b in index.pairs(min(args.threshold, BODY_SCREEN_THRESHOLD))]
+    pairs = sorted((p for p in pairs if p[0] >= args.threshold), key=lambda p: (-p[0], p[1], p[2]))
+    print(f"{len(index.signatures)} post bodies, {len(pairs)} pair(s) at or above {args.threshold:.2f}")
+    for sim, a, b in pairs:
+        print(f"  {sim:.3f}  {a}\n         {b}\n         ({titles.get(a, '')} / {titles.get(b, '')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Title-level duplicate detection for generate_blog.py.
+
+is_duplicate() used to walk every existing post, re-normalise both
+strings and run two SequenceMatcher ratios per post (a third just to
+format the message). select_unique_topic() calls it for every pool
+topic, so a run cost topics x posts x title length.
+
+DedupIndex is built once per post list. It precomputes each post's
+normalised title and slug and stemmed keyword set, and only runs the
+per-post rules (is_duplicate_scan(), unchanged) on posts that can
+possibly match:
+
+- title / slug ratio: the blocks SequenceMatcher counts as matching form
+  a common subsequence, so ratio() <= 2 * LCS / (la + lb). _PackedLCS
+  computes the LCS against every post in one bit-parallel pass over the
+  query, and only posts whose bound reaches the threshold get a real
+  ratio.
+- keyword rules: both need at least two shared stemmed keywords, so an
+  inverted keyword -> posts map yields exactly the posts that qualify.
+
+Both filters are exact upper bounds rather than MinHash/LSH sketches, so
+the shortlist never drops a post the scan would flag. Shortlisted posts
+are then checked in list order with the scan's own rules, and the
+result, including reason text and matched filename, is identical to
+is_duplicate_scan(). scripts/bench_dedup.py checks this at 10k posts.
+
+The index also backs the semantic check's cascade in generate_blog.py:
+similar() ranks the whole corpus by weighted keyword overlap, and
+VerdictCache remembers the outcome per (title, corpus version).
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from difflib import SequenceMatcher
+
+# Posts within this many days are treated as "recent" for thematic dedup.
+# Any 2+ distinctive-keyword overlap with a recent post is a duplicate,
+# regardless of overall ratio. Catches cases like back-to-back Alzheimer's
+# drug posts that share {alzheimers, 2026} but no other vocabulary.
+RECENT_THEME_WINDOW_DAYS = 30
+
+# Slack on the ratio bounds so float rounding can never drop a candidate.
+_EPS = 1e-9
+
+STOP_WORDS = {'the','a','an','for','and','or','to','of','in','your','how','that','with','after','from','is','are','was','were','be','been','being','have','has','had','do','does','did','will','would','could','should','may','might','can','this','these','those','it','its','you','we','they','them','our','my','me','what','which','who','whom','when','where','why','not','no','so','if','but','as','at','by','on','up','about','into','over','than','then','too','very','just','also','more','most','some','any','all','each','every','simple','easy','best','top','guide','tips','ways','adults','seniors','50','over','after','really','complete','natural','naturally','better','healthy','health','improve'}
+
+
+def normalize_text(text):
+    text = text.lower().strip()
+    text = re.sub(r'[^a-z0-9\s]', '', text)
+    return re.sub(r'\s+', ' ', text)
+
+
+def _stem(word):
+    """Fold simple plural / -ing / -ed variants together so naps/napping/napped
+    all normalize to one form. Not a full stemmer — just enough to catch the
+    most common back-to-back-post duplicate patterns."""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    # -ing strip + drop doubled consonant: napping -> napp -> nap.
+    if word.endswith("ing") and len(word) > 5:
+        stem = word[:-3]
+        if len(stem) >= 3 and stem[-1] == stem[-2] and stem[-1] not in "aeiou":
+            stem = stem[:-1]
+        return stem
+    for suf in ("ers", "er", "ed", "es", "s"):
+        if word.endswith(suf) and len(word) > len(suf) + 2:
+            return word[:-len(suf)]
+    return word
+
+
+def get_content_words(text):
+    raw = set(normalize_text(text).split()) - STOP_WORDS
+    return {_stem(w) for w in raw}
+
+
+def _days_between(date_str_a, date_str_b):
+    """Days between two YYYY-MM-DD strings. Returns None if either is invalid."""
+    try:
+        a = datetime.strptime(date_str_a, '%Y-%m-%d').date()
+        b = datetime.strptime(date_str_b, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        return None
+    return abs((a - b).days)
+
+
+def _match_post(ntl, nsl, new_words, today_str, post, etl, esl, existing_words,
+                threshold_title, threshold_slug, title_possible=True, slug_possible=True):
+    """The per-post duplicate rules, in order. Returns the reason, or "".
+    A ratio whose upper bound is already below its threshold is skipped."""
+    if title_possible:
+        ratio = SequenceMatcher(None, ntl, etl).ratio()
+        if ratio >= threshold_title:
+            return f"Title similarity {ratio:.2f}"
+    if slug_possible:
+        ratio = SequenceMatcher(None, nsl, esl).ratio()
+        if ratio >= threshold_slug:
+            return f"Slug similarity {ratio:.2f}"
+    if new_words and existing_words:
+        overlap = new_words & existing_words
+        min_len = min(len(new_words), len(existing_words))
+        # Tighter rule for recent posts: any 2+ distinctive-keyword overlap
+        # is a thematic duplicate, regardless of ratio. This catches cases
+        # like back-to-back Alzheimer's drug posts that share only
+        # {alzheimers, 2026} but cover the same subject.
+        days = _days_between(today_str, post.get('date', ''))
+        if days is not None and days <= RECENT_THEME_WINDOW_DAYS and len(overlap) >= 2:
+            return f"Recent-post theme overlap ({overlap}, {days}d ago)"
+        # Original looser check applies to older posts.
+        if min_len > 0 and len(overlap) >= 2 and len(overlap) / min_len >= 0.6:
+            return f"Keyword overlap ({overlap})"
+    return ""
+
+
+def is_duplicate_scan(new_title, new_slug, existing_posts, threshold_title=0.55, threshold_slug=0.65):
+    """Reference implementation: check every post in order. Returns
+    (is_dup, reason, matched filename)."""
+    ntl, nsl = normalize_text(new_title), normalize_text(new_slug)
+    new_words = get_content_words(new_title)
+    today_str = datetime.now().strftime('%Y-%m-%d')
+    for post in existing_posts:
+        reason = _match_post(ntl, nsl, new_words, today_str, post,
+                             normalize_text(post['title']), normalize_text(post['slug']),
+                             get_content_words(post['title']), threshold_title, threshold_slug)
+        if reason:
+            return (True, reason, post['filename'])
+    return (False, "", "")
+
+
+class _PackedLCS:
+    """Longest-common-subsequence lengths of one query against many strings
+    at once (Hyyro's bit-parallel LCS). Every string gets a byte-aligned
+    segment of one big integer per character, with at least one spare bit
+    on top so the addition's carry never leaks into the next segment; a
+    query costs a few big-integer operations per query character, however
+    many strings there are."""
+
+    def __init__(self, strings):
+        self.lengths = [len(s) for s in strings]
+        self.offsets, pos = [], 0
+        for n in self.lengths:
+            self.offsets.append(pos)
+            pos += (n // 8 + 1) * 8
+        self.nbytes = pos // 8
+        masks, full = {}, bytearray(self.nbytes)
+        for s, off in zip(strings, self.offsets):
+            for j, c in enumerate(s):
+                byte, bit = (off + j) >> 3, 1 << ((off + j) & 7)
+                if c not in masks:
+                    masks[c] = bytearray(self.nbytes)
+                masks[c][byte] |= bit
+                full[byte] |= bit
+        self.masks = {c: int.from_bytes(m, "little") for c, m in masks.items()}
+        self.full = int.from_bytes(full, "little")
+
+    def lcs(self, query):
+        v, full = self.full, self.full
+        for ch in query:
+            m = self.masks.get(ch)
+            if m:
+                u = v & m
+                v = ((v + u) | (v - u)) & full
+        raw = v.to_bytes(self.nbytes, "little")
+        return [n - int.from_bytes(raw[off >> 3:(off >> 3) + n // 8 + 1], "little").bit_count()
+                for off, n in zip(self.offsets, self.lengths)]
+
+
+class DedupIndex:
+    """Precomputed duplicate-check structures over a list of posts (dicts
+    with title, slug, filename and optionally date). check() returns
+    exactly what is_duplicate_scan() would for the same list."""
+
+    def __init__(self, posts=()):
+        self.posts = []
+        self._titles = []   # normalised title per post
+        self._slugs = []
+        self._words = []
+        self._by_word = {}  # stemmed keyword -> [post index]
+        self._summary_words = []  # keywords only in the meta description
+        self._by_any_word = {}    # title or summary keyword -> [post index]
+        self._df = Counter()
+        self._packed = None  # (_PackedLCS titles, _PackedLCS slugs), rebuilt after add()
+        self._version = None
+        for post in posts:
+            self.add(post)
+
+    def __len__(self):
+        return len(self.posts)
+
+    def add(self, post):
+        i = len(self.posts)
+        self.posts.append(post)
+        self._titles.append(normalize_text(post['title']))
+        self._slugs.append(normalize_text(post['slug']))
+        words = get_content_words(post['title'])
+        self._words.append(words)
+        for w in words:
+            self._by_word.setdefault(w, []).append(i)
+        summary = get_content_words(post.get('meta_desc', '')) - words
+        self._summary_words.append(summary)
+        for w in words | summary:
+            self._by_any_word.setdefault(w, []).append(i)
+        self._df.update(words | summary)
+        self._packed = None
+        self._version = None
+
+    def version(self):
+        """Hash of every post's filename, title and summary. Changes
+        whenever a post is added, removed or retitled."""
+        if self._version is None:
+            h = hashlib.sha256()
+            for post in sorted(self.posts, key=lambda p: p['filename']):
+                h.update(json.dumps([post['filename'], post['title'], post.get('meta_desc', '')]).encode())
+            self._version = h.hexdigest()[:16]
+        return self._version
+
+    def similar(self, title, k):
+        """The k posts lexically closest to title, best first, as
+        (score, post). The score is the share of the title's IDF-weighted
+        keywords found in the post's title (full weight) or its summary
+        (half weight): 1.0 means every keyword is in the post's title, 0.0
+        means none appears anywhere in the post."""
+        words = get_content_words(title)
+        n = len(self.posts)
+        idf = {w: math.log((n + 1) / (self._df.get(w, 0) + 0.5)) for w in words}
+        total = sum(idf.values())
+        if not total:
+            return []
+        scores = Counter()
+        for w in words:
+            for i in self._by_any_word.get(w, ()):
+                scores[i] += idf[w] if w in self._words[i] else idf[w] / 2
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(score / total, self.posts[i]) for i, score in ranked]
+
+    def pack(self):
+        if self._packed is None:
+            self._packed = (_PackedLCS(self._titles), _PackedLCS(self._slugs))
+        return self._packed
+
+    @staticmethod
+    def _ratio_candidates(text, packed, threshold):
+        """Posts whose ratio against text could reach threshold. The
+        matching blocks SequenceMatcher counts form a common subsequence,
+        so ratio() <= 2 * LCS / (la + lb)."""
+        la, out = len(text), set()
+        for i, (common, lb) in enumerate(zip(packed.lcs(text), packed.lengths)):
+            total = la + lb
+            if not total or 2.0 * common / total >= threshold - _EPS:
+                out.add(i)
+        return out
+
+    def check(self, new_title, new_slug, threshold_title=0.55, threshold_slug=0.65):
+        ntl, nsl = normalize_text(new_title), normalize_text(new_slug)
+        new_words = get_content_words(new_title)
+        titles, slugs = self.pack()
+        title_hits = self._ratio_candidates(ntl, titles, threshold_title)
+        slug_hits = self._ratio_candidates(nsl, slugs, threshold_slug)
+        shared = Counter()
+        for w in new_words:
+            shared.update(self._by_word.get(w, ()))
+        candidates = title_hits | slug_hits
+        candidates.update(i for i, n in shared.items() if n >= 2)
+        today_str = datetime.now().strftime('%Y-%m-%d')
+        for i in sorted(candidates):
+            post = self.posts[i]
+            reason = _match_post(ntl, nsl, new_words, today_str, post, self._titles[i],
+                                 self._slugs[i], self._words[i], threshold_title, threshold_slug,
+                                 i in title_hits, i in slug_hits)
+            if reason:
+                return (True, reason, post['filename'])
+        return (False, "", "")
+
+
+# Indexes for the post lists is_duplicate() has seen, keyed by identity.
+# Lists are treated as append-only: growth is added incrementally, any
+# other change in length rebuilds.
+_indexes = {}
+_indexes_lock = threading.Lock()
+_MAX_CACHED_INDEXES = 16
+
+
+def dedup_index_for(posts):
+    with _indexes_lock:
+        hit = _indexes.get(id(posts))
+        if hit is None or hit[0] is not posts or len(hit[1]) > len(posts):
+            hit = (posts, DedupIndex())
+            if len(_indexes) >= _MAX_CACHED_INDEXES:
+                del _indexes[next(iter(_indexes))]
+            _indexes[id(posts)] = hit
+        index = hit[1]
+        for post in posts[len(index):]:
+            index.add(post)
+        index.pack()
+        return index
+
+
+def is_duplicate(new_title, new_slug, existing_posts, threshold_title=0.55, threshold_slug=0.65):
+    """(is_dup, reason, matched filename) for a proposed title and slug
+    against existing_posts, via a DedupIndex cached for that list."""
+    return dedup_index_for(existing_posts).check(new_title, new_slug, threshold_title, threshold_slug)
+
+
+class VerdictCache:
+    """Semantic-duplicate verdicts on disk, keyed by (normalised title
+    hash, corpus version). A publish changes the corpus version, so old
+    verdicts are simply never looked up again; only the newest
+    `keep_versions` corpora are kept in the file."""
+
+    def __init__(self, path, keep_versions=4):
+        self.path = path
+        self.keep_versions = keep_versions
+        self.read = self.write = True
+        self._lock = threading.Lock()
+        self._data = None
+
+    def configure(self, read=True, write=True):
+        self.read, self.write = read, write
+
+    @staticmethod
+    def key(title):
+        return hashlib.sha256(normalize_text(title).encode()).hexdigest()[:16]
+
+    def _load(self):
+        if self._data is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def get(self, title, version):
+        if not self.read:
+            return None
+        with self._lock:
+            verdict = self._load().get(version, {}).get(self.key(title))
+        return tuple(verdict) if verdict else None
+
+    def put(self, title, version, verdict):
+        if not self.write:
+            return
+        with self._lock:
+            data = self._load()
+            data.setdefault(version, {})[self.key(title)] = list(verdict)
+            for stale in list(data)[:-self.keep_versions]:
+                del data[stale]
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.path)
+            except OSError:
+                pass  # read-only checkout: verdicts just aren't reused
@@ -1,6 +1,174 @@
 #!/usr/bin/env python3
 """
-SteadiDay Blog Generator v5.7
+SteadiDay Blog Generator v5.8
+
+v5.8 changes (pipeline latency / cost):
+- Concurrent research stage. The inline-image, hero, video and study
+  lookups are independent web-search round trips; run_research_stage()
+  now fires all four at once on daemon threads and waits at most
+  RESEARCH_STAGE_TIMEOUT seconds. A lookup that misses the deadline is
+  treated like a failed one and the existing fallbacks take over.
+  _used_images is guarded by a lock and picks are claimed atomically.
+- Title-first generation. main() now asks for a title with a short,
+  tool-free call (propose_title) and runs is_duplicate +
+  check_semantic_duplicate on it before any media research or the
+  4,500-token content call. Only a unique title moves on, and the content
+  prompt is told to use it verbatim. --no-title-first restores the old
+  write-then-check flow. The CLI moved to argparse; the positional topic
+  and --news arguments behave as before.
+- Speculative topic candidates. When the first topic is a duplicate (or in
+  --news mode) one web-search call now returns NEWS_TOPIC_CANDIDATES
+  topics; pick_unique_candidate() dedups all of them locally, runs the
+  survivors' semantic checks in parallel and takes the first that passes.
+  The old "three serial attempts, then sys.exit(1)" path is one round.
+  --candidates K overrides the count; --candidates 1 restores the serial
+  retries.
+- Prompt caching. The content and news-topic prompts are rebuilt as
+  stable prefix blocks marked with cache_control, followed by the
+  per-topic tail. The content prefix is CONTENT_GUIDELINES, which now
+  carries the whole WRITING_STYLES catalogue (the tail names the style)
+  so it clears Sonnet's 1024-token cache minimum; its related-posts
+  list is ranked per topic and sits in the tail. The news-topic prefix
+  is NEWS_TOPIC_GUIDELINES plus the run's existing-posts list. The
+  semantic-dedup prompt (~200 tokens) is too short for any model's
+  minimum and is sent uncached. Every call now goes through llm_call(),
+  which logs cache hit / miss input tokens per call.
+- Model tiering. MODEL_ROUTES maps each call type (topic, title, images,
+  hero, video, studies, dedup, content) to a model: the flagship writes
+  the topic, title and article, FAST_MODEL handles the lookups and the
+  UNIQUE/DUPLICATE classifier. Override with STEADIDAY_MODEL_<TYPE> or
+  --model TYPE=MODEL. A per-call-type / per-model latency and token
+  summary prints at the end of every run.
+- Shared request scheduler (llm_scheduler.py) replaces call_with_retry's
+  30s * 2**n sleeps. Per-model token buckets pace requests and input
+  tokens, retries use full-jitter backoff or the server's retry-after,
+  and a 429 pauses every caller of that model. --budget SECONDS
+  (RUN_BUDGET_SECONDS by default) caps the run: afterwards the image,
+  hero, video and study lookups are skipped rather than waited on. The
+  SDK client is built with max_retries=0 so it doesn't retry on its own.
+- LLM response cache (llm_cache.py, .cache/llm/). llm_call() looks each
+  request up by a SHA-256 of model + tools + prompt before calling the
+  API; TTLs per call type live in LLM_CACHE_TTL and the directory is
+  kept under LLM_CACHE_MAX_BYTES by LRU eviction. A rerun after a late
+  failure replays the calls it already paid for. --refresh bypasses
+  lookups, --no-cache disables it entirely.
+- Run checkpoints (run_checkpoints.py, .cache/runs/<run-id>/). The
+  chosen topic, news candidates, research results, article text, the
+  final deduplicated post and the Buttondown draft are each recorded
+  as they finish; --resume <run-id> (or "latest") replays them and
+  carries on from the first missing stage. Rendering, the index, RSS
+  and the sitemap always re-run (update_blog_index() now skips a post
+  it already lists). Stale runs are garbage-collected at startup.
+- Streaming content call. llm_stream() feeds the article to
+  parse_post_header() as it arrives; when the content call picks its own
+  title (--no-title-first), the slug and local duplicate check run the
+  moment the TITLE line is complete and the semantic check starts in the
+  background. A duplicate closes the stream instead of paying for the
+  rest of the article. Related posts are picked before the call.
+- Backlog mode: --count N plans N (+BATCH_SPARE_TOPICS) topics that are
+  unique against the corpus and each other, writes the posts
+  BATCH_WORKERS at a time off one corpus scan, and claims each title
+  against the rest of the batch before its article is written. The
+  index, RSS feed and sitemap are written once at the end; dates go back
+  from today --spacing days apart (BATCH_DATE_SPACING_DAYS).
+- Post catalog (post_catalog.py, data/post_catalog.json). The existing-
+  posts scan, the RSS feed and the recent-image set all read one
+  catalog refreshed by mtime + hash instead of re-reading every post.
+  This also fixes get_existing_posts() returning empty titles (it read
+  only the first 8000 bytes, and the <h1> sits after the style block)
+  and empty categories (only the index cards carry them), which had
+  silently disabled the semantic duplicate check.
+- Indexed duplicate check (dedup_index.py). is_duplicate() no longer
+  runs SequenceMatcher against every post: a DedupIndex per post list
+  shortlists posts by length window, character-count bound and shared
+  keywords, all exact bounds, and applies the unchanged rules only to
+  those, so verdicts match the old scan. scripts/bench_dedup.py checks
+  that against the scan at 10k posts.
+- Semantic dedup cascade. check_semantic_duplicate() first looks for a
+  verdict for the same title and corpus version (.cache/
+  dedup_verdicts.json), then scores the title against the whole corpus
+  by IDF-weighted keyword overlap: clearly unique (below
+  SEMANTIC_UNIQUE_BELOW) or clearly a repeat (SEMANTIC_DUPLICATE_AT and
+  up) is settled locally. Only the band between reaches the LLM, which
+  now sees the SEMANTIC_DEDUP_TOP_K most similar posts of any age, with
+  dates, instead of the newest 25. Telemetry reports the calls saved.
+- Body-level dedup (body_similarity.py). Each catalog entry carries a
+  MinHash signature of the article body's word pairs; a finished draft
+  is screened against every signature before it is saved and the close
+  ones are compared by exact Jaccard. A body at BODY_DUP_THRESHOLD (as
+  close as the two napping posts) is rejected like a duplicate title
+  (the next candidate topic is tried).
+  `python3 scripts/body_similarity.py` lists near-duplicate pairs
+  across the corpus.
+- Relevance-ranked prompt context (post_search.py). The title and
+  content prompts list the PROMPT_CONTEXT_TOP_K existing posts that best
+  match the topic under BM25 over titles, meta descriptions and section
+  headings (now in the catalog), instead of the 15 newest. The news-
+  topic call, which has no topic yet, lists the newest
+  PROMPT_CONTEXT_TOP_K.
+- Local internal links (internal_links.py). The content prompt no
+  longer asks the model for internal links it had no URLs for; after
+  writing, anchor phrases from other posts' SEO keywords are linked in
+  the article body (at most MAX_INTERNAL_LINKS, one per target post).
+  `python3 scripts/internal_links.py` backfills published posts.
+- Related posts by content (related_posts.py). The footer block now
+  lists the posts whose text is most similar under TF-IDF cosine
+  (NumPy), chosen after the article is written; category breaks ties,
+  and the category rules below only fill what is left (or everything,
+  without NumPy). Published posts' neighbours are one cached table,
+  shared with backfill_post_enhancements.py.
+- Related blocks refreshed on publish. Older posts' footers were
+  written once, so new posts never appeared in them. After saving,
+  publish_posts() re-picks the related posts of every post whose
+  neighbours now include a new one and rewrites just those blocks in
+  place. `backfill_post_enhancements.py --refresh-related` recomputes
+  every block, in parallel across files.
+- Planned pool topics (topic_planner.py). `python3 scripts/topic_planner.py`
+  precomputes the next pool topics, cooldown- and dedup-clean and
+  balanced across categories, into data/topic_schedule.json. Pool runs
+  take the next usable entry instead of probing the shuffled pool; an
+  entry leaves the schedule when its post is published, and the run
+  warns when the plan (or the pool behind it) is about to run out.
+  Without a schedule, select_unique_topic() picks as before.
+- Post source records (post_source.py, data/posts/). Publishing saves
+  each post's structured data (title, meta, keywords, content HTML,
+  hero, video, FAQs, category) as JSON next to the page, and
+  `python3 scripts/post_source.py rerender` rebuilds every page from
+  the current template in parallel, so a template change no longer
+  needs its own backfill script. `... import` recorded the existing
+  posts.
+- Cached, pooled URL checks (url_liveness.py). Unsplash and YouTube
+  liveness checks go through one LivenessChecker: verdicts are cached
+  on disk (.cache/url_liveness.json, live for a week, 404s for a
+  month), and a batch is checked concurrently over keep-alive
+  connections, at most MAX_PER_HOST per host. find_unsplash_images()
+  checks all its candidates in one batch, and the category hero pool
+  is now checked too (cached after the first run) before a fallback
+  hero is used.
+- Local image catalog (image_catalog.py, data/image_catalog.json).
+  Every photo a search accepts or a post publishes is kept with its alt
+  text, tags, category, last-verified date and the posts that used it.
+  Tags come from the alt text and category only. run_research_stage()
+  asks the catalog first: CATALOG_MIN_HITS matches with alt text replace
+  the inline image search, one more replaces the hero search, and only
+  a topic the catalog can't cover costs those calls.
+- Study and video library (source_library.py, data/source_library.json).
+  Studies and videos the searches find are verified (a 404 study link is
+  now dropped) and kept with tags, a verification date and an expiry.
+  LIBRARY_MIN_STUDIES matching studies replace the studies search and a
+  matching video (one the reuse window's posts didn't show) replaces
+  the video search; expired entries are re-checked in one batch before
+  use.
+- Image usage ledger (image_ledger.py, data/image_ledger.jsonl): one
+  appended line per photo per published post (photo, post, date, hero
+  or inline). The reuse window get_recently_used_images() builds from
+  it is a post count, a number of days or both (--image-window-posts,
+  --image-window-days), not "the 15 newest files".
+- Optional image mirror (image_mirror.py, --mirror-images): after
+  publishing, the new posts' and the index's Unsplash photos are fetched
+  once per width, recompressed (with Pillow, if installed) into
+  content-hashed files under assets/img/, and the pages are pointed at
+  them. `image_mirror.py serve` is an offline stand-in for Unsplash.
 
 v5.7 changes (SEO / E-E-A-T enhancements):
 - FAQPage JSON-LD on every post. The content prompt now asks for an
@@ -88,15 +256,50 @@ study/source linking, 6 writing styles, 16 categories, 120+ topics).
 """
 
 import anthropic
-from anthropic import APIStatusError
-import random, re, os, sys, glob, json, time, urllib.request, subprocess
+import argparse, random, re, os, sys, json, time, urllib.request, subprocess, threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from difflib import SequenceMatcher
+from body_similarity import near_duplicates
+from dedup_index import (RECENT_THEME_WINDOW_DAYS, VerdictCache, _days_between, dedup_index_for,
+                          get_content_words, is_duplicate)
+from image_catalog import ImageCatalog, post_images
+from image_ledger import load_ledger, recent_posts, record_post, recently_used
+from image_mirror import mirror_pages
+from internal_links import inject_internal_links
+from llm_cache import ResponseCache
+from llm_scheduler import RequestScheduler
+from post_catalog import load_posts
+from post_search import search_index_for
+from related_posts import neighbour_table, similar_posts
+from post_source import make_record, save_record
+from run_checkpoints import RunCheckpoints, gc as gc_runs
+from source_library import SourceLibrary
+from topic_planner import next_topic, remove_topics
+from url_liveness import DEAD, LIVE, LivenessChecker
 
 CLAUDE_MODEL = "claude-sonnet-4-6"
+FAST_MODEL = "claude-haiku-4-5"
+
+# Which model serves each call type. The article body (and the topic and
+# title that shape it) get the flagship; lookups that return a URL, an ID
+# or a short JSON list, and the UNIQUE/DUPLICATE classifier, run on the
+# fast tier. Override per call type with STEADIDAY_MODEL_<TYPE> (e.g.
+# STEADIDAY_MODEL_DEDUP) or --model TYPE=MODEL; see configure_models().
+MODEL_ROUTES = {
+    "topic": CLAUDE_MODEL,
+    "title": CLAUDE_MODEL,
+    "images": FAST_MODEL,
+    "hero": FAST_MODEL,
+    "video": FAST_MODEL,
+    "studies": FAST_MODEL,
+    "dedup": FAST_MODEL,
+    "content": CLAUDE_MODEL,
+}
 WEBSITE_URL = "https://www.steadiday.com"
 BLOG_BASE_URL = f"{WEBSITE_URL}/blog"
-APP_STORE_URL = "https://apps.apple.com/app/steadiday/id6758526744"
+# Campaign-tagged like every published post's CTA (ct=blog), so a
+# re-rendered page keeps its App Store attribution.
+APP_STORE_URL = "https://apps.apple.com/app/apple-store/id6758526744?pt=128322452&ct=blog&mt=8"
 
 # E-E-A-T signals for medical/health content. Replace with a real named
 # clinician when one is engaged (set "type" to "Person" and use their real
@@ -116,11 +319,86 @@ EDITORIAL_REVIEWER = {
 # crowding the CTA.
 RELATED_POSTS_COUNT = 3
 CATEGORY_COOLDOWN_WINDOW = 4
-# Posts within this many days are treated as "recent" for thematic dedup.
-# Any 2+ distinctive-keyword overlap with a recent post is a duplicate,
-# regardless of overall ratio. Catches cases like back-to-back Alzheimer's
-# drug posts that share {alzheimers, 2026} but no other vocabulary.
-RECENT_THEME_WINDOW_DAYS = 30
+# Wall-clock cap for the concurrent research stage (inline images, hero,
+# video, studies). Lookups still running at the deadline are abandoned and
+# the post falls back to the category pools / no video / generic sources,
+# so one slow web search can't hold up the other three.
+RESEARCH_STAGE_TIMEOUT = 180
+# Image-catalog matches needed before the inline image search is skipped;
+# the same floor find_unsplash_images() puts on a search result.
+CATALOG_MIN_HITS = 3
+# Source-library studies needed before the studies search is skipped
+# (find_relevant_studies() asks for two or three).
+LIBRARY_MIN_STUDIES = 2
+# Photos (and source-library videos) used by this many newest posts, or
+# within this many days (None: no day window), aren't picked again.
+# Overridable per run.
+IMAGE_REUSE_WINDOW_POSTS = 15
+IMAGE_REUSE_WINDOW_DAYS = None
+# How many news-driven topics to request at once when the first topic turns
+# out to be a duplicate (or in --news mode). All K are deduplicated in one
+# round and the first survivor is used, instead of up to three serial
+# generate-then-check attempts. 1 restores the serial retries.
+NEWS_TOPIC_CANDIDATES = 4
+# Shared rate limits for the scheduler that paces every Anthropic call
+# (per model; Tier 1 defaults) and the run's wall-clock budget. Once the
+# budget is spent, calls in OPTIONAL_CALL_TYPES fail fast with
+# BudgetExhausted and their stage falls back (category image pools, no
+# video, generic sources) instead of blocking the publish; the topic,
+# title, dedup and content calls always run.
+RATE_LIMIT_RPM = int(os.environ.get("STEADIDAY_RATE_LIMIT_RPM", "50"))
+RATE_LIMIT_INPUT_TPM = int(os.environ.get("STEADIDAY_RATE_LIMIT_INPUT_TPM", "30000"))
+RUN_BUDGET_SECONDS = 20 * 60
+OPTIONAL_CALL_TYPES = {"images", "hero", "video", "studies"}
+# On-disk response cache (llm_cache.py), keyed by a hash of the whole
+# request, so a rerun after a late failure replays the calls it already
+# paid for. TTLs are per call type: news-driven topics go stale within
+# the day, image / study lookups stay good for days.
+LLM_CACHE_DIR = os.path.join(".cache", "llm")
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024
+HOUR = 3600
+LLM_CACHE_TTL = {
+    "topic": 6 * HOUR, "title": 24 * HOUR, "dedup": 24 * HOUR, "content": 24 * HOUR,
+    "images": 7 * 24 * HOUR, "hero": 7 * 24 * HOUR, "video": 3 * 24 * HOUR,
+    "studies": 14 * 24 * HOUR,
+}
+# Unsplash / YouTube liveness verdicts (url_liveness.py), shared by every
+# image and video check in the run.
+URL_LIVENESS_PATH = os.path.join(".cache", "url_liveness.json")
+# oEmbed answers 400 for a malformed ID, 401 for private / embedding-
+# disabled videos and 404 for removed ones; either way the video can't be
+# shown. 403 (proxies) and 429 (throttling, likely with checks running
+# MAX_PER_HOST at a time) say nothing about the video, so they stay
+# inconclusive and are never cached as dead.
+YOUTUBE_DEAD_STATUSES = (400, 401, 404)
+# Study links that are gone. Publishers often refuse HEAD or bots (403,
+# 405), which proves nothing either way.
+STUDY_DEAD_STATUSES = (404, 410)
+# Per-run stage checkpoints (run_checkpoints.py) for --resume. Finished
+# runs are dropped after a day, abandoned ones after this many days.
+RUN_CHECKPOINT_DIR = os.path.join(".cache", "runs")
+RUN_CHECKPOINT_MAX_AGE_DAYS = 7
+# --count N (backlog mode): posts written at once, spare topics planned
+# on top of N in case some turn out to be duplicates, and the default
+# gap between the spread-out publication dates (newest is today).
+BATCH_WORKERS = 3
+BATCH_SPARE_TOPICS = 2
+BATCH_DATE_SPACING_DAYS = 3
+# Semantic dedup cascade. The best weighted keyword overlap between a
+# title and any post (DedupIndex.similar()) settles the clear cases
+# without an LLM call: below UNIQUE_BELOW nothing in the corpus shares a
+# distinctive word, at DUPLICATE_AT or above the title is essentially an
+# existing post's. Everything between goes to the LLM with the TOP_K most
+# similar posts from the whole corpus (topped up with the newest). Verdicts
+# are kept per (title, corpus version) in DEDUP_VERDICT_PATH.
+SEMANTIC_UNIQUE_BELOW = 0.15
+SEMANTIC_DUPLICATE_AT = 0.8
+SEMANTIC_DEDUP_TOP_K = 25
+DEDUP_VERDICT_PATH = os.path.join(".cache", "dedup_verdicts.json")
+# Existing posts listed as "do NOT duplicate" in the title and content
+# prompts: the best BM25 matches for the topic (post_search.py), not the
+# newest. The news-topic call has no topic yet and lists the newest.
+PROMPT_CONTEXT_TOP_K = 12
 
 VALID_CATEGORIES = [
     "Mental Wellness", "Medication Tips", "Healthy Aging", "Exercise",
@@ -138,6 +416,16 @@ WRITING_STYLES = [
     {"name": "lessons_learned", "instruction": """WRITING STYLE: Frame this as practical lessons — "5 things I wish I'd known about [topic] sooner." Use first-person plural ("we") to create warmth. Each section is a genuine insight, not obvious advice. Include at least one counterintuitive point. Use phrases like "What most people get wrong is..." This should feel like wisdom from someone who's been through it."""},
 ]
 
+# Shared by every prompt that asks the model for a title (news topic, title
+# proposal, content) so the v5.4 no-truncation rules can't drift apart.
+TITLE_RULES = """TITLE RULES (CRITICAL):
+- The title MUST be a COMPLETE, GRAMMATICAL phrase or sentence.
+- Target length: 50-60 characters. Hard maximum: 65 characters.
+- NEVER use ellipses ("...") or any trailing punctuation that suggests truncation.
+- If the full idea will not fit, SHORTEN the wording — do NOT cut off mid-thought.
+- A short complete title ("Why Morning Naps May Be a Warning Sign") is better than
+  a long fragment ("Daytime Napping and Mortality Risk: What Older...")."""
+
 
 # =============================================================================
 # Unsplash URL validation
@@ -156,146 +444,218 @@ def is_valid_unsplash_url(url):
     return bool(url and UNSPLASH_URL_PATTERN.match(url))
 
 
-def unsplash_url_is_live(url, timeout=10):
-    """HEAD-check an Unsplash URL. Returns False on a confirmed 404 (the photo
-    ID doesn't exist — almost always an LLM hallucination that happened to
-    match the format regex). Returns True for 200s, and also True on
-    inconclusive errors (sandbox blocks, transient network) so that dev
-    environments don't strip every image. The May 18 hero
-    photo-1727188222430-b5fa53a1faa6 is the canonical failure mode this
-    catches: format-valid but the photo doesn't exist."""
-    if not url:
-        return False
-    try:
-        req = urllib.request.Request(
-            url, method="HEAD", headers={"User-Agent": "Mozilla/5.0"}
-        )
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            return 200 <= getattr(resp, 'status', 200) < 400
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            return False
-        # 403 from a proxy, 5xx from Unsplash, etc. — inconclusive, accept.
-        return True
-    except Exception:
-        # Network failure / DNS / timeout — inconclusive, fall through.
-        return True
-
-
-def call_with_retry(func, max_retries=7, base_delay=30):
-    for attempt in range(max_retries + 1):
-        try:
-            return func()
-        except APIStatusError as e:
-            if e.status_code in (429, 529) or e.status_code >= 500:
-                if attempt == max_retries:
-                    raise
-                delay = base_delay * (2 ** attempt)
-                print(f"  API error {e.status_code} (attempt {attempt + 1}/{max_retries + 1}), retrying in {delay}s...")
-                time.sleep(delay)
-            else:
-                raise
-
-
-def get_existing_posts(blog_dir="blog"):
-    existing = []
-    if not os.path.exists(blog_dir):
-        return existing
-    for filepath in glob.glob(os.path.join(blog_dir, "*.html")):
-        filename = os.path.basename(filepath)
-        if filename == "index.html":
-            continue
-        try:
-            if os.path.getsize(filepath) < 1024:
-                continue
-        except OSError:
-            pass
-        title = category = meta_desc = date_str = ""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read(8000)
-                m = re.search(r'<h1[^>]*>(.*?)</h1>', content, re.DOTALL)
-                if m: title = re.sub(r'<[^>]+>', '', m.group(1)).strip()
-                cat_m = re.search(r'class="blog-card-tag">([^<]+)<', content)
-                if cat_m: category = cat_m.group(1).strip()
-                desc_m = re.search(r'<meta\s+name="description"\s+content="([^"]*)"', content)
-                if desc_m: meta_desc = desc_m.group(1).strip()
-        except Exception:
-            pass
-        date_match = re.match(r'(\d{4}-\d{2}-\d{2})', filename)
-        if date_match: date_str = date_match.group(1)
-        slug = re.sub(r'^\d{4}-\d{2}-\d{2}-', '', filename.replace('.html', ''))
-        existing.append({"filename": filename, "title": title, "slug": slug, "category": category, "meta_desc": meta_desc, "date": date_str})
-    existing.sort(key=lambda p: p.get('date', ''), reverse=True)
-    return existing
-
-
-def normalize_text(text):
-    text = text.lower().strip()
-    text = re.sub(r'[^a-z0-9\s]', '', text)
-    return re.sub(r'\s+', ' ', text)
-
-
-def _stem(word):
-    """Fold simple plural / -ing / -ed variants together so naps/napping/napped
-    all normalize to one form. Not a full stemmer — just enough to catch the
-    most common back-to-back-post duplicate patterns."""
-    if len(word) <= 3:
-        return word
-    if word.endswith("ies") and len(word) > 4:
-        return word[:-3] + "y"
-    # -ing strip + drop doubled consonant: napping -> napp -> nap.
-    if word.endswith("ing") and len(word) > 5:
-        stem = word[:-3]
-        if len(stem) >= 3 and stem[-1] == stem[-2] and stem[-1] not in "aeiou":
-            stem = stem[:-1]
-        return stem
-    for suf in ("ers", "er", "ed", "es", "s"):
-        if word.endswith(suf) and len(word) > len(suf) + 2:
-            return word[:-len(suf)]
-    return word
-
-
-def get_content_words(text):
-    stop = {'the','a','an','for','and','or','to','of','in','your','how','that','with','after','from','is','are','was','were','be','been','being','have','has','had','do','does','did','will','would','could','should','may','might','can','this','these','those','it','its','you','we','they','them','our','my','me','what','which','who','whom','when','where','why','not','no','so','if','but','as','at','by','on','up','about','into','over','than','then','too','very','just','also','more','most','some','any','all','each','every','simple','easy','best','top','guide','tips','ways','adults','seniors','50','over','after','really','complete','natural','naturally','better','healthy','health','improve'}
-    raw = set(normalize_text(text).split()) - stop
-    return {_stem(w) for w in raw}
-
-
-def _days_between(date_str_a, date_str_b):
-    """Days between two YYYY-MM-DD strings. Returns None if either is invalid."""
-    try:
-        a = datetime.strptime(date_str_a, '%Y-%m-%d').date()
-        b = datetime.strptime(date_str_b, '%Y-%m-%d').date()
-    except (ValueError, TypeError):
+def unsplash_urls_live(urls):
+    """{url: bool} for a batch of Unsplash URLs, HEAD-checked at once (and
+    cached, url_liveness.py). False only on a confirmed 404 (the photo ID
+    doesn't exist — almost always an LLM hallucination that happened to
+    match the format regex). Inconclusive errors (sandbox blocks, 403 from
+    a proxy, 5xx, timeouts) count as live so that dev environments don't
+    strip every image. The May 18 hero photo-1727188222430-b5fa53a1faa6 is
+    the canonical failure mode this catches: format-valid but the photo
+    doesn't exist."""
+    verdicts = _liveness.check_many(urls)
+    return {url: verdicts.get(url) != DEAD for url in urls if url}
+
+
+def unsplash_url_is_live(url):
+    """unsplash_urls_live() for one URL; False for an empty one."""
+    return bool(url) and unsplash_urls_live([url])[url]
+
+
+def configure_models(overrides=()):
+    """Apply model overrides to MODEL_ROUTES: STEADIDAY_MODEL_<TYPE> env
+    vars first, then `overrides` ("type=model" strings from --model), so
+    the CLI wins. Unknown call types are an error rather than a silent
+    no-op."""
+    for call_type in MODEL_ROUTES:
+        env_model = os.environ.get(f"STEADIDAY_MODEL_{call_type.upper()}")
+        if env_model:
+            MODEL_ROUTES[call_type] = env_model
+    for item in overrides:
+        call_type, sep, model = item.partition("=")
+        if not sep or call_type not in MODEL_ROUTES or not model:
+            raise SystemExit(f"--model expects TYPE=MODEL with TYPE one of {', '.join(MODEL_ROUTES)}; got {item!r}")
+        MODEL_ROUTES[call_type] = model
+
+
+def _estimate_input_tokens(kwargs):
+    """Rough input-token count for the rate-limit bucket: ~4 characters
+    per token over the system prompt and every text block."""
+    chars = len(str(kwargs.get("system", "")))
+    for m in kwargs.get("messages", []):
+        content = m.get("content", "")
+        if isinstance(content, str):
+            chars += len(content)
+        else:
+            chars += sum(len(b.get("text", "")) for b in content if isinstance(b, dict))
+    return chars // 4
+
+
+# One entry per Anthropic call: (call_type, model, seconds, input, output).
+# Appended from research-stage worker threads too, hence the lock.
+_call_log = []
+_call_log_lock = threading.Lock()
+
+
+# Shared by every thread in the run so rate limits and 429 backoff are
+# coordinated; main() restarts its budget clock from --budget.
+_scheduler = RequestScheduler(RATE_LIMIT_RPM, RATE_LIMIT_INPUT_TPM, RUN_BUDGET_SECONDS)
+_llm_cache = ResponseCache(LLM_CACHE_DIR, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL)
+_dedup_verdicts = VerdictCache(DEDUP_VERDICT_PATH)
+_liveness = LivenessChecker(URL_LIVENESS_PATH)
+_image_catalog = ImageCatalog()
+_source_library = SourceLibrary()
+# How each semantic check was settled: lexical / cached / llm.
+_semantic_tiers = {}
+_semantic_tiers_lock = threading.Lock()
+
+
+# The current run's checkpoints; None outside main() (backfills importing
+# this module), in which case checkpoint() just calls through.
+_run = None
+
+
+# Batch workers set .prefix so each post slot gets its own stage names.
+_stage_scope = threading.local()
+
+
+def checkpoint(name, fn, key=None):
+    """Return stage `name` from the current run's checkpoints, or run fn()
+    and record its result. See RunCheckpoints.stage()."""
+    name = getattr(_stage_scope, "prefix", "") + name
+    return _run.stage(name, fn, key) if _run else fn()
+
+
+def llm_call(client, call_type, **kwargs):
+    """Single entry point for Anthropic calls. `call_type` picks the model
+    from MODEL_ROUTES and labels the log line and telemetry; the remaining
+    kwargs go straight to client.messages.create(). Pacing and retries go
+    through the shared _scheduler; optional call types raise
+    BudgetExhausted once the run budget is spent. Identical requests
+    within the call type's TTL are answered from _llm_cache."""
+    kwargs.setdefault("model", MODEL_ROUTES[call_type])
+    cached = _llm_cache.get(call_type, kwargs)
+    if cached is not None:
+        print(f"  💾 {call_type}: response cache hit, no API call")
+        return cached
+    started = time.monotonic()
+    msg = _scheduler.call(lambda: client.messages.create(**kwargs), kwargs["model"],
+                          estimated_tokens=_estimate_input_tokens(kwargs),
+                          optional=call_type in OPTIONAL_CALL_TYPES, label=call_type)
+    _record_call(call_type, kwargs["model"], started, msg)
+    log_usage(call_type, msg)
+    _llm_cache.put(call_type, kwargs, msg)
+    return msg
+
+
+def llm_stream(client, call_type, on_text, **kwargs):
+    """Streaming llm_call(). `on_text(text_so_far)` runs after every
+    chunk; returning True closes the stream, so the rest of the output is
+    never generated or billed, and llm_stream() returns None. A retry
+    restarts the stream, which is why on_text gets the whole text so far
+    rather than the delta. Cache hits are fed to on_text in one piece."""
+    kwargs.setdefault("model", MODEL_ROUTES[call_type])
+    cached = _llm_cache.get(call_type, kwargs)
+    if cached is not None:
+        print(f"  💾 {call_type}: response cache hit, no API call")
+        return None if on_text(cached.content[0].text) else cached
+
+    def consume():
+        with client.messages.stream(**kwargs) as stream:
+            text = ""
+            for chunk in stream.text_stream:
+                text += chunk
+                if on_text(text):
+                    return None, stream.current_message_snapshot, len(text)
+            return stream.get_final_message(), None, len(text)
+
+    started = time.monotonic()
+    msg, partial, chars = _scheduler.call(consume, kwargs["model"],
+                                          estimated_tokens=_estimate_input_tokens(kwargs),
+                                          optional=call_type in OPTIONAL_CALL_TYPES, label=call_type)
+    _record_call(call_type, kwargs["model"], started, msg or partial)
+    if msg is None:
+        print(f"  ✂ {call_type}: stream stopped after {chars} characters")
         return None
-    return abs((a - b).days)
+    log_usage(call_type, msg)
+    _llm_cache.put(call_type, kwargs, msg)
+    return msg
+
+
+def _record_call(call_type, model, started, msg):
+    usage = getattr(msg, "usage", None)
+    with _call_log_lock:
+        _call_log.append((call_type, model, time.monotonic() - started,
+                          getattr(usage, "input_tokens", 0), getattr(usage, "output_tokens", 0)))
+
+
+def print_telemetry():
+    """Per-call-type and per-model latency summary for the run, so the
+    MODEL_ROUTES tiers can be tuned from real numbers. Latency includes
+    retry waits."""
+    with _call_log_lock:
+        calls = list(_call_log)
+    if _llm_cache.hits or _llm_cache.misses:
+        print(f"\nLLM response cache: {_llm_cache.hits} hit(s), {_llm_cache.misses} miss(es)")
+    if _liveness.cached or _liveness.fetched:
+        print(f"URL liveness: {_liveness.cached} from cache, {_liveness.fetched} checked")
+    with _semantic_tiers_lock:
+        tiers = dict(_semantic_tiers)
+    if tiers:
+        checks, saved = sum(tiers.values()), tiers.get("lexical", 0) + tiers.get("cached", 0)
+        print(f"Semantic dedup: {checks} check(s), {tiers.get('lexical', 0)} settled lexically, "
+              f"{tiers.get('cached', 0)} from the verdict cache, {tiers.get('llm', 0)} sent to the LLM "
+              f"({saved} LLM call(s) saved)")
+    if not calls:
+        return
+    print("\nLLM telemetry (calls | total s | mean s | max s | in/out tokens):")
+    for label, key in (("call type", lambda c: (c[0], c[1])), ("model tier", lambda c: (c[1],))):
+        groups = {}
+        for c in calls:
+            groups.setdefault(key(c), []).append(c)
+        print(f"  by {label}:")
+        for name, group in sorted(groups.items()):
+            secs = [c[2] for c in group]
+            print(f"    {' @ '.join(name):45} {len(group):3} | {sum(secs):7.1f} | {sum(secs)/len(secs):6.1f} | "
+                  f"{max(secs):6.1f} | {sum(c[3] for c in group)}/{sum(c[4] for c in group)}")
+
+
+def log_usage(call_type, msg):
+    """Print prompt-cache hit/miss input tokens for one call. A miss is
+    either written to the cache (cacheable prefix seen for the first time)
+    or plain uncached input (the per-call tail)."""
+    usage = getattr(msg, "usage", None)
+    if usage is None:
+        return
+    hit = getattr(usage, "cache_read_input_tokens", 0) or 0
+    written = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    print(f"  💾 {call_type}: cache hit {hit} / miss {written + usage.input_tokens} "
+          f"({written} written) input tokens, {usage.output_tokens} output")
+
+
+def cached_prompt(prefix_blocks, tail):
+    """Build a one-message prompt: the stable `prefix_blocks` first, each
+    marked as a prompt-cache breakpoint, then the per-call `tail`. Only
+    text that repeats across calls belongs in the prefix: a block that
+    changes per topic is written to the cache and never read back. Each
+    block gets its own breakpoint (the API allows four), so when a later
+    block changes (say the existing-posts list after a publish) the earlier
+    ones are still read from cache. The API silently ignores a prefix
+    below the model's minimum cacheable length (1024 tokens for Sonnet,
+    more for Haiku), so only use this for prefixes that clear it."""
+    content = [
+        {"type": "text", "text": block, "cache_control": {"type": "ephemeral"}}
+        for block in prefix_blocks if block
+    ]
+    content.append({"type": "text", "text": tail})
+    return [{"role": "user", "content": content}]
 
 
-def is_duplicate(new_title, new_slug, existing_posts, threshold_title=0.55, threshold_slug=0.65):
-    ntl, nsl = normalize_text(new_title), normalize_text(new_slug)
-    today_str = datetime.now().strftime('%Y-%m-%d')
-    for post in existing_posts:
-        etl, esl = normalize_text(post['title']), normalize_text(post['slug'])
-        if SequenceMatcher(None, ntl, etl).ratio() >= threshold_title:
-            return (True, f"Title similarity {SequenceMatcher(None, ntl, etl).ratio():.2f}", post['filename'])
-        if SequenceMatcher(None, nsl, esl).ratio() >= threshold_slug:
-            return (True, f"Slug similarity {SequenceMatcher(None, nsl, esl).ratio():.2f}", post['filename'])
-        new_words, existing_words = get_content_words(new_title), get_content_words(post['title'])
-        if new_words and existing_words:
-            overlap = new_words & existing_words
-            min_len = min(len(new_words), len(existing_words))
-            # Tighter rule for recent posts: any 2+ distinctive-keyword overlap
-            # is a thematic duplicate, regardless of ratio. This catches cases
-            # like back-to-back Alzheimer's drug posts that share only
-            # {alzheimers, 2026} but cover the same subject.
-            days = _days_between(today_str, post.get('date', ''))
-            if days is not None and days <= RECENT_THEME_WINDOW_DAYS and len(overlap) >= 2:
-                return (True, f"Recent-post theme overlap ({overlap}, {days}d ago)", post['filename'])
-            # Original looser check applies to older posts.
-            if min_len > 0 and len(overlap) >= 2 and len(overlap) / min_len >= 0.6:
-                return (True, f"Keyword overlap ({overlap})", post['filename'])
-    return (False, "", "")
+def get_existing_posts(blog_dir="blog"):
+    """Published posts, newest first, from the post catalog
+    (post_catalog.py): filename, title, slug, category, meta_desc, date,
+    hero, images, faq_count, hash."""
+    return load_posts(blog_dir)
 
 
 def get_recent_theme_keywords(existing_posts, days=RECENT_THEME_WINDOW_DAYS):
@@ -318,19 +678,12 @@ def get_recent_theme_keywords(existing_posts, days=RECENT_THEME_WINDOW_DAYS):
     return sorted(words)
 
 
-def check_semantic_duplicate(client, new_title, existing_posts):
-    if not existing_posts:
-        return False, ""
-    existing_info = [p['title'] + (f" — {p['meta_desc']}" if p.get('meta_desc') else "") for p in existing_posts if p['title']]
-    if not existing_info:
-        return False, ""
-    posts_list = "\n".join([f"- {info}" for info in existing_info[:25]])
-    prompt = f"""You are a blog content deduplication checker. Be STRICT about catching thematic overlap.
-
-PROPOSED NEW POST TITLE: "{new_title}"
+# Instructions for the semantic dedup call. Not cached: at ~200 tokens
+# they are far below the dedup model's minimum cacheable prefix, and the
+# existing-posts list after them is ranked for each proposed title.
+DEDUP_GUIDELINES = """You are a blog content deduplication checker. Be STRICT about catching thematic overlap.
 
-EXISTING POSTS (title + summary):
-{posts_list}
+You will be given a list of EXISTING POSTS and then a PROPOSED NEW POST TITLE.
 
 Flag as DUPLICATE if the proposed post would:
 - Cover the same primary medical condition, disease, drug, or treatment as a
@@ -343,59 +696,85 @@ Flag as DUPLICATE if the proposed post would:
 
 Reply with ONLY: UNIQUE or DUPLICATE OF: [existing title]"""
 
-    msg = call_with_retry(lambda: client.messages.create(model=CLAUDE_MODEL, max_tokens=200, messages=[{"role": "user", "content": prompt}]))
+
+def _semantic_llm_verdict(client, new_title, ranked, existing_posts):
+    seen, context = set(), []
+    for _, p in ranked:
+        seen.add(p['filename'])
+        context.append(p)
+    for p in existing_posts:
+        if len(context) >= SEMANTIC_DEDUP_TOP_K:
+            break
+        if p['title'] and p['filename'] not in seen:
+            context.append(p)
+    if not context:
+        return False, ""
+    posts_list = "\n".join(f"- {p.get('date') or 'undated'}: {p['title']}"
+                           + (f" — {p['meta_desc']}" if p.get('meta_desc') else "") for p in context)
+    prompt = (f"{DEDUP_GUIDELINES}\n\nEXISTING POSTS (most similar first; date: title — summary):\n"
+              f'{posts_list}\n\nPROPOSED NEW POST TITLE: "{new_title}"')
+    msg = llm_call(client, "dedup", max_tokens=200, messages=[{"role": "user", "content": prompt}])
     result = msg.content[0].text.strip()
     return (True, result) if result.startswith("DUPLICATE") else (False, "")
 
 
+def check_semantic_duplicate(client, new_title, existing_posts):
+    """Cascade: a cached verdict for this title and corpus, else a lexical
+    verdict when the best overlap is clearly low or clearly high, else
+    the LLM with the most similar posts. Returns (is_dup, reason)."""
+    if not existing_posts:
+        return False, ""
+    index = dedup_index_for(existing_posts)
+    version = index.version()
+    verdict, tier = _dedup_verdicts.get(new_title, version), "cached"
+    if verdict is None:
+        ranked = [(score, p) for score, p in index.similar(new_title, SEMANTIC_DEDUP_TOP_K) if p['title']]
+        best = ranked[0][0] if ranked else 0.0
+        if best < SEMANTIC_UNIQUE_BELOW:
+            verdict, tier = (False, ""), "lexical"
+        elif best >= SEMANTIC_DUPLICATE_AT:
+            verdict, tier = (True, f"DUPLICATE OF: {ranked[0][1]['title']} (keyword overlap {best:.2f})"), "lexical"
+        else:
+            verdict, tier = _semantic_llm_verdict(client, new_title, ranked, existing_posts), "llm"
+        _dedup_verdicts.put(new_title, version, verdict)
+    with _semantic_tiers_lock:
+        _semantic_tiers[tier] = _semantic_tiers.get(tier, 0) + 1
+    return verdict
+
+
 def get_recent_categories(existing_posts, window=CATEGORY_COOLDOWN_WINDOW):
     return [post.get('category', '') for post in existing_posts[:window] if post.get('category')]
 
 
-def get_content_summaries(existing_posts, limit=15):
-    summaries = [f"- [{p.get('category', 'Wellness')}] \"{p['title']}\"" + (f" — {p['meta_desc']}" if p.get('meta_desc') else "") for p in existing_posts[:limit] if p['title']]
+def get_content_summaries(existing_posts, query=None, limit=PROMPT_CONTEXT_TOP_K):
+    """Prompt list of existing posts: the `limit` most relevant to `query`
+    (BM25 over titles, descriptions and headings), or the newest when no
+    query is given."""
+    posts = [p for p in existing_posts if p['title']]
+    if query and posts:
+        posts = [p for _, p in search_index_for(existing_posts).search(query, limit) if p['title']]
+        if not posts:
+            return "None on closely related subjects."
+    summaries = [f"- [{p.get('category', 'Wellness')}] \"{p['title']}\"" + (f" — {p['meta_desc']}" if p.get('meta_desc') else "") for p in posts[:limit]]
     return "\n".join(summaries) if summaries else "None yet."
 
 
-def generate_news_driven_topic(client, existing_posts, excluded_categories=None):
-    content_summaries = get_content_summaries(existing_posts)
-    month, year = datetime.now().strftime('%B'), datetime.now().strftime('%Y')
-    category_note = f"\nDO NOT use these categories (used recently): {', '.join(excluded_categories)}" if excluded_categories else ""
-
-    forbidden = get_recent_theme_keywords(existing_posts)
-    if forbidden:
-        forbidden_note = (
-            "\nFORBIDDEN THEMES (these subjects appeared in posts within the last "
-            f"{RECENT_THEME_WINDOW_DAYS} days — pick a topic whose PRIMARY subject is NOT in this list):\n"
-            f"{', '.join(forbidden)}\n"
-            "If the news story you find primarily covers any of these subjects, reject it and find a different story."
-        )
-    else:
-        forbidden_note = ""
-
-    prompt = f"""Search for health news, medical studies, or updated clinical guidelines published
-in the last 2 weeks (it is currently {month} {year}) that are relevant to adults over 50.
+# Stable part of the news-topic prompt (cached prefix). The date, the number
+# of stories and the category exclusions go in the per-call tail.
+NEWS_TOPIC_GUIDELINES = f"""Search for health news, medical studies, or updated clinical guidelines
+that are relevant to adults over 50. The date, how many stories to find and any category
+restrictions are given at the end of this message.
 
 Good sources: NIH, CDC, Mayo Clinic, AARP, JAMA, The Lancet, NEJM, BMJ, Harvard Health,
 Johns Hopkins, WHO, FDA, AHA, Alzheimer's Association.
 
-Find a SPECIFIC, RECENT story — not evergreen advice. Good hooks include: new study findings,
+Find SPECIFIC, RECENT stories — not evergreen advice. Good hooks include: new study findings,
 updated treatment guidelines, seasonal health alerts, new FDA actions, public health trends.
 
-EXISTING POSTS (do NOT duplicate):
-{content_summaries}
-{category_note}{forbidden_note}
-
 Frame the topic through "what this means for your daily life." Present only evidence-based,
 factual information — no political opinions or editorial commentary.
 
-TITLE RULES (CRITICAL):
-- The title MUST be a COMPLETE, GRAMMATICAL phrase or sentence.
-- Target length: 50-60 characters. Hard maximum: 65 characters.
-- NEVER use ellipses ("...") or any trailing punctuation that suggests truncation.
-- If the full idea will not fit, SHORTEN the wording — do NOT cut off mid-thought.
-- A short complete title ("Why Morning Naps May Be a Warning Sign") is better than
-  a long fragment ("Daytime Napping and Mortality Risk: What Older...").
+{TITLE_RULES}
 
 FORMAT:
 TOPIC: [specific description referencing the actual study/guideline]
@@ -410,8 +789,59 @@ CATEGORY: [exactly one of: {"|".join(VALID_CATEGORIES)}]
 ANGLE: [what makes this timely — cite the specific source and date]
 SOURCE: [the news source, journal, or organization]"""
 
-    msg = call_with_retry(lambda: client.messages.create(model=CLAUDE_MODEL, max_tokens=1000, tools=[{"type": "web_search_20250305", "name": "web_search"}], messages=[{"role": "user", "content": prompt}]))
+
+def generate_news_driven_topic(client, existing_posts, excluded_categories=None):
+    return generate_news_topic_candidates(client, existing_posts, excluded_categories, k=1)[0]
+
+
+def generate_news_topic_candidates(client, existing_posts, excluded_categories=None, k=NEWS_TOPIC_CANDIDATES):
+    """Ask for k news-driven topics in ONE web-search call (cheaper than k
+    parallel searches, and the model can keep the stories distinct from
+    each other). Returns a list of topic dicts, best first; always at
+    least one entry, with the old single-topic defaults if parsing fails."""
+    content_summaries = get_content_summaries(existing_posts)
+    month, year = datetime.now().strftime('%B'), datetime.now().strftime('%Y')
+    category_note = f"\nDO NOT use these categories (used recently): {', '.join(excluded_categories)}" if excluded_categories else ""
+
+    forbidden = get_recent_theme_keywords(existing_posts)
+    if forbidden:
+        forbidden_note = (
+            "\nFORBIDDEN THEMES (these subjects appeared in posts within the last "
+            f"{RECENT_THEME_WINDOW_DAYS} days — pick a topic whose PRIMARY subject is NOT in this list):\n"
+            f"{', '.join(forbidden)}\n"
+            "If the news story you find primarily covers any of these subjects, reject it and find a different story."
+        )
+    else:
+        forbidden_note = ""
+
+    if k == 1:
+        story_instruction = "Find a SPECIFIC, RECENT story"
+        format_instruction = "Reply with ONE topic in the FORMAT above."
+    else:
+        story_instruction = (
+            f"Find {k} SPECIFIC, RECENT stories, each on a DIFFERENT primary subject "
+            "(different condition, drug, or organization), best first"
+        )
+        format_instruction = f"Reply with {k} topics in the FORMAT above, separated by a line containing only ---."
+
+    # Stable guidelines, then the per-run corpus context, then the per-call
+    # ask — so retries and candidate rounds reuse the cached prefix.
+    corpus_context = f"EXISTING POSTS (do NOT duplicate):\n{content_summaries}\n{forbidden_note}"
+    request = f"""It is currently {month} {year}. Look for items published in the last 2 weeks.
+{story_instruction} — not evergreen advice.
+{category_note}
+{format_instruction}"""
+    msg = llm_call(client, "topic", max_tokens=600 + 400 * k, tools=[{"type": "web_search_20250305", "name": "web_search"}],
+                   messages=cached_prompt([NEWS_TOPIC_GUIDELINES, corpus_context], request))
     response_text = "".join(block.text for block in msg.content if hasattr(block, 'text'))
+    blocks = [b for b in re.split(r'(?m)^(?=\s*TOPIC:)', response_text) if 'TOPIC:' in b] or [response_text]
+    results = [_parse_news_topic(b) for b in blocks[:k]]
+    for result in results:
+        print(f"  News source: {result.get('source', 'N/A')}")
+    return results
+
+
+def _parse_news_topic(response_text):
     topic = re.search(r'TOPIC:\s*(.+?)(?:\n|$)', response_text)
     title = re.search(r'TITLE:\s*(.+?)(?:\n|$)', response_text)
     kw = re.search(r'KEYWORD:\s*(.+?)(?:\n|$)', response_text)
@@ -420,9 +850,55 @@ SOURCE: [the news source, journal, or organization]"""
     source = re.search(r'SOURCE:\s*(.+?)(?:\n|$)', response_text)
     c = cat.group(1).strip() if cat else "Wellness"
     if c not in VALID_CATEGORIES: c = "Wellness"
-    result = {"topic": topic.group(1).strip() if topic else "Health tips for adults 50+", "keyword": kw.group(1).strip() if kw else "health tips seniors", "category": c, "suggested_title": title.group(1).strip() if title else "", "angle": angle.group(1).strip() if angle else "", "source": source.group(1).strip() if source else ""}
-    print(f"  News source: {result.get('source', 'N/A')}")
-    return result
+    return {"topic": topic.group(1).strip() if topic else "Health tips for adults 50+", "keyword": kw.group(1).strip() if kw else "health tips seniors", "category": c, "suggested_title": title.group(1).strip() if title else "", "angle": angle.group(1).strip() if angle else "", "source": source.group(1).strip() if source else ""}
+
+
+def pick_unique_candidate(client, candidates, existing_posts):
+    """First survivor of pick_unique_candidates(), or None."""
+    chosen = pick_unique_candidates(client, candidates, existing_posts, n=1)
+    return chosen[0] if chosen else None
+
+
+def pick_unique_candidates(client, candidates, existing_posts, n=1):
+    """Dedup speculative topic candidates in one round and return up to `n`
+    survivors (in the model's ranking order).
+
+    Local checks (is_duplicate against the corpus, then against earlier
+    candidates so two near-identical stories don't both reach the LLM) run
+    first; the survivors' semantic checks then run in parallel. The
+    returned topic carries title_checked=True so main() doesn't pay for
+    the same checks again."""
+    rejected = []   # (reason kind, title, detail)
+    local_ok = []
+    for td in candidates:
+        title = clean_title(td.get("suggested_title") or td["topic"])
+        dup, reason, _ = is_duplicate(title, slug_from_title(title), existing_posts)
+        if not dup:
+            earlier = [{"title": t, "slug": slug_from_title(t), "filename": "(candidate)", "date": ""}
+                       for t, _ in local_ok]
+            dup, reason, _ = is_duplicate(title, slug_from_title(title), earlier)
+            reason = f"same story as another candidate: {reason}" if dup else reason
+        if dup:
+            rejected.append(("local", title, reason))
+        else:
+            local_ok.append((title, td))
+
+    with ThreadPoolExecutor(max_workers=max(1, len(local_ok))) as pool:
+        verdicts = list(pool.map(lambda item: check_semantic_duplicate(client, item[0], existing_posts), local_ok))
+
+    chosen = []
+    for (title, td), (dup, reason) in zip(local_ok, verdicts):
+        if dup:
+            rejected.append(("semantic", title, reason))
+        elif len(chosen) < n:
+            chosen.append(dict(td, suggested_title=title, title_checked=True))
+
+    by_kind = {kind: sum(1 for r in rejected if r[0] == kind) for kind in ("local", "semantic")}
+    print(f"  Topic candidates: {len(candidates)} proposed, {len(rejected)} rejected "
+          f"(local: {by_kind['local']}, semantic: {by_kind['semantic']})")
+    for kind, title, reason in rejected:
+        print(f"    ✗ [{kind}] {title!r}: {reason}")
+    return chosen
 
 
 # =============================================================================
@@ -733,7 +1209,46 @@ _RELATED_CATEGORIES = {
 # Unified image-dedup set, populated from recent post HTML on startup
 # and updated as new images are picked. Compared by base URL (no query string)
 # so the same photo at ?w=800 and ?w=1200 counts as a duplicate.
+# The research stage reads it from worker threads while the main thread
+# claims picks, so every access goes through _used_images_lock.
 _used_images = set()
+_used_images_lock = threading.Lock()
+
+
+def _image_in_use(url):
+    with _used_images_lock:
+        return _base_unsplash_url(url) in _used_images
+
+
+def _claim_image(url):
+    """Atomically mark `url` as used. Returns False if it was already taken
+    (by a recent post or by another pick in this run)."""
+    base = _base_unsplash_url(url)
+    with _used_images_lock:
+        if base in _used_images:
+            return False
+        _used_images.add(base)
+        return True
+
+
+# Library videos shown by the posts in the image reuse window, plus the
+# ones this run has picked; library_sources() skips them the way
+# _image_in_use() keeps photos off consecutive posts.
+_used_videos = set()
+_used_videos_lock = threading.Lock()
+
+
+def _video_in_use(video_id):
+    with _used_videos_lock:
+        return video_id in _used_videos
+
+
+def _claim_video(video_id):
+    with _used_videos_lock:
+        if video_id in _used_videos:
+            return False
+        _used_videos.add(video_id)
+        return True
 
 
 def _base_unsplash_url(url):
@@ -742,32 +1257,34 @@ def _base_unsplash_url(url):
     return url.split('?')[0] if url else url
 
 
-def get_recently_used_images(blog_dir="blog", n_recent=15):
-    """Scan the N most recent post HTML files for Unsplash photo URLs.
-    Returns a set of base URLs (query string stripped) so the next run
-    can avoid reusing the same photo across recent posts."""
+def get_recently_used_images(posts=IMAGE_REUSE_WINDOW_POSTS, days=IMAGE_REUSE_WINDOW_DAYS, blog_dir="blog"):
+    """Unsplash photo URLs used by the `posts` newest posts or in the last
+    `days` days, per the image ledger. Returns a set of base URLs (query
+    string stripped) so the next run can avoid reusing the same photo
+    across recent posts. Without a ledger, the post catalog's newest
+    `posts` posts stand in."""
+    rows = load_ledger()
+    if rows:
+        return recently_used(rows, posts, days)
     used = set()
-    if not os.path.exists(blog_dir):
-        return used
-    files = sorted(
-        [f for f in os.listdir(blog_dir)
-         if f.endswith('.html') and f != 'index.html'],
-        reverse=True,
-    )[:n_recent]
-    pattern = re.compile(
-        r'https://images\.unsplash\.com/photo-\d{10,15}-[a-f0-9]{12}'
-    )
-    for fname in files:
-        try:
-            with open(os.path.join(blog_dir, fname), 'r', encoding='utf-8') as f:
-                content = f.read()
-        except OSError:
-            continue
-        for match in pattern.findall(content):
-            used.add(match)  # pattern itself is the base URL (no query string)
+    for post in sorted(load_posts(blog_dir), key=lambda p: p['filename'], reverse=True)[:posts or 0]:
+        used.update(post.get('images', []))
     return used
 
 
+def get_recently_used_videos(posts=IMAGE_REUSE_WINDOW_POSTS, days=IMAGE_REUSE_WINDOW_DAYS, blog_dir="blog"):
+    """IDs of the source-library videos shown by the posts in the image
+    reuse window (same ledger window, or the catalog's newest `posts`
+    posts without a ledger)."""
+    rows = load_ledger()
+    if rows:
+        window = recent_posts(rows, posts, days)
+    else:
+        window = {p['filename'] for p in sorted(load_posts(blog_dir), key=lambda p: p['filename'],
+                                                reverse=True)[:posts or 0]}
+    return {vid for vid, entry in _source_library.data["videos"].items() if window.intersection(entry["uses"])}
+
+
 def find_unsplash_images(client, topic, category, count=6):
     prompt = f"""Search Unsplash for {count} photos that SPECIFICALLY match this blog topic:
 "{topic}"
@@ -792,7 +1309,7 @@ Requirements:
 Return ONLY a JSON array: [{{"url":"https://images.unsplash.com/photo-XXXXX?w=800&q=80","alt":"What this photo actually shows"}}]
 Or NONE if you cannot find good topic-specific matches."""
     try:
-        msg = call_with_retry(lambda: client.messages.create(model=CLAUDE_MODEL, max_tokens=1000, tools=[{"type":"web_search_20250305","name":"web_search"}], messages=[{"role":"user","content":prompt}]))
+        msg = llm_call(client, "images", max_tokens=1000, tools=[{"type":"web_search_20250305","name":"web_search"}], messages=[{"role":"user","content":prompt}])
         response_text = "".join(block.text for block in msg.content if hasattr(block,'text'))
         if "NONE" in response_text: return None
         json_match = re.search(r'\[[\s\S]*?\]', response_text)
@@ -806,24 +1323,31 @@ Or NONE if you cannot find good topic-specific matches."""
                 if isinstance(img, dict)
                 and "url" in img and "alt" in img
                 and is_valid_unsplash_url(img["url"])  # reject format-bad IDs
-                and unsplash_url_is_live(img["url"])   # reject 404 hallucinations
             ]
+            # Reject 404 hallucinations, all candidates in one batch.
+            live = unsplash_urls_live([img["url"] for img in valid])
+            valid = [img for img in valid if live[img["url"]]]
+            today = datetime.now().strftime('%Y-%m-%d')
+            for img in valid:
+                _image_catalog.add(img["url"], img["alt"], category, verified=today)
             if len(valid) < 3:
                 return None
             # Prefer images not used in the last 15 posts; if too few are
             # fresh, accept some reuse rather than ship without images.
-            fresh = [img for img in valid
-                     if _base_unsplash_url(img["url"]) not in _used_images]
+            fresh = [img for img in valid if not _image_in_use(img["url"])]
             return fresh if len(fresh) >= 3 else valid
         return None
     except Exception as e:
         print(f"  ⚠ Dynamic image search failed: {e}")
         return None
 
-def search_hero_image(client, topic):
+def search_hero_image(client, topic, category=""):
     """Search for a topic-specific hero image. Returns URL or None.
     Validates the URL format (rejects LLM hallucinations) and skips URLs
-    already used by recent posts."""
+    already used by recent posts. The photo goes into the image catalog
+    under the description the search returns with it; without one it
+    isn't cataloged (a photo tagged by its category alone is never
+    matched)."""
     prompt = f"""Find ONE high-quality Unsplash landscape photo for the hero banner of a blog about:
 "{topic}"
 
@@ -833,13 +1357,13 @@ The image MUST visually represent this specific topic. Examples:
 - "Photo Sharing" -> grandparents with tablet, family video call, sharing photos
 
 Do NOT return generic yoga/nature/meditation unless the topic is literally about that.
-Format: https://images.unsplash.com/photo-XXXXX?w=1200&q=80
-Return ONLY the URL or NONE."""
+Return ONLY these two lines, or NONE:
+URL: https://images.unsplash.com/photo-XXXXX?w=1200&q=80
+ALT: What this photo actually shows"""
     try:
-        msg = call_with_retry(lambda: client.messages.create(
-            model=CLAUDE_MODEL, max_tokens=500,
+        msg = llm_call(client, "hero", max_tokens=500,
             tools=[{"type":"web_search_20250305","name":"web_search"}],
-            messages=[{"role":"user","content":prompt}]))
+            messages=[{"role":"user","content":prompt}])
         response = "".join(b.text for b in msg.content if hasattr(b,'text'))
         if "NONE" in response: return None
         m = re.search(r'https://images\.unsplash\.com/[^\s"\']+', response)
@@ -850,7 +1374,7 @@ Return ONLY the URL or NONE."""
             if url:
                 print(f"  ⚠ Hero search returned invalid URL format: {url}")
             return None
-        if _base_unsplash_url(url) in _used_images:
+        if _image_in_use(url):
             print(f"  ⚠ Hero search returned a URL already in use, skipping")
             return None
         if not unsplash_url_is_live(url):
@@ -858,6 +1382,9 @@ Return ONLY the URL or NONE."""
             # photo-1727188222430-b5fa53a1faa6 that shipped a blank hero).
             print(f"  ⚠ Hero search returned a 404 URL, skipping: {url}")
             return None
+        alt = re.search(r'ALT:\s*(.+?)\s*(?:\n|$)', response)
+        if alt:
+            _image_catalog.add(url, alt.group(1), category, verified=datetime.now().strftime('%Y-%m-%d'))
         return url
     except Exception as e:
         print(f"  ⚠ Hero search failed: {e}")
@@ -866,59 +1393,209 @@ Return ONLY the URL or NONE."""
 # A single verified safe default hero (abstract teal gradient - matches brand)
 DEFAULT_HERO = "https://images.unsplash.com/photo-1557683316-973673baf926?w=1200&q=80"
 
-def get_images_for_category(category, topic=None, client=None):
+def _start_daemon_lookup(fn, *args):
+    """Run fn(*args) on a daemon thread and return a Future for its result.
+    Daemon rather than ThreadPoolExecutor workers: an executor joins its
+    threads at interpreter exit, so a lookup that blew the research deadline
+    would still hold the process open until its HTTP call gave up."""
+    future = Future()
+
+    def runner():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=runner, name=f"research-{fn.__name__}", daemon=True).start()
+    return future
+
+
+def catalog_images(topic, category, count):
+    """Up to `count` (base URL, alt) pairs from the image catalog for this
+    topic, best first, skipping photos recent posts used and photos
+    without alt text (tagged by their category alone, so a match says
+    nothing about the topic). Candidates are liveness-checked in one
+    batch; a photo that now 404s leaves the catalog."""
+    def skip(key):
+        return _image_in_use(key) or not _image_catalog.entries[key]["alt"]
+    hits = _image_catalog.match(topic, category, count, exclude=skip)
+    verdicts = _liveness.check_many([f"{key}?w=800&q=80" for _, key, _ in hits])
+    today = datetime.now().strftime('%Y-%m-%d')
+    picks = []
+    for _, key, entry in hits:
+        verdict = verdicts.get(f"{key}?w=800&q=80")
+        if verdict == DEAD:
+            _image_catalog.remove(key)
+            continue
+        if verdict == LIVE:
+            _image_catalog.mark_verified(key, today)
+        picks.append((key, entry["alt"]))
+    return picks
+
+
+def library_sources(topic, category):
+    """Studies and a video for this topic from the source library, as
+    {"studies": [...], "video": {...}}, each key only when the library
+    has enough. Videos recent posts showed are skipped. Expired matches
+    are re-checked first, one batch per kind: renewed when live, dropped
+    on a 404, left out this run otherwise."""
+    today = datetime.now().strftime('%Y-%m-%d')
+    usable = {}
+    for kind, verdicts_for in (("studies", study_verdicts), ("videos", youtube_verdicts)):
+        hits = _source_library.match(kind, topic, category, 3,
+                                     exclude=_video_in_use if kind == "videos" else None)
+        stale = [key for key, _, current in hits if not current]
+        verdicts = verdicts_for(stale) if stale else {}
+        usable[kind] = []
+        for key, entry, current in hits:
+            if not current:
+                verdict = verdicts.get(key)
+                if verdict == DEAD:
+                    _source_library.remove(kind, key)
+                    continue
+                if verdict != LIVE:
+                    continue
+                _source_library.renew(kind, key, today)
+            usable[kind].append((key, entry))
+    found = {}
+    if len(usable["studies"]) >= LIBRARY_MIN_STUDIES:
+        found["studies"] = [{"title": e["title"], "url": url, "finding": e["finding"]}
+                            for url, e in usable["studies"]]
+    for vid, e in usable["videos"]:
+        if _claim_video(vid):
+            found["video"] = {"id": vid, "title": e["title"], "channel": e["channel"]}
+            break
+    return found
+
+
+def run_research_stage(client, topic, category, timeout=RESEARCH_STAGE_TIMEOUT):
+    """Fire the four independent web-search lookups (inline images, hero,
+    video, studies) at once and wait at most `timeout` seconds for them.
+
+    Each lookup already swallows its own errors and returns None / [] on
+    failure, so a lookup that misses the deadline is treated the same way
+    and the caller's fallbacks take over. Returns a dict with keys
+    images, hero, video, studies and inline_count (how many inline images
+    the post should use; images holds a couple of spares on top).
+
+    The image catalog is asked first: with CATALOG_MIN_HITS matching
+    photos (by their alt text) the inline search is skipped, and a further match (or any
+    match, when there aren't enough for the inline set) skips the hero
+    search. The source library can likewise stand in for the studies and
+    video searches."""
+    n = random.choice([3, 4, 5])
+    local = catalog_images(topic, category, n + 3)
+    found = {}
+    inline_local = [{"url": f"{key}?w=800&q=80", "alt": alt} for key, alt in local][:n + 2]
+    if len(inline_local) >= CATALOG_MIN_HITS:
+        found["images"] = inline_local
+    taken = {img["url"] for img in found.get("images", ())}
+    spare = [key for key, _ in local if f"{key}?w=800&q=80" not in taken]
+    if spare:
+        found["hero"] = f"{spare[0]}?w=1200&q=80"
+    sources = library_sources(topic, category)
+    labels = {"images": lambda v: f"{len(v)} inline photo(s)", "hero": lambda v: "the hero",
+              "studies": lambda v: f"{len(v)} study link(s)", "video": lambda v: "a video"}
+    for source, names in (("🗂 Image catalog", found), ("📚 Source library", sources)):
+        if names:
+            print(f"  {source}: {' and '.join(labels[k](v) for k, v in names.items())}"
+                  f" — skipping the {' and '.join(names)} search")
+    found.update(sources)
+    lookups = {
+        "images": (find_unsplash_images, (client, topic, category, n + 2)),
+        "hero": (search_hero_image, (client, topic, category)),
+        "video": (find_youtube_video, (client, topic, category)),
+        "studies": (find_relevant_studies, (client, topic, category)),
+    }
+    lookups = {name: lookup for name, lookup in lookups.items() if name not in found}
+    # These are all optional call types: never wait past the run budget.
+    budget_left = _scheduler.remaining()
+    if budget_left <= 0:
+        print(f"  ⚠ Run budget ({_scheduler.budget_seconds}s) spent — skipping research, using fallbacks")
+        return {"inline_count": n, "images": None, "hero": None, "video": None, "studies": [], **found}
+    timeout = min(timeout, budget_left)
+    print(f"  🔍 Researching {', '.join(lookups)} concurrently (deadline {timeout:.0f}s)...")
+    started = time.monotonic()
+    futures = {name: _start_daemon_lookup(fn, *args) for name, (fn, args) in lookups.items()}
+    wait(list(futures.values()), timeout=timeout)
+
+    results = {"inline_count": n, **found}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            print(f"  ⚠ {name} lookup missed the {timeout:.0f}s research deadline — using fallback")
+            results[name] = None
+            continue
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            print(f"  ⚠ {name} lookup failed: {e}")
+            results[name] = None
+    results["studies"] = results["studies"] or []
+    print(f"  ⏱ Research stage finished in {time.monotonic() - started:.1f}s")
+    return results
+
+
+def get_images_for_category(category, topic=None, client=None, research=None):
     """Build the hero + inline image set for a blog post.
 
+    `research` is the output of run_research_stage(). When it is omitted
+    and a client + topic are given, the research stage runs here first.
+
     Fallback chain for hero (first that succeeds wins):
-      1. Dedicated hero search (topic-specific, validated URL, dedup-checked).
+      1. Dedicated hero search or image-catalog match (topic-specific,
+         validated URL, dedup-checked).
       2. Promote the first inline image (also topic-specific) — and remove it
          from the inline list so the same photo doesn't appear twice on the
          page. Resized from ?w=800 to ?w=1200 for banner display.
       3. Category-pool fallback (topic-adjacent within the category).
       4. DEFAULT_HERO (clearly decorative, no false topic-relevance).
+
+    Picks are claimed in _used_images atomically, inline first, so the
+    result matches the old serial order even though the hero search ran
+    alongside the inline search without seeing its picks.
     """
-    global _used_images
+    if research is None and client and topic:
+        research = run_research_stage(client, topic, category)
+    research = research or {}
 
     hero = None
     inline = []
 
-    if client and topic:
-        # Inline search runs first so we have candidates available for
-        # hero-promotion fallback if the dedicated hero search fails.
-        print("  🔍 Searching for topic-specific inline images...")
-        n = random.choice([3, 4, 5])
-        dynamic_images = find_unsplash_images(client, topic, category, count=n + 2)
-        if dynamic_images:
-            inline = random.sample(dynamic_images, min(n, len(dynamic_images)))
-            print(f"  ✅ Found {len(inline)} topic-specific inline images")
-            for img in inline:
-                _used_images.add(_base_unsplash_url(img["url"]))
-        else:
-            print("  ⚠ No topic-specific inline images found.")
-
-        # Dedicated hero search.
-        print("  🔍 Searching for topic-specific hero image...")
-        hero = search_hero_image(client, topic)
-        if hero:
+    dynamic_images = research.get("images")
+    if dynamic_images:
+        n = research.get("inline_count", 4)
+        picks = random.sample(dynamic_images, min(n, len(dynamic_images)))
+        inline = [img for img in picks if _claim_image(img["url"])]
+        print(f"  ✅ Found {len(inline)} topic-specific inline images")
+    elif client and topic:
+        print("  ⚠ No topic-specific inline images found.")
+
+    if research.get("hero"):
+        if _claim_image(research["hero"]):
+            hero = research["hero"]
             print("  ✅ Found topic-specific hero")
-            _used_images.add(_base_unsplash_url(hero))
+        else:
+            print("  ⚠ Hero search returned a URL already in use, skipping")
 
     # Fallback 1: promote first inline image to hero.
     if not hero and inline:
         promoted_url = inline[0]["url"].replace("w=800", "w=1200")
         if is_valid_unsplash_url(promoted_url):
+            # Already claimed as an inline pick; the base URL is the same.
             hero = promoted_url
-            _used_images.add(_base_unsplash_url(hero))
             inline = inline[1:]
             print("  📎 Hero search failed — promoted first inline image to hero")
 
     # Fallback 2: category pool (topic-adjacent within the category).
     if not hero:
         pool = HERO_IMAGES.get(category) or HERO_IMAGES.get("Wellness", [])
+        live = unsplash_urls_live(pool)
         for candidate in pool:
-            if _base_unsplash_url(candidate) not in _used_images:
+            if live[candidate] and _claim_image(candidate):
                 hero = candidate
-                _used_images.add(_base_unsplash_url(hero))
                 print(f"  📎 Hero from {category} category pool")
                 break
 
@@ -933,27 +1610,49 @@ def get_category_thumbnail(category):
     options = CATEGORY_IMAGES.get(category, CATEGORY_IMAGES["Wellness"])
     return random.choice(options) if isinstance(options, list) else options
 
+def youtube_verdicts(video_ids):
+    """{video_id: liveness verdict} via YouTube oEmbed, checked at once and
+    cached (url_liveness.py). DEAD when oEmbed answers one of
+    YOUTUBE_DEAD_STATUSES."""
+    urls = {vid: f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={vid}&format=json"
+            for vid in video_ids}
+    verdicts = _liveness.check_many(urls.values(), method="GET", dead_statuses=YOUTUBE_DEAD_STATUSES)
+    return {vid: verdicts.get(url) for vid, url in urls.items()}
+
+
+def verify_youtube_videos(video_ids):
+    """{video_id: bool}: False when oEmbed says the video is gone; network
+    trouble, throttling and 5xx count as available."""
+    return {vid: verdict != DEAD for vid, verdict in youtube_verdicts(video_ids).items()}
+
+
+def study_verdicts(urls):
+    """{url: liveness verdict} for study links, checked at once and cached."""
+    return _liveness.check_many(urls, dead_statuses=STUDY_DEAD_STATUSES)
+
+
 def verify_youtube_video(video_id):
-    try:
-        req = urllib.request.Request(f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json", headers={"User-Agent":"Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=10) as resp: return resp.status == 200
-    except urllib.error.HTTPError: return False
-    except: return True
+    return verify_youtube_videos([video_id])[video_id]
 
 def find_youtube_video(client, topic, category):
     prompt = f"""Find ONE YouTube video relevant to: "{topic}" (Category: {category})
 From reputable health channels (Mayo Clinic, Cleveland Clinic, AARP, etc.), under 15 min.
 Return ONLY: VIDEO_ID: [id]\nVIDEO_TITLE: [title]\nVIDEO_CHANNEL: [channel]\nOr: VIDEO_ID: NONE"""
     try:
-        msg = call_with_retry(lambda: client.messages.create(model=CLAUDE_MODEL, max_tokens=500, tools=[{"type":"web_search_20250305","name":"web_search"}], messages=[{"role":"user","content":prompt}]))
+        msg = llm_call(client, "video", max_tokens=500, tools=[{"type":"web_search_20250305","name":"web_search"}], messages=[{"role":"user","content":prompt}])
         response_text = "".join(block.text for block in msg.content if hasattr(block,'text'))
         vid_match = re.search(r'VIDEO_ID:\s*(\S+)', response_text)
         title_match = re.search(r'VIDEO_TITLE:\s*(.+?)(?:\n|$)', response_text)
         channel_match = re.search(r'VIDEO_CHANNEL:\s*(.+?)(?:\n|$)', response_text)
         if vid_match and vid_match.group(1).strip() != "NONE":
             video_id = vid_match.group(1).strip()
-            if 10 <= len(video_id) <= 12 and verify_youtube_video(video_id):
-                return {"id":video_id,"title":title_match.group(1).strip() if title_match else "Health Tips","channel":channel_match.group(1).strip() if channel_match else "Health Channel"}
+            verdict = youtube_verdicts([video_id])[video_id] if 10 <= len(video_id) <= 12 else DEAD
+            if verdict != DEAD:
+                video = {"id":video_id,"title":title_match.group(1).strip() if title_match else "Health Tips","channel":channel_match.group(1).strip() if channel_match else "Health Channel"}
+                if verdict == LIVE:
+                    _source_library.add("videos", video_id, video, category,
+                                        verified=datetime.now().strftime('%Y-%m-%d'))
+                return video
             else: print(f"  Dynamic video {video_id} unavailable, using fallback")
         print("  Could not find dynamic video, using fallback")
     except Exception as e: print(f"  Video search failed: {e}, using fallback")
@@ -976,6 +1675,17 @@ def select_unique_topic(existing_posts):
     return None
 
 
+def next_pool_topic(existing_posts, skip=()):
+    """The next entry of the topic schedule (topic_planner.py) not in skip,
+    or a live pick from the pool when no planned entry is usable. The
+    entry stays scheduled until publish_posts() removes it."""
+    td = next_topic(existing_posts, CATEGORY_COOLDOWN_WINDOW, skip=skip)
+    if td is not None:
+        print("  📅 From the topic schedule")
+        return td
+    return select_unique_topic(existing_posts)
+
+
 def find_relevant_studies(client, topic, category):
     """Search for 2-3 real, linkable studies/sources relevant to the topic.
     Returns a list of dicts: [{"title": "...", "url": "...", "finding": "..."}]
@@ -999,11 +1709,10 @@ Return ONLY a JSON array with no other text:
 If you cannot find suitable sources, return: NONE"""
 
     try:
-        msg = call_with_retry(lambda: client.messages.create(
-            model=CLAUDE_MODEL, max_tokens=800,
+        msg = llm_call(client, "studies", max_tokens=800,
             tools=[{"type": "web_search_20250305", "name": "web_search"}],
             messages=[{"role": "user", "content": prompt}]
-        ))
+        )
         response_text = "".join(block.text for block in msg.content if hasattr(block, 'text'))
         if "NONE" in response_text:
             return []
@@ -1011,6 +1720,15 @@ If you cannot find suitable sources, return: NONE"""
         if json_match:
             studies = json.loads(json_match.group())
             valid = [s for s in studies if isinstance(s, dict) and "url" in s and "title" in s and s["url"].startswith("http")]
+            verdicts = study_verdicts([s["url"] for s in valid])
+            dead = [s for s in valid if verdicts.get(s["url"]) == DEAD]
+            if dead:
+                print(f"  ⚠ Dropping {len(dead)} study link(s) that 404")
+            valid = [s for s in valid if s not in dead]
+            today = datetime.now().strftime('%Y-%m-%d')
+            for s in valid:
+                if verdicts.get(s["url"]) == LIVE:
+                    _source_library.add("studies", s["url"], s, category, verified=today)
             if valid:
                 print(f"  📚 Found {len(valid)} relevant studies/sources")
                 return valid[:3]
@@ -1097,15 +1815,24 @@ def build_reviewer_jsonld(reviewer=EDITORIAL_REVIEWER):
     return json.dumps(obj, ensure_ascii=False)
 
 
-def pick_related_posts(category, existing_posts, current_filename=None, n=RELATED_POSTS_COUNT):
+def pick_related_posts(category, existing_posts, current_filename=None, n=RELATED_POSTS_COUNT, content=None):
     """Choose up to n related posts for the footer block. Preference order:
-    same category, then categories from _RELATED_CATEGORIES, then recency.
+    most similar text (related_posts.py: the published post's neighbours,
+    or those of `content` for a new article), then same category, then
+    categories from _RELATED_CATEGORIES, then recency.
     Excludes the current post and any post missing a title."""
     candidates = [
         p for p in existing_posts
         if p.get('title') and p.get('filename') != current_filename
     ]
     seen, ordered = set(), []
+    for p in similar_posts(existing_posts, current_filename=current_filename, content=content,
+                           category=category, n=n + 1):
+        if p.get('title') and p['filename'] != current_filename and len(ordered) < n:
+            seen.add(p['filename'])
+            ordered.append(p)
+    if len(ordered) >= n:
+        return ordered
 
     def take_from(cat_list):
         for p in candidates:
@@ -1151,46 +1878,103 @@ def render_related_posts_block(related_posts):
     )
 
 
-def generate_blog_post(topic_data, existing_posts, client):
-    topic, keyword, category = topic_data["topic"], topic_data["keyword"], topic_data.get("category","Wellness")
-    images = get_images_for_category(category, topic=topic, client=client)
-    print("  Searching for relevant YouTube video...")
-    video = find_youtube_video(client, topic, category)
-    if video is None:
-        print("  No verified video found. Publishing without video.")
-    else: print(f"  Found video: {video['title']} by {video['channel']}")
+_RELATED_BLOCK_RE = re.compile(r'<aside class="related-posts"[^>]*>.*?</aside>', re.DOTALL)
+
+
+def set_related_posts_block(content, related_html):
+    """Replace the post's related-posts block with related_html, or insert
+    it before the back-to-blog div if the post has none."""
+    if _RELATED_BLOCK_RE.search(content):
+        return _RELATED_BLOCK_RE.sub(lambda m: related_html, content, count=1)
+    target = '<div class="back-to-blog">'
+    if not related_html or target not in content:
+        return content
+    return content.replace(target, related_html + "\n    " + target, 1)
+
+
+def refresh_related_blocks(new_filenames, blog_dir="blog"):
+    """Rewrite the related-posts block of every post that should now list
+    one of new_filenames (new posts in a batch included: they were written
+    without each other). Only posts whose text neighbours include a new
+    post are re-picked, plus every post when NumPy is missing, since the
+    category rules favour recency. Returns the filenames rewritten."""
+    posts = get_existing_posts(blog_dir)
+    new = set(new_filenames)
+    table = neighbour_table(posts, blog_dir)
+    rewritten = []
+    for post in posts:
+        row = table.get(post['filename'])
+        if row is not None and len(row) >= RELATED_POSTS_COUNT + 1 and \
+                not new & {name for name, _ in row[:RELATED_POSTS_COUNT + 1]}:
+            continue
+        related = pick_related_posts(post.get('category', ''), posts, current_filename=post['filename'])
+        if not new & {p['filename'] for p in related}:
+            continue
+        path = os.path.join(blog_dir, post['filename'])
+        with open(path, encoding='utf-8') as f: content = f.read()
+        updated = set_related_posts_block(content, render_related_posts_block(related))
+        if updated != content:
+            with open(path, 'w', encoding='utf-8') as f: f.write(updated)
+            rewritten.append(post['filename'])
+    return rewritten
 
-    # Search for relevant studies to link in the article
-    print("  Searching for relevant studies and sources...")
-    studies = find_relevant_studies(client, topic, category)
-    studies_instruction = ""
-    if studies:
-        studies_list = "\n".join([f"  - \"{s['title']}\" — {s.get('finding','')} — URL: {s['url']}" for s in studies])
-        studies_instruction = f"""
-STUDIES TO REFERENCE (link to these with <a href="URL" target="_blank" rel="noopener">text</a>):
-{studies_list}
-Weave these naturally into the text as evidence. Use the actual URL in hyperlinks.
-Do NOT just list sources at the end — embed them where the evidence supports your point."""
-    else:
-        studies_instruction = """
-Include at least 2 hyperlinks to reputable sources (NIH, Mayo Clinic, CDC, AHA, etc.) using
-<a href="URL" target="_blank" rel="noopener">descriptive link text</a> format.
-Reference specific studies, guidelines, or data where relevant."""
 
-    num_images = len(images["inline"])
-    feature = random.choice(STEADIDAY_FEATURES["free"])
-    style = random.choice(WRITING_STYLES)
-    print(f"  Writing style: {style['name']}")
-    img_ph = "\n".join([f"After section {i+2}, insert exactly: [IMAGE_{i+1}]" for i in range(num_images)])
-    content_summaries = get_content_summaries(existing_posts)
-    angle_instruction = ""
-    if topic_data.get('angle'): angle_instruction = f"\nANGLE: {topic_data['angle']}"
-    if topic_data.get('source'): angle_instruction += f"\nSOURCE: {topic_data['source']}"
-    prompt = f"""You are a health and wellness writer for SteadiDay, an app for adults 50+.
-Write a blog post about: "{topic}"
-{angle_instruction}
+def slug_from_title(title):
+    """First five words of the title, lowercased and stripped to [a-z0-9]."""
+    return '-'.join(re.sub(r'[^a-z0-9\s]','',title.lower()).split()[:5])
 
-{style['instruction']}
+
+def clean_title(title):
+    """Apply the v5.4 title policy to a model-written title."""
+    # Soft warning only — NEVER truncate. A bad-but-complete title is
+    # infinitely better than a fragment ending in "...". Google SERP
+    # truncation is pixel-based (~580px, roughly 60-70 chars), so we ship
+    # over-long titles as-is and log them for prompt tuning if recurring.
+    if len(title) > 65:
+        print(f"  ⚠ Title is {len(title)} chars (target: 50-60, max: 65). Shipping as-is.")
+        print(f"  ⚠ Over-long title: {title!r}")
+
+    # Safety net: if the model still returned trailing ellipses despite the
+    # prompt, strip them rather than publish "...". This is belt-and-suspenders.
+    if title.endswith("...") or title.endswith("…"):
+        cleaned = title.rstrip(". ").rstrip("…").rstrip()
+        print(f"  ⚠ Model returned trailing ellipses. Stripping: {title!r} -> {cleaned!r}")
+        title = cleaned
+    return title
+
+
+def propose_title(client, topic_data, existing_posts):
+    """Phase one of title-first generation: a cheap, tool-free call that only
+    names the post. The title is dedup-checked before any media research or
+    the 4,500-token content call is paid for. News-driven topics already
+    carry a suggested_title from their own call, so they skip the request."""
+    if topic_data.get("suggested_title"):
+        return clean_title(topic_data["suggested_title"])
+    angle = f"\nANGLE: {topic_data['angle']}" if topic_data.get("angle") else ""
+    prompt = f"""You are naming a blog post for SteadiDay, an app for adults 50+.
+TOPIC: "{topic_data['topic']}"{angle}
+Primary SEO keyword: "{topic_data['keyword']}"
+
+EXISTING POSTS ON RELATED SUBJECTS (the new title must NOT cover the same subject):
+{get_content_summaries(existing_posts, f"{topic_data['topic']} {topic_data['keyword']} {topic_data.get('angle', '')}")}
+
+{TITLE_RULES}
+- Include the primary keyword naturally.
+
+Reply with ONLY: TITLE: [complete title, 50-65 chars, NO ellipses, NO truncation]"""
+    msg = llm_call(client, "title", max_tokens=100, messages=[{"role":"user","content":prompt}])
+    r = msg.content[0].text
+    m = re.search(r'TITLE:\s*(.+?)(?:\n|$)', r)
+    return clean_title((m.group(1) if m else r).strip().strip('"'))
+
+
+# Standing rules for the content call — identical for every post, so they
+# lead the prompt as its cached prefix. The full style catalogue is part of
+# them (the ASSIGNMENT names one style): it is stable text, and without it
+# the prefix is ~660 tokens, under Sonnet's 1024-token cache minimum.
+CONTENT_GUIDELINES = f"""You are a health and wellness writer for SteadiDay, an app for adults 50+.
+These standing rules apply to every post. The existing posts and the ASSIGNMENT
+(topic, keyword, writing style, sources, media placeholders) follow.
 
 TONE GUIDELINES:
 - Write like a knowledgeable friend, not a textbook
@@ -1201,29 +1985,21 @@ TONE GUIDELINES:
 - DO NOT start paragraphs with "In fact," "Additionally," "Furthermore," "Moreover"
 - Use conversational transitions, not formal connectors
 - Evidence-based only — no political opinions
-{studies_instruction}
 
-EXISTING POSTS (do NOT duplicate):
-{content_summaries}
+WRITING STYLES (use ONLY the one the ASSIGNMENT names):
+{chr(10).join(f"- {s['name']}: {s['instruction'].removeprefix('WRITING STYLE: ')}" for s in WRITING_STYLES)}
 
-TITLE RULES (CRITICAL):
-- The title MUST be a COMPLETE, GRAMMATICAL phrase or sentence.
-- Target length: 50-60 characters. Hard maximum: 65 characters.
-- NEVER use ellipses ("...") or any trailing punctuation that suggests truncation.
-- If the full idea will not fit, SHORTEN the wording — do NOT cut off mid-thought.
-- A short complete title ("Why Morning Naps May Be a Warning Sign") is better than
-  a long fragment ("Daytime Napping and Mortality Risk: What Older...").
+{TITLE_RULES}
 - Include the primary keyword naturally.
 
 SEO REQUIREMENTS:
 - META_DESCRIPTION must include the keyword and a compelling reason to click (150-160 chars)
 - Use the primary keyword in the first paragraph and at least 2 section headings
-- Include 2-3 internal links to related posts on steadiday.com/blog/ if relevant topics exist
-- Primary keyword for SEO: "{keyword}"
+- Do NOT add links to other SteadiDay posts; internal links are inserted automatically
 
 CONTENT REQUIREMENTS:
 1. 1000-1500 words, 6-7 sections with <h2> tags
-2. Mention SteadiDay's {feature} feature naturally (it's free)
+2. Mention the SteadiDay feature named in the ASSIGNMENT naturally (it's free)
 3. Include at least 2 specific statistics with their sources
 4. Advice must be DISTINCT from existing posts
 5. END the article with a section titled "Common Questions" using exactly this format:
@@ -1238,14 +2014,10 @@ CONTENT REQUIREMENTS:
    These will be emitted as FAQPage schema, so the questions must be
    self-contained (understandable without the article context).
 
-MEDIA PLACEHOLDERS:
-{img_ph}
-After section 4: [VIDEO]
-
 FORMAT:
 TITLE: [complete title, 50-65 chars, NO ellipses, NO truncation]
 META_DESCRIPTION: [150-160 chars, include keyword]
-KEYWORDS: keyword1, keyword2, {keyword}
+KEYWORDS: keyword1, keyword2, [primary keyword]
 READ_TIME: X
 CONTENT:
 <p>Opening...</p>
@@ -1254,31 +2026,128 @@ CONTENT:
 <h2>Common Questions</h2>
 <h3>Question?</h3>
 <p>Answer.</p>"""
-    msg = call_with_retry(lambda: client.messages.create(model=CLAUDE_MODEL, max_tokens=4500, messages=[{"role":"user","content":prompt}]))
-    r = msg.content[0].text
-    title_match = re.search(r'TITLE:\s*(.+?)(?:\n|$)', r)
-    title = title_match.group(1).strip() if title_match else topic
+
+
+def parse_post_header(text):
+    """TITLE / META_DESCRIPTION / KEYWORDS / READ_TIME from a content
+    response that may still be streaming. Only finished lines count, so a
+    half-written title is never acted on. Keys are lowercased."""
+    header, sep, _ = text.partition("CONTENT:")
+    if not sep:
+        header = header[:header.rfind("\n") + 1]
+    return {k.lower(): v.strip() for k, v in
+            re.findall(r'^(TITLE|META_DESCRIPTION|KEYWORDS|READ_TIME):[ \t]*(.+)$', header, re.M)}
+
+
+def generate_blog_post(topic_data, existing_posts, client, title=None):
+    """Research media, write the article and assemble post_data. Returns
+    (post, "") or (None, reason) when the article's title is a duplicate.
+
+    Pass `title` (from propose_title) to lock the headline. Otherwise the
+    content call picks its own: the response is streamed, and as soon as
+    its TITLE line is complete the local duplicate check runs and the
+    semantic one starts in the background, while the body keeps
+    streaming. A duplicate closes the stream early."""
+    topic, keyword, category = topic_data["topic"], topic_data["keyword"], topic_data.get("category","Wellness")
+    # The four lookups are independent web searches, so they run at once
+    # under a shared deadline instead of back to back.
+    research = checkpoint("research", lambda: run_research_stage(client, topic, category), key=topic)
+    images = get_images_for_category(category, topic=topic, client=client, research=research)
+    video = research["video"]
+    if video is None:
+        print("  No verified video found. Publishing without video.")
+    else: print(f"  Found video: {video['title']} by {video['channel']}")
+    studies = research["studies"]
+    studies_instruction = ""
+    if studies:
+        studies_list = "\n".join([f"  - \"{s['title']}\" — {s.get('finding','')} — URL: {s['url']}" for s in studies])
+        studies_instruction = f"""
+STUDIES TO REFERENCE (link to these with <a href="URL" target="_blank" rel="noopener">text</a>):
+{studies_list}
+Weave these naturally into the text as evidence. Use the actual URL in hyperlinks.
+Do NOT just list sources at the end — embed them where the evidence supports your point."""
+    else:
+        studies_instruction = """
+Include at least 2 hyperlinks to reputable sources (NIH, Mayo Clinic, CDC, AHA, etc.) using
+<a href="URL" target="_blank" rel="noopener">descriptive link text</a> format.
+Reference specific studies, guidelines, or data where relevant."""
+
+    num_images = len(images["inline"])
+    feature = random.choice(STEADIDAY_FEATURES["free"])
+    style = random.choice(WRITING_STYLES)
+    print(f"  Writing style: {style['name']}")
+    img_ph = "\n".join([f"After section {i+2}, insert exactly: [IMAGE_{i+1}]" for i in range(num_images)])
+    content_summaries = get_content_summaries(existing_posts, f"{topic} {keyword} {title or ''} {topic_data.get('angle', '')}")
+    title_instruction = f'TITLE (FIXED): Use exactly "{title}" as the title. Do not reword it.' if title else ""
+    angle_instruction = ""
+    if topic_data.get('angle'): angle_instruction = f"\nANGLE: {topic_data['angle']}"
+    if topic_data.get('source'): angle_instruction += f"\nSOURCE: {topic_data['source']}"
+    # Cached prefix: the standing rules (style catalogue included). The
+    # existing posts related to this topic and the assignment, which names
+    # the style, go in the tail.
+    assignment = f"""ASSIGNMENT
+Write a blog post about: "{topic}"
+Writing style: {style['name']} (see WRITING STYLES)
+{angle_instruction}
+{title_instruction}
+Primary keyword for SEO: "{keyword}" (use it as the last entry in KEYWORDS)
+SteadiDay feature to mention naturally (it's free): {feature}
+{studies_instruction}
+
+MEDIA PLACEHOLDERS:
+{img_ph}
+After section 4: [VIDEO]"""
+    early = {}  # title-dependent work started while the body streams
+
+    def watch_title(text):
+        if title:
+            return False  # locked and already checked
+        streamed = parse_post_header(text).get("title")
+        if streamed and clean_title(streamed) != early.get("title"):
+            early.clear()
+            early["title"] = clean_title(streamed)
+            early["slug"] = slug_from_title(early["title"])
+            print(f"  ⚡ Title streamed in: {early['title']} — checking for duplicates")
+            dup, reason, _ = is_duplicate(early["title"], early["slug"], existing_posts)
+            if dup:
+                early["duplicate"] = reason
+                return True
+            early["semantic"] = _start_daemon_lookup(check_semantic_duplicate, client, early["title"], existing_posts)
+        semantic = early.get("semantic")
+        if semantic is not None and semantic.done() and "duplicate" not in early:
+            dup, reason = semantic.result()
+            if dup:
+                early["duplicate"] = reason
+                return True
+        return False
+
+    def write():
+        msg = llm_stream(client, "content", watch_title, max_tokens=4500, messages=cached_prompt(
+            [CONTENT_GUIDELINES],
+            f"EXISTING POSTS ON RELATED SUBJECTS (do NOT duplicate):\n{content_summaries}\n\n{assignment}"))
+        return msg.content[0].text if msg else None
+
+    r = checkpoint("content", write, key=[topic, title])
+    if r is not None:
+        watch_title(r)  # restored from a checkpoint: nothing has seen it yet
+    # In title-first mode the title was already proposed and dedup-checked,
+    # so it is kept even if the model paraphrased it in its reply.
+    if not title:
+        if "duplicate" not in early and early.get("semantic") is not None:
+            dup, reason = early["semantic"].result()
+            if dup: early["duplicate"] = reason
+        if "duplicate" in early:
+            return None, early["duplicate"]
+        title = early.get("title") or clean_title(topic)
+        if "title" not in early:
+            dup, reason = _check_duplicate(client, title, slug_from_title(title), existing_posts)
+            if dup: return None, reason
     meta = (re.search(r'META_DESCRIPTION:\s*(.+?)(?:\n|$)', r) or type('',(),{'group':lambda s,n:f"Tips about {topic} for adults 50+"})).group(1).strip()
     kws = (re.search(r'KEYWORDS:\s*(.+?)(?:\n|$)', r) or type('',(),{'group':lambda s,n:keyword})).group(1).strip()
     rt = (re.search(r'READ_TIME:\s*(\d+)', r) or type('',(),{'group':lambda s,n:"7"})).group(1)
     content_match = re.search(r'CONTENT:\s*(.+)', r, re.DOTALL)
     content = content_match.group(1).strip() if content_match else r
 
-    # Soft warning only — NEVER truncate. A bad-but-complete title is
-    # infinitely better than a fragment ending in "...". Google SERP
-    # truncation is pixel-based (~580px, roughly 60-70 chars), so we ship
-    # over-long titles as-is and log them for prompt tuning if recurring.
-    if len(title) > 65:
-        print(f"  ⚠ Title is {len(title)} chars (target: 50-60, max: 65). Shipping as-is.")
-        print(f"  ⚠ Over-long title: {title!r}")
-
-    # Safety net: if the model still returned trailing ellipses despite the
-    # prompt, strip them rather than publish "...". This is belt-and-suspenders.
-    if title.endswith("...") or title.endswith("…"):
-        cleaned = title.rstrip(". ").rstrip("…").rstrip()
-        print(f"  ⚠ Model returned trailing ellipses. Stripping: {title!r} -> {cleaned!r}")
-        title = cleaned
-
     layout = random.choice(IMAGE_LAYOUT_PATTERNS)
     for i, img in enumerate(images["inline"]):
         layout_class = layout[i % len(layout)]
@@ -1287,16 +2156,24 @@ CONTENT:
     if video:
         content = content.replace("[VIDEO]", f'<div class="video-container"><iframe src="https://www.youtube-nocookie.com/embed/{video["id"]}" title="{video["title"]}" frameborder="0" loading="lazy" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture; web-share" referrerpolicy="no-referrer-when-downgrade" allowfullscreen></iframe></div><p class="video-caption">Video: {video["title"]} -- {video["channel"]}</p>')
     content = re.sub(r'\[IMAGE_\d+\]','',content).replace("[VIDEO]",'')
-    slug = '-'.join(re.sub(r'[^a-z0-9\s]','',title.lower()).split()[:5])
+    # Different headline, same advice: compare the body against every
+    # post's stored signature before anything is saved.
+    near = near_duplicates(content, existing_posts)
+    if near:
+        return None, f"Body overlap {near[0][0]:.3f} with {near[0][1]}"
+    content, linked = inject_internal_links(content, existing_posts)
+    if linked:
+        print(f"  🔗 Internal links: {', '.join(linked)}")
+    related = pick_related_posts(category, existing_posts, current_filename=None, content=content)
+    slug = slug_from_title(title)
     faqs = extract_faqs_from_content(content)
     if faqs:
         print(f"  📋 Extracted {len(faqs)} FAQ pairs for FAQPage schema")
     else:
         print("  ⚠ No FAQ pairs found in content — FAQPage schema will be omitted")
-    related = pick_related_posts(category, existing_posts, current_filename=None)
     if related:
         print(f"  🔗 Related posts: {', '.join(p['filename'] for p in related)}")
-    return {"title":title,"meta_description":meta,"keywords":kws,"read_time":rt,"content":content,"slug":slug,"category":category,"hero_image":images["hero"],"video":video,"num_images":num_images,"date":datetime.now().strftime('%Y-%m-%d'),"faqs":faqs,"related_posts":related}
+    return {"topic":topic,"title":title,"meta_description":meta,"keywords":kws,"read_time":rt,"content":content,"slug":slug,"category":category,"hero_image":images["hero"],"video":video,"num_images":num_images,"date":datetime.now().strftime('%Y-%m-%d'),"faqs":faqs,"related_posts":related}, ""
 
 
 def get_html_template():
@@ -1392,7 +2269,9 @@ def get_html_template():
 
 
 def create_blog_html(post_data):
-    fn = f"{post_data['date']}-{post_data['slug']}.html"
+    # Source records (post_source.py) carry the filename, which for a few
+    # older posts isn't date-slug.
+    fn = post_data.get('filename') or f"{post_data['date']}-{post_data['slug']}.html"
     d = datetime.strptime(post_data['date'], '%Y-%m-%d')
     html = get_html_template().format(
         title=post_data['title'],
@@ -1415,10 +2294,25 @@ def create_blog_html(post_data):
     )
     return html, fn
 
-def update_blog_index(post_data, filename):
+def update_blog_index(entries):
+    """Add a card per (post_data, filename) to blog/index.html in one
+    read/write, oldest first so the newest ends up on top as the featured
+    card."""
     path = "blog/index.html"
     if not os.path.exists(path): print(f"Warning: {path} not found"); return False
     with open(path,'r',encoding='utf-8') as f: content = f.read()
+    marker = "<!--BLOG_ENTRIES_START-->"
+    if marker not in content: print(f"Warning: marker not found in {path}"); return False
+    for post_data, filename in entries:
+        # A resumed run replays this step; don't list the post twice.
+        if f'href="{filename}"' in content: print(f"{path} already lists {filename}"); continue
+        if 'class="blog-card featured"' in content: content = content.replace('class="blog-card featured"','class="blog-card"',1)
+        entry = _index_card(post_data, filename).replace('class="blog-card"','class="blog-card featured"')
+        content = content.replace(marker, marker + "\n            " + entry)
+    with open(path,'w',encoding='utf-8') as f: f.write(content)
+    print(f"Updated {path}"); return True
+
+def _index_card(post_data, filename):
     cat = post_data.get('category','Wellness')
     # Use the article's dynamic hero as the index thumbnail so the card matches
     # what readers see inside the article. Fall back to the category pool only
@@ -1429,36 +2323,15 @@ def update_blog_index(post_data, filename):
     else:
         img = get_category_thumbnail(cat)
     d = datetime.strptime(post_data['date'],'%Y-%m-%d').strftime('%B %d, %Y')
-    entry = f'''<article class="blog-card"><div class="blog-card-image" style="background-image: url('{img}');"><span class="blog-card-tag">{cat}</span></div><div class="blog-card-content"><h2><a href="{filename}">{post_data['title']}</a></h2><div class="blog-meta"><span>{d}</span><span>&bull;</span><span>{post_data['read_time']} min read</span></div><p class="blog-excerpt">{post_data['meta_description']}</p><a href="{filename}" class="read-more">Read full article<svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M17 8l4 4m0 0l-4 4m4-4H3"/></svg></a></div></article>\n            '''
-    marker = "<!--BLOG_ENTRIES_START-->"
-    if marker in content:
-        if 'class="blog-card featured"' in content: content = content.replace('class="blog-card featured"','class="blog-card"',1)
-        entry = entry.replace('class="blog-card"','class="blog-card featured"')
-        content = content.replace(marker, marker + "\n            " + entry)
-        with open(path,'w',encoding='utf-8') as f: f.write(content)
-        print(f"Updated {path}"); return True
-    print(f"Warning: marker not found in {path}"); return False
+    return f'''<article class="blog-card"><div class="blog-card-image" style="background-image: url('{img}');"><span class="blog-card-tag">{cat}</span></div><div class="blog-card-content"><h2><a href="{filename}">{post_data['title']}</a></h2><div class="blog-meta"><span>{d}</span><span>&bull;</span><span>{post_data['read_time']} min read</span></div><p class="blog-excerpt">{post_data['meta_description']}</p><a href="{filename}" class="read-more">Read full article<svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M17 8l4 4m0 0l-4 4m4-4H3"/></svg></a></div></article>\n            '''
 
 def generate_rss_feed(blog_dir="blog"):
     rss_path = os.path.join(blog_dir,"rss.xml")
     if not os.path.exists(blog_dir): print(f"  Warning: {blog_dir} not found."); return
     posts = []
-    for fname in sorted(os.listdir(blog_dir),reverse=True):
-        if fname.endswith('.html') and fname != 'index.html':
-            filepath = os.path.join(blog_dir,fname)
-            try:
-                if os.path.getsize(filepath) < 1024: continue
-            except OSError: continue
-            try:
-                with open(filepath,'r',encoding='utf-8') as f: content = f.read(5000)
-            except: continue
-            title_match = re.search(r'<title>(.*?)\s*\|', content)
-            title = title_match.group(1).strip() if title_match else fname
-            desc_match = re.search(r'<meta\s+name="description"\s+content="(.*?)"', content)
-            description = desc_match.group(1) if desc_match else ""
-            date_match = re.match(r'(\d{4}-\d{2}-\d{2})', fname)
-            pub_date = datetime.strptime(date_match.group(1),'%Y-%m-%d').strftime('%a, %d %b %Y 00:00:00 GMT') if date_match else ""
-            posts.append({'title':title,'description':description,'url':f"{BLOG_BASE_URL}/{fname}",'pub_date':pub_date})
+    for p in sorted(load_posts(blog_dir), key=lambda p: p['filename'], reverse=True):
+        pub_date = datetime.strptime(p['date'],'%Y-%m-%d').strftime('%a, %d %b %Y 00:00:00 GMT') if p['date'] else ""
+        posts.append({'title':p['title'] or p['filename'],'description':p['meta_desc'],'url':f"{BLOG_BASE_URL}/{p['filename']}",'pub_date':pub_date})
     posts = posts[:20]
     now = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
     items = "".join(f"\n        <item><title>{p['title'].replace('&','&amp;').replace('<','&lt;')}</title><link>{p['url']}</link><guid isPermaLink=\"true\">{p['url']}</guid><description>{p['description'].replace('&','&amp;').replace('<','&lt;')}</description><pubDate>{p['pub_date']}</pubDate></item>" for p in posts)
@@ -1519,6 +2392,7 @@ def notify_buttondown(post_data, filename):
     try:
         with urllib.request.urlopen(req) as resp:
             print("  Buttondown draft created!" if resp.status in (200,201) else f"  Buttondown status {resp.status}")
+            return True if resp.status in (200,201) else None
     except urllib.error.HTTPError as e: print(f"  Buttondown error {e.code}: {e.reason}")
     except Exception as e: print(f"  Buttondown failed: {e}")
 
@@ -1540,18 +2414,310 @@ def _check_duplicate(client, title, slug, existing_posts):
     sem_dup,sem_reason = check_semantic_duplicate(client,title,existing_posts)
     return (True,sem_reason) if sem_dup else (False,"")
 
+def write_unique_post(client, td, existing_posts, title_first=True, claim=None):
+    """One topic attempt. Returns (post, "") or, when the title turns out to
+    be a duplicate, (None, reason).
+
+    `claim(title)` (batch mode) reserves a title against the other posts
+    being written in the same run and returns (ok, reason).
+
+    Title-first mode checks a proposed title before anything expensive runs;
+    otherwise the article's own title is checked while it streams.
+    Topics from pick_unique_candidate() arrive with their title already
+    checked and go straight to the content call."""
+    if td.get("title_checked"):
+        ok,reason = claim(td["suggested_title"]) if claim else (True,"")
+        if not ok: return None, reason
+        print("\nGenerating content...")
+        return generate_blog_post(td,existing_posts,client,title=td["suggested_title"])
+    if title_first:
+        print("\nProposing title...")
+        title = propose_title(client,td,existing_posts)
+        print(f"  Proposed: {title}")
+        dup,reason = _check_duplicate(client,title,slug_from_title(title),existing_posts)
+        if dup: return None, reason
+        ok,reason = claim(title) if claim else (True,"")
+        if not ok: return None, reason
+        print("\nGenerating content...")
+        return generate_blog_post(td,existing_posts,client,title=title)
+    # The article picks its own title; generate_blog_post() checks it as
+    # soon as it streams in.
+    print("\nGenerating content...")
+    post,reason = generate_blog_post(td,existing_posts,client)
+    if post is not None and claim:
+        ok,reason = claim(post['title'])
+        if not ok: return None, reason
+    return post,reason
+
+
+def produce_post(client, args, existing, excluded_cats, topic_override=None):
+    """Pick a topic and write a post that passes the duplicate checks:
+    the custom / pool / news topic first, then one speculative candidate
+    round (or the serial news retries with --candidates 1). Returns the
+    post dict, or None when every attempt was a duplicate."""
+    if topic_override:
+        print(f"Custom topic: {topic_override}")
+        td = {"topic":topic_override,"keyword":topic_override.lower(),"category":"Wellness"}
+    elif args.news:
+        # Generated below, together with the retry candidates.
+        td = None
+    else:
+        print("Selecting from topic pool...")
+        td = checkpoint("topic", lambda: next_pool_topic(existing))
+        if td is None:
+            print("All pool topics used! Switching to news-driven...")
+        else: print(f"  Selected: {td['topic']}\n  Category: {td['category']}")
+
+    post, reason = None, ""
+    if td is not None:
+        post, reason = write_unique_post(client,td,existing,title_first=args.title_first)
+    if post is None and args.candidates > 1:
+        # One speculative round replaces the serial news-driven retries:
+        # K topics from a single call, all deduplicated at once.
+        if td is not None:
+            print(f"  Duplicate (attempt 1): {reason}")
+        print(f"\nGenerating {args.candidates} news-driven topic candidates...")
+        candidates = checkpoint("candidates", lambda: generate_news_topic_candidates(
+            client,existing,excluded_categories=excluded_cats,k=args.candidates))
+        td = pick_unique_candidate(client,candidates,existing)
+        if td is None: print(f"  No unique topic among {len(candidates)} candidates"); return None
+        print(f"  Topic: {td['topic']}\n  Category: {td['category']}")
+        post, reason = write_unique_post(client,td,existing,title_first=args.title_first)
+    elif post is None:
+        # Serial fallback (--candidates 1): a news-driven retry, then one
+        # forced into a different category.
+        if td is None:
+            print("Generating news-driven topic...")
+            td = generate_news_driven_topic(client,existing,excluded_categories=excluded_cats)
+            print(f"  Topic: {td['topic']}\n  Category: {td['category']}")
+            post, reason = write_unique_post(client,td,existing,title_first=args.title_first)
+        if post is None:
+            print(f"  Duplicate (attempt 1): {reason}\n  Retrying news-driven...")
+            td = generate_news_driven_topic(client,existing,excluded_categories=excluded_cats)
+            post, reason = write_unique_post(client,td,existing,title_first=args.title_first)
+        if post is None:
+            print(f"  Duplicate (attempt 2): {reason}\n  Forcing different category...")
+            td = generate_news_driven_topic(client,existing,excluded_categories=list(set(excluded_cats+[td.get('category','')])))
+            post, reason = write_unique_post(client,td,existing,title_first=args.title_first)
+    if post is None: print(f"  Still duplicate after 3 attempts: {reason}")
+    return post
+
+
+def plan_batch_topics(client, args, existing, excluded_cats, n):
+    """Up to `n` topics for a --count run, unique against the corpus and
+    each other: pool topics first (each pick counts as a recent post, so
+    categories spread out), then news-driven candidates for the rest."""
+    planned, picked = [], []
+    if not args.news:
+        while len(planned) < n:
+            td = next_pool_topic(picked + existing, skip={t["topic"] for t in planned})
+            if td is None: break
+            planned.append(td)
+            picked.insert(0, {"title": td["topic"], "slug": slug_from_title(td["topic"]),
+                              "filename": "(batch)", "category": td["category"], "date": ""})
+            print(f"  Planned: {td['topic']} [{td['category']}]")
+    if len(planned) < n:
+        k = n - len(planned)
+        print(f"\nGenerating {k} news-driven topic candidates...")
+        candidates = generate_news_topic_candidates(client,picked + existing,excluded_categories=excluded_cats,k=k)
+        planned += pick_unique_candidates(client,candidates,picked + existing,n=k)
+    return planned
+
+
+def produce_batch(client, args, existing, excluded_cats):
+    """Write up to args.count posts concurrently (BATCH_WORKERS at a time).
+    Each slot takes topics from one shared plan of count +
+    BATCH_SPARE_TOPICS until a post survives dedup against the corpus
+    and, through claim(), against the other slots. Returns the posts
+    (slot 0 first), dated args.spacing days apart going back from today."""
+    count = args.count
+    today = datetime.now().strftime('%Y-%m-%d')
+    claimed, lock = [], threading.Lock()
+
+    def claim(title):
+        slug = slug_from_title(title)
+        with lock:
+            dup, reason, _ = is_duplicate(title, slug, claimed)
+            if dup: return False, f"same story as another post in this batch: {reason}"
+            claimed.append({"title": title, "slug": slug, "filename": "(batch)", "date": today})
+            return True, ""
+
+    print(f"Planning {count} topics (+{BATCH_SPARE_TOPICS} spare)...")
+    topics = checkpoint("batch-topics", lambda: plan_batch_topics(
+        client, args, existing, excluded_cats, count + BATCH_SPARE_TOPICS) or None) or []
+    queue = list(topics)
+    posts = [None] * count
+    # Slots finished by an earlier attempt of this run keep their posts
+    # and titles; only the rest are written.
+    for i in range(count):
+        posts[i] = _run.load(f"slot{i}-post") if _run else None
+        if posts[i]: claim(posts[i]["title"])
+
+    def fill_slot(i):
+        _stage_scope.prefix = f"slot{i}-"
+        def attempt():
+            while True:
+                with lock:
+                    if not queue: return None
+                    td = queue.pop(0)
+                print(f"\n[slot {i+1}/{count}] Topic: {td['topic']} [{td.get('category','')}]")
+                post, reason = write_unique_post(client,td,existing,title_first=args.title_first,claim=claim)
+                if post is not None: return post
+                print(f"  [slot {i+1}] Duplicate: {reason}")
+        try:
+            return checkpoint("post", attempt)
+        finally:
+            _stage_scope.prefix = ""
+
+    todo = [i for i in range(count) if posts[i] is None]
+    with ThreadPoolExecutor(max_workers=max(1, min(BATCH_WORKERS, len(todo)))) as pool:
+        for i, post in zip(todo, pool.map(fill_slot, todo)):
+            posts[i] = post
+    written = [p for p in posts if p is not None]
+    if len(written) < count:
+        print(f"  ⚠ Only {len(written)} of {count} posts survived dedup ({len(topics)} topics planned)")
+    base = datetime.now()
+    for i, post in enumerate(written):
+        post["date"] = (base - timedelta(days=i * args.spacing)).strftime('%Y-%m-%d')
+    return written
+
+
+def publish_posts(posts, mirror=False):
+    """Render and save every post, take their topics off the topic
+    schedule, then write the derived files (index, RSS, sitemap) once and
+    create the Buttondown drafts. With mirror, the
+    new pages and the index are pointed at self-hosted copies of their
+    photos (image_mirror.py) before the RSS feed and sitemap are built."""
+    entries = []
+    for post in sorted(posts, key=lambda p: p['date']):
+        print(f"\n  Title: {post['title']} ({len(post['title'])} chars)\n  Category: {post['category']}\n  Date: {post['date']}\n  Duplicate check: PASS")
+        html, fn = create_blog_html(post)
+        fp = save_blog_post(html, fn)
+        save_record(make_record(post, fn))
+        for url, alt in post_images(post['content']):
+            _image_catalog.add(url, alt, post['category'])
+            _image_catalog.record_use(url, fn)
+        _image_catalog.record_use(post['hero_image'], fn)
+        record_post(fn, post['date'], post['hero_image'], [url for url, _ in post_images(post['content'])])
+        for url in set(re.findall(r'href="(https?://[^"]+)"', post['content'])):
+            _source_library.record_use("studies", url, fn)
+        if post.get('video'):
+            _source_library.record_use("videos", post['video']['id'], fn)
+        print(f"  Saved: {fp}\n")
+        entries.append((post, fn))
+    _image_catalog.save()
+    _source_library.save()
+    remove_topics({post.get('topic') for post, _ in entries}, get_existing_posts())
+    # A resumed run replays this too; blocks that already list the new
+    # posts come out unchanged and aren't rewritten.
+    refreshed = refresh_related_blocks([fn for _, fn in entries])
+    print(f"🔗 Related blocks updated in {len(refreshed)} post(s)" + (f": {', '.join(refreshed)}" if refreshed else ""))
+    update_blog_index(entries)
+    if mirror:
+        changed, failed = mirror_pages([fn for _, fn in entries] + ["index.html"])
+        print(f"🖼 Mirrored photos into {len(changed)} page(s)"
+              + (f"; {len(failed)} left hotlinked (not fetchable)" if failed else ""))
+    print("\nGenerating RSS feed..."); generate_rss_feed()
+    print("\nRegenerating sitemap..."); regenerate_sitemap()
+    for post, fn in entries:
+        print(f"\nCreating Buttondown draft for {fn}...")
+        # The one step that isn't safe to repeat: a resumed run skips it
+        # once a draft was created.
+        checkpoint(f"buttondown-{fn}", lambda: notify_buttondown(post, fn))
+    newest, fn = entries[-1]
+    title = newest['title'] if len(entries) == 1 else f"{len(entries)} posts, newest: {newest['title']}"
+    set_github_env("BLOG_TITLE",title); set_github_env("BLOG_FILENAME",fn); set_github_env("BLOG_DATE",newest['date'])
+    return entries
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate and publish one SteadiDay blog post.")
+    parser.add_argument("topic", nargs="?", default="",
+                        help="custom topic (omit to pick from the pool or the news)")
+    parser.add_argument("--news", action="store_true",
+                        help="generate a news-driven topic with web search")
+    parser.add_argument("--no-title-first", dest="title_first", action="store_false",
+                        help="write the full article before dedup-checking its title "
+                             "(the pre-v5.8 flow)")
+    parser.add_argument("--candidates", type=int, default=NEWS_TOPIC_CANDIDATES, metavar="K",
+                        help="news-driven topics to generate and dedup in one speculative round "
+                             f"(default {NEWS_TOPIC_CANDIDATES}; 1 = up to three serial attempts)")
+    parser.add_argument("--budget", type=int, metavar="SECONDS",
+                        help="wall-clock budget for the run; after it, image/video/study lookups are "
+                             f"skipped and fallbacks used (default {RUN_BUDGET_SECONDS} per "
+                             f"{BATCH_WORKERS} posts)")
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--no-cache", action="store_true",
+                       help=f"don't read or write the LLM response cache ({LLM_CACHE_DIR}), "
+                            "the dedup verdict cache or the URL liveness cache")
+    cache.add_argument("--refresh", action="store_true",
+                       help="ignore cached LLM responses but store the fresh ones")
+    parser.add_argument("--count", type=int, default=1, metavar="N",
+                        help="backlog mode: write N posts concurrently and publish them together")
+    parser.add_argument("--spacing", type=int, default=BATCH_DATE_SPACING_DAYS, metavar="DAYS",
+                        help=f"with --count, days between the posts' dates, newest today "
+                             f"(default {BATCH_DATE_SPACING_DAYS}; 0 = all today)")
+    parser.add_argument("--image-window-posts", type=int, default=IMAGE_REUSE_WINDOW_POSTS, metavar="N",
+                        help=f"don't reuse photos or library videos from the N newest posts "
+                             f"(default {IMAGE_REUSE_WINDOW_POSTS}; 0 = no post window)")
+    parser.add_argument("--image-window-days", type=int, default=IMAGE_REUSE_WINDOW_DAYS, metavar="DAYS",
+                        help="don't reuse photos or library videos used in the last DAYS days "
+                             "(default: no day window)")
+    parser.add_argument("--mirror-images", action="store_true",
+                        help="copy the new posts' photos into assets/img/ (resized, content-hashed) "
+                             "and point the pages at them instead of Unsplash")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="continue a run from its last checkpoint (\"latest\" = newest run; "
+                             "starts a new run if there is none)")
+    parser.add_argument("--model", action="append", default=[], metavar="TYPE=MODEL",
+                        help=f"override the model for one call type ({', '.join(MODEL_ROUTES)}); repeatable")
+    return parser.parse_args(argv)
+
+
+def start_run(args):
+    """Open the run named by --resume, or start a new one. A resumed run
+    keeps its original topic / --news mode; the other flags come from the
+    current command line."""
+    global _run
+    removed = gc_runs(RUN_CHECKPOINT_DIR, max_age_days=RUN_CHECKPOINT_MAX_AGE_DAYS)
+    if removed:
+        print(f"Removed {removed} stale run checkpoint(s)")
+    run = RunCheckpoints.open(RUN_CHECKPOINT_DIR, args.resume) if args.resume else None
+    if run is not None:
+        original = parse_args(run.meta["argv"])
+        args.topic, args.news = original.topic, original.news
+        done = run.completed_stages()
+        print(f"Resuming run {run.run_id}{' (already finished)' if run.complete else ''} "
+              f"(checkpointed: {', '.join(done) or 'nothing yet'})")
+    else:
+        if args.resume:
+            print("No run to resume; starting a new one")
+        run = RunCheckpoints.create(RUN_CHECKPOINT_DIR, sys.argv[1:])
+        print(f"Run ID: {run.run_id} (resume with --resume {run.run_id})")
+    _run = run
+    return run
+
+
 def main():
-    topic_override = None; use_news = False
-    if len(sys.argv) > 1:
-        arg = sys.argv[1].strip()
-        if arg == "--news": use_news = True
-        elif arg: topic_override = arg
-    if len(sys.argv) > 2 and sys.argv[2].strip() == "--news": use_news = True
-
-    print("="*60); print("SteadiDay Blog Generator v5.5"); print("="*60)
+    args = parse_args()
+    run = start_run(args)
+    topic_override = args.topic.strip() or None
+
+    print("="*60); print("SteadiDay Blog Generator v5.8"); print("="*60)
     print(f"Date: {datetime.now().strftime('%Y-%m-%d')}")
-    print(f"Mode: {'Custom' if topic_override else 'News' if use_news else 'Pool'}")
-    print(f"Model: {CLAUDE_MODEL} | Topics: {len(TOPIC_CATEGORIES)} | Categories: {len(VALID_CATEGORIES)}\n")
+    print(f"Mode: {'Custom' if topic_override else 'News' if args.news else 'Pool'}"
+          + (" | title-first" if args.title_first else "")
+          + (f" | batch of {args.count}, {args.spacing} days apart" if args.count > 1 else ""))
+    configure_models(args.model)
+    if topic_override and args.count > 1:
+        raise SystemExit("--count needs the topic pool or --news, not a custom topic")
+    waves = -(-max(1, args.count) // BATCH_WORKERS)
+    _scheduler.start_run(args.budget if args.budget is not None else RUN_BUDGET_SECONDS * waves)
+    _llm_cache.configure(read=not (args.no_cache or args.refresh), write=not args.no_cache)
+    _dedup_verdicts.configure(read=not (args.no_cache or args.refresh), write=not args.no_cache)
+    _liveness.configure(read=not (args.no_cache or args.refresh), write=not args.no_cache)
+    print(f"Models: {', '.join(f'{t}={m}' for t, m in MODEL_ROUTES.items())}")
+    print(f"Topics: {len(TOPIC_CATEGORIES)} | Categories: {len(VALID_CATEGORIES)}\n")
 
     print("Scanning existing posts...")
     existing = get_existing_posts()
@@ -1559,61 +2725,37 @@ def main():
     for p in existing[:10]: print(f"  - {p['title'] or p['filename']}" + (f" [{p['category']}]" if p.get('category') else ""))
     if len(existing) > 10: print(f"  ... and {len(existing)-10} more")
 
-    # Populate the cross-post image dedup set from recent post HTML files so
-    # the image search doesn't return URLs already used by neighbor posts.
-    recent_imgs = get_recently_used_images()
-    _used_images.update(recent_imgs)
+    # Populate the cross-post image dedup set from the image ledger so the
+    # image search doesn't return URLs already used by neighbor posts.
+    recent_imgs = get_recently_used_images(args.image_window_posts, args.image_window_days)
+    with _used_images_lock:
+        _used_images.update(recent_imgs)
     if recent_imgs:
         print(f"Loaded {len(recent_imgs)} image URLs to avoid duplicating")
+    recent_videos = get_recently_used_videos(args.image_window_posts, args.image_window_days)
+    with _used_videos_lock:
+        _used_videos.update(recent_videos)
+    if recent_videos:
+        print(f"Loaded {len(recent_videos)} library video(s) to avoid repeating")
     print()
 
-    client = anthropic.Anthropic()
+    # Retries are owned by _scheduler; the SDK's own retry loop would back
+    # off independently of the shared buckets.
+    client = anthropic.Anthropic(max_retries=0)
     excluded_cats = list(set(get_recent_categories(existing)))
 
-    if topic_override:
-        print(f"Custom topic: {topic_override}")
-        td = {"topic":topic_override,"keyword":topic_override.lower(),"category":"Wellness"}
-    elif use_news:
-        print("Generating news-driven topic...")
-        td = generate_news_driven_topic(client,existing,excluded_categories=excluded_cats)
-        print(f"  Topic: {td['topic']}\n  Category: {td['category']}")
+    if args.count > 1:
+        posts = produce_batch(client,args,existing,excluded_cats)
     else:
-        print("Selecting from topic pool...")
-        td = select_unique_topic(existing)
-        if td is None:
-            print("All pool topics used! Switching to news-driven...")
-            td = generate_news_driven_topic(client,existing,excluded_categories=excluded_cats)
-        else: print(f"  Selected: {td['topic']}\n  Category: {td['category']}")
-
-    print("\nGenerating content...")
-    post = generate_blog_post(td,existing,client)
-    slug = '-'.join(re.sub(r'[^a-z0-9\s]','',post['title'].lower()).split()[:5])
-    dup,reason = _check_duplicate(client,post['title'],slug,existing)
-
-    if dup:
-        print(f"  Duplicate (attempt 1): {reason}\n  Retrying news-driven...")
-        td = generate_news_driven_topic(client,existing,excluded_categories=excluded_cats)
-        post = generate_blog_post(td,existing,client)
-        slug = '-'.join(re.sub(r'[^a-z0-9\s]','',post['title'].lower()).split()[:5])
-        dup,reason = _check_duplicate(client,post['title'],slug,existing)
-    if dup:
-        print(f"  Duplicate (attempt 2): {reason}\n  Forcing different category...")
-        td = generate_news_driven_topic(client,existing,excluded_categories=list(set(excluded_cats+[td.get('category','')])))
-        post = generate_blog_post(td,existing,client)
-        slug = '-'.join(re.sub(r'[^a-z0-9\s]','',post['title'].lower()).split()[:5])
-        dup,reason = _check_duplicate(client,post['title'],slug,existing)
-    if dup: print(f"  Still duplicate after 3 attempts: {reason}"); sys.exit(1)
-
-    print(f"\n  Title: {post['title']} ({len(post['title'])} chars)\n  Category: {post['category']}\n  Duplicate check: PASS")
-    html, fn = create_blog_html(post)
-    fp = save_blog_post(html, fn)
-    print(f"  Saved: {fp}\n")
-    update_blog_index(post, fn)
-    print("\nGenerating RSS feed..."); generate_rss_feed()
-    print("\nRegenerating sitemap..."); regenerate_sitemap()
-    print("\nCreating Buttondown draft..."); notify_buttondown(post, fn)
-    set_github_env("BLOG_TITLE",post['title']); set_github_env("BLOG_FILENAME",fn); set_github_env("BLOG_DATE",post['date'])
-    print(f"\nDone! Published: {post['title']}")
+        post = checkpoint("post", lambda: produce_post(client,args,existing,excluded_cats,topic_override))
+        posts = [post] if post is not None else []
+    if not posts: print_telemetry(); sys.exit(1)
+
+    entries = publish_posts(posts, mirror=args.mirror_images)
+    run.mark_complete()
+    print_telemetry()
+    for post, fn in reversed(entries):
+        print(f"\nDone! Published: {post['title']}" + (f" ({fn})" if len(entries) > 1 else ""))
 
 if __name__ == "__main__":
     main()
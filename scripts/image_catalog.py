@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Local catalog of verified Unsplash photos, searched before the LLM is.
+
+Every post spent two web-search calls on photos (find_unsplash_images()
+and search_hero_image() in generate_blog.py), many of which came back as
+hallucinated IDs, while the photos earlier posts had already verified
+were thrown away; the only local pools were the hand-kept
+CATEGORY_IMAGES / HERO_IMAGES / INLINE_IMAGES lists. This catalog keeps
+them instead:
+
+- data/image_catalog.json (committed, like the post catalog) holds one
+  entry per photo, keyed by its base URL (no query string): alt text,
+  tags, category, the date it was last verified live and the posts that
+  used it.
+- Tags are the stemmed content words (post_search.tokens()) of the alt
+  text and the category, less GENERIC_TAG_WORDS that would match every
+  post ("senior", "older", "benefit", ...). Not of the topic or post the
+  photo was found for: "Chair exercises while watching TV" would match
+  any hero a TV post once used. A photo without alt text is tagged by
+  its category alone, so the generator doesn't use it from here.
+- match() scores an entry by the IDF-weighted tags it shares with the
+  query (a rare tag like "turmeric" outweighs a common one like
+  "exercise") and needs at least MIN_SHARED_TAGS shared tags to count as
+  a hit. Ties go to the photo used least, then to the query's category.
+- The generator adds every photo its searches accept, records each
+  published post's photos as uses, and asks match() before it spends a
+  search call; see run_research_stage().
+
+`import` seeds the catalog from the published posts' photos (alt text
+and post category) and the category pools, and re-tags what is there; `search` shows what a topic
+would get.
+
+    python3 scripts/image_catalog.py import
+    python3 scripts/image_catalog.py search "Turmeric for joint pain" --category Nutrition
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import threading
+
+from internal_links import GENERIC_WORDS
+from post_catalog import UNSPLASH_PHOTO_RE
+from post_search import tokens
+
+CATALOG_PATH = os.path.join("data", "image_catalog.json")
+# Fewer shared tags than this is no topical match: one shared word
+# ("walking") is as likely to be a different story as the same one.
+MIN_SHARED_TAGS = 2
+GENERIC_TAG_WORDS = set(tokens(" ".join(GENERIC_WORDS | {
+    "benefit", "benefits", "explained", "science", "study", "studies", "research", "today",
+    "guide", "photo", "image", "close", "closeup", "scene", "showing", "shows", "looking",
+    "smiling", "happy", "home", "american", "know", "want", "matter", "matters", "really"})))
+_IMG_RE = re.compile(r'<img\b[^>]*\bsrc="([^"]+)"[^>]*>')
+_ALT_RE = re.compile(r'\balt="([^"]*)"')
+
+
+def photo_key(url):
+    """The base Unsplash photo URL an entry is stored under, or None for
+    anything else."""
+    m = UNSPLASH_PHOTO_RE.match(url or "")
+    return m.group(0) if m else None
+
+
+def tag_terms(text):
+    return set(tokens(text)) - GENERIC_TAG_WORDS
+
+
+def tag_matches(query, entries, category="", k=6, exclude=None, min_shared=MIN_SHARED_TAGS):
+    """[(score, key, entry)] for up to k of entries ([(key, entry)], each
+    entry with "tags", "uses" and "category") sharing at least min_shared
+    tags with query: IDF-weighted score first, then fewest uses, then the
+    query's category."""
+    terms = tag_terms(query)
+    if not terms or not entries:
+        return []
+    df = {}
+    for _, entry in entries:
+        for tag in terms.intersection(entry["tags"]):
+            df[tag] = df.get(tag, 0) + 1
+    n = len(entries)
+    hits = []
+    for key, entry in entries:
+        shared = terms.intersection(entry["tags"])
+        if len(shared) < min_shared or (exclude and exclude(key)):
+            continue
+        score = sum(math.log((1 + n) / (1 + df[t])) + 1 for t in shared)
+        hits.append((-score, len(entry["uses"]), entry["category"] != category, key, entry))
+    hits.sort(key=lambda h: h[:4])
+    return [(-h[0], h[3], h[4]) for h in hits[:k]]
+
+
+class ImageCatalog:
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        self._entries = None
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def add(self, url, alt="", category="", verified=None):
+        """Add a photo, or fill in what its entry lacks. The first alt text
+        and category a photo gets are kept (LLM results sometimes reuse
+        one ID for two different descriptions) and the tags are made from
+        them."""
+        key = photo_key(url)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self.entries.setdefault(key, {"alt": "", "tags": [], "category": "",
+                                                  "verified": "", "uses": []})
+            entry["alt"] = entry["alt"] or alt
+            entry["category"] = entry["category"] or category
+            entry["tags"] = sorted(tag_terms(f"{entry['alt']} {entry['category']}"))
+            if verified:
+                entry["verified"] = verified
+        return key
+
+    def remove(self, url):
+        with self._lock:
+            self.entries.pop(photo_key(url), None)
+
+    def mark_verified(self, url, date):
+        with self._lock:
+            entry = self.entries.get(photo_key(url))
+            if entry is not None:
+                entry["verified"] = date
+
+    def record_use(self, url, filename):
+        with self._lock:
+            entry = self.entries.get(photo_key(url))
+            if entry is not None and filename not in entry["uses"]:
+                entry["uses"].append(filename)
+
+    def match(self, query, category="", k=6, exclude=None):
+        """[(score, base URL, entry)] for up to k photos that match query,
+        best first (tag_matches()). exclude(url) drops photos (e.g. ones
+        recent posts used)."""
+        with self._lock:
+            entries = list(self.entries.items())
+        return tag_matches(query, entries, category, k, exclude)
+
+    def save(self):
+        with self._lock:
+            entries = dict(sorted(self.entries.items()))
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False, indent=1)
+                f.write("\n")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # read-only checkout: the next run rediscovers them
+
+
+def post_images(content):
+    """[(url, alt)] for the Unsplash photos on a post page, hero first."""
+    out = []
+    for m in _IMG_RE.finditer(content):
+        if photo_key(m.group(1)):
+            alt = _ALT_RE.search(m.group(0))
+            out.append((m.group(1), alt.group(1) if alt else ""))
+    return out
+
+
+def main():
+    from generate_blog import INLINE_IMAGES
+    from post_catalog import load_posts
+
+    parser = argparse.ArgumentParser(description="Local catalog of verified Unsplash photos.")
+    parser.add_argument("command", choices=["import", "search"])
+    parser.add_argument("query", nargs="?", default="", help="search: the post topic")
+    parser.add_argument("--category", default="", help="search: the post category")
+    parser.add_argument("--blog-dir", default="blog")
+    parser.add_argument("-n", type=int, default=6, help="search: photos to show (default 6)")
+    args = parser.parse_args()
+    catalog = ImageCatalog()
+
+    if args.command == "search":
+        hits = catalog.match(args.query, args.category, args.n)
+        for score, key, entry in hits:
+            print(f"  {score:5.2f}  [{entry['category']}] {key}\n         {entry['alt'][:100]}")
+        print(f"{len(hits)} match(es) in {len(catalog.entries)} photo(s)")
+        return
+
+    if not os.path.isdir(args.blog_dir):
+        print(f"❌ {args.blog_dir} not found — run from repo root.")
+        sys.exit(1)
+    before = len(catalog.entries)
+    for post in sorted(load_posts(args.blog_dir), key=lambda p: p['filename']):
+        with open(os.path.join(args.blog_dir, post['filename']), encoding="utf-8") as f:
+            images = post_images(f.read())
+        for url, alt in images:
+            catalog.add(url, alt, post.get('category', ''))
+            catalog.record_use(url, post['filename'])
+    for category, images in INLINE_IMAGES.items():
+        for img in images:
+            catalog.add(img["url"], img["alt"], category)
+    catalog.save()
+    print(f"{CATALOG_PATH}: {len(catalog.entries) - before} photo(s) added, {len(catalog.entries)} in total")
+
+
+if __name__ == "__main__":
+    main()
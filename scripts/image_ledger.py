@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Append-only ledger of which photo appeared in which post, when, and as
+what.
+
+get_recently_used_images() in generate_blog.py avoided photos that "the
+15 newest posts" used, read out of the post catalog: a window measured
+in files, with no dates and no record of a photo's history. The ledger
+keeps that history instead:
+
+- data/image_ledger.jsonl (committed) gets one JSON line per photo per
+  published post: {"url": base photo URL, "post": filename, "date":
+  YYYY-MM-DD, "role": "hero" | "inline"}. Lines are only ever appended;
+  a post that already has lines isn't recorded twice (a resumed run
+  replays publishing).
+- recently_used() takes the reuse window as a post count, a number of
+  days, or both (a photo is recent if either window contains it);
+  recent_posts() is the same window as post filenames, which the source
+  library uses to keep recent posts' videos off the next one.
+
+`build` writes the ledger from the published corpus once; `recent`
+shows a window.
+
+    python3 scripts/image_ledger.py build
+    python3 scripts/image_ledger.py recent --posts 15 --days 60
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+from image_catalog import photo_key
+
+LEDGER_PATH = os.path.join("data", "image_ledger.jsonl")
+ROLES = ("hero", "inline")
+
+
+def load_ledger(path=LEDGER_PATH):
+    """Every ledger row, in file order; [] when there is no ledger."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def post_rows(filename, date, hero, inline_urls):
+    """Ledger rows for one post: its hero, then its inline photos."""
+    rows, seen = [], set()
+    for role, urls in (("hero", [hero]), ("inline", inline_urls)):
+        for url in urls:
+            key = photo_key(url)
+            if key and key not in seen:
+                seen.add(key)
+                rows.append({"url": key, "post": filename, "date": date, "role": role})
+    return rows
+
+
+def record_post(filename, date, hero, inline_urls, path=LEDGER_PATH):
+    """Append a published post's photos, unless the post is already in the
+    ledger. Returns the rows written."""
+    if any(row["post"] == filename for row in load_ledger(path)):
+        return []
+    rows = post_rows(filename, date, hero, inline_urls)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+    return rows
+
+
+def recent_posts(rows, posts=None, days=None, today=None):
+    """Filenames of the `posts` newest posts and/or the posts of the last
+    `days` days. Either window may be None (off)."""
+    today = today or datetime.now().strftime('%Y-%m-%d')
+    newest = sorted({(row["date"], row["post"]) for row in rows}, reverse=True)
+    window = {post for _, post in newest[:posts]} if posts else set()
+    since = (datetime.strptime(today, '%Y-%m-%d') - timedelta(days=days)).strftime('%Y-%m-%d') if days else None
+    return window | ({post for date, post in newest if date > since} if since else set())
+
+
+def recently_used(rows, posts=None, days=None, today=None):
+    """Base URLs of the photos used by the `posts` newest posts and/or in
+    the last `days` days. Either window may be None (off)."""
+    window = recent_posts(rows, posts, days, today)
+    return {row["url"] for row in rows if row["post"] in window}
+
+
+def main():
+    from post_catalog import load_posts
+
+    parser = argparse.ArgumentParser(description="Append-only ledger of photo usage across posts.")
+    parser.add_argument("command", choices=["build", "recent"])
+    parser.add_argument("--blog-dir", default="blog")
+    parser.add_argument("--posts", type=int, default=None, help="recent: window in posts")
+    parser.add_argument("--days", type=int, default=None, help="recent: window in days")
+    args = parser.parse_args()
+
+    if args.command == "recent":
+        used = recently_used(load_ledger(), args.posts, args.days)
+        for url in sorted(used):
+            print(f"  {url}")
+        print(f"{len(used)} photo(s) in the window")
+        return
+
+    if not os.path.isdir(args.blog_dir):
+        print(f"❌ {args.blog_dir} not found — run from repo root.")
+        sys.exit(1)
+    written = 0
+    for post in sorted(load_posts(args.blog_dir), key=lambda p: (p.get('date', ''), p['filename'])):
+        if not post.get('date'):
+            continue  # hand-built pages have no publish date to window on
+        written += len(record_post(post['filename'], post['date'], post.get('hero', ''),
+                                   post.get('images', [])))
+    print(f"{LEDGER_PATH}: {written} row(s) appended")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Optional self-hosted mirror of the posts' Unsplash photos.
+
+Every post hotlinks images.unsplash.com for its hero, inline figures,
+og:image / twitter:image / JSON-LD image and its blog-index card: one
+more DNS + TLS connection on the critical path, and a blank hero the
+day a photo ID stops existing. The mirror copies each photo into the
+site instead:
+
+- Each photo URL is fetched once per width it is used at (the w=
+  parameter, so a hero at 1200 and its index card at 800 are two
+  variants). Unsplash resizes and recompresses on request (w, q, fm);
+  with Pillow installed the result is re-encoded again locally
+  (progressive, optimised JPEG at MIRROR_QUALITY). Pillow is optional.
+- Files go to assets/img/ named by a hash of their bytes, so a changed
+  image never hides behind a cached old one. data/image_mirror.json
+  (committed) maps every mirrored "base URL?w=N" variant to its file.
+- rewrite_page() points a page at the mirrored copies: "../assets/img/..."
+  in src= attributes and CSS url(), absolute URLs in meta tags and
+  JSON-LD, which crawlers read from outside. URLs that failed to mirror
+  (a 404 photo) are left alone.
+
+The generator mirrors the new posts and the index when run with
+--mirror-images, and post_source.py keeps re-rendered pages pointed at
+the mirror. `backfill` mirrors the published posts; `serve` runs a
+local stand-in for images.unsplash.com (synthetic PNGs, 404 for
+anything that isn't a photo path) so all of this runs offline; set
+IMAGE_MIRROR_SOURCE to point the generator at it too:
+
+    python3 scripts/image_mirror.py serve --port 8765 &
+    python3 scripts/image_mirror.py backfill --source http://127.0.0.1:8765
+    IMAGE_MIRROR_SOURCE=http://127.0.0.1:8765 python3 scripts/generate_blog.py --mirror-images
+    python3 scripts/image_mirror.py backfill --dry-run
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import struct
+import sys
+import urllib.error
+import urllib.request
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    from PIL import Image
+except ImportError:  # keep Unsplash's own resize / recompression
+    Image = None
+
+MIRROR_DIR = os.path.join("assets", "img")
+MANIFEST_PATH = os.path.join("data", "image_mirror.json")
+SITE_URL = "https://www.steadiday.com"
+UNSPLASH_ORIGIN = "https://images.unsplash.com"
+# Where photos are fetched from: Unsplash, or the stand-in server.
+MIRROR_SOURCE = os.environ.get("IMAGE_MIRROR_SOURCE", UNSPLASH_ORIGIN)
+DEFAULT_WIDTH = 1200
+MIRROR_QUALITY = 78
+FETCH_TIMEOUT = 20
+MIRROR_WORKERS = 6
+_PHOTO_URL_RE = re.compile(r'https://images\.unsplash\.com/(photo-\d{10,15}-[a-f0-9]{12})(\?[^"\'\s)<>]*)?')
+# Contexts the browser resolves against the page; everything else (meta
+# content, JSON-LD) gets an absolute URL.
+_RELATIVE_CONTEXT_RE = re.compile(r'''(?:\bsrc=["']|url\(\s*["']?)$''')
+_EXTENSIONS = ((b"\xff\xd8", ".jpg"), (b"\x89PNG", ".png"), (b"RIFF", ".webp"), (b"GIF8", ".gif"))
+
+
+def variant_key(photo_id, query):
+    """"https://images.unsplash.com/photo-...?w=N": one mirrored file each."""
+    width = re.search(r'(?:^|[?&;])w=(\d+)', query or "")
+    return f"{UNSPLASH_ORIGIN}/{photo_id}?w={width.group(1) if width else DEFAULT_WIDTH}"
+
+
+def page_variants(content):
+    """The variant keys of every Unsplash photo URL in a page."""
+    return list(dict.fromkeys(variant_key(m.group(1), m.group(2)) for m in _PHOTO_URL_RE.finditer(content)))
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=1)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def recompress(data, width):
+    """(bytes, extension) for one fetched variant: re-encoded with Pillow
+    when it is installed and that makes the file smaller, else as fetched."""
+    ext = next((e for magic, e in _EXTENSIONS if data.startswith(magic)), ".jpg")
+    if Image is None:
+        return data, ext
+    try:
+        img = Image.open(io.BytesIO(data))
+        if img.width > width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        out = io.BytesIO()
+        img.convert("RGB").save(out, "JPEG", quality=MIRROR_QUALITY, optimize=True, progressive=True)
+    except Exception:
+        return data, ext
+    return (out.getvalue(), ".jpg") if out.tell() < len(data) else (data, ext)
+
+
+def fetch_variant(key, source=MIRROR_SOURCE, timeout=FETCH_TIMEOUT):
+    """The bytes of one variant, or None when the photo can't be fetched."""
+    url = key.replace(UNSPLASH_ORIGIN, source.rstrip("/"), 1) + f"&q={MIRROR_QUALITY}&fm=jpg&fit=max"
+    try:
+        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.read()
+    except (urllib.error.URLError, OSError):
+        return None
+
+
+def mirror_variants(keys, manifest, source=MIRROR_SOURCE, mirror_dir=MIRROR_DIR, workers=MIRROR_WORKERS):
+    """Fetch and store the keys manifest doesn't have yet, adding them to
+    it. Returns the keys that couldn't be fetched."""
+    todo = [k for k in dict.fromkeys(keys) if k not in manifest]
+
+    def store(key):
+        data = fetch_variant(key, source)
+        if not data:
+            return key, None
+        data, ext = recompress(data, int(key.rsplit("=", 1)[1]))
+        name = hashlib.sha256(data).hexdigest()[:16] + ext
+        os.makedirs(mirror_dir, exist_ok=True)
+        path = os.path.join(mirror_dir, name)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(data)
+        return key, f"{mirror_dir.replace(os.sep, '/')}/{name}"
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(todo) or 1))) as pool:
+        for key, path in pool.map(store, todo):
+            if path:
+                manifest[key] = path
+            else:
+                failed.append(key)
+    return failed
+
+
+def rewrite_page(content, manifest, relative_prefix="../", site_url=SITE_URL):
+    """content with every mirrored Unsplash URL pointed at its copy."""
+    def repl(m):
+        path = manifest.get(variant_key(m.group(1), m.group(2)))
+        if path is None:
+            return m.group(0)
+        if _RELATIVE_CONTEXT_RE.search(content[max(0, m.start() - 12):m.start()]):
+            return relative_prefix + path
+        return f"{site_url}/{path}"
+    return _PHOTO_URL_RE.sub(repl, content)
+
+
+def mirror_pages(filenames, blog_dir="blog", source=MIRROR_SOURCE, manifest_path=MANIFEST_PATH,
+                 mirror_dir=MIRROR_DIR, dry_run=False):
+    """Mirror the photos of blog_dir pages and rewrite the pages. Returns
+    (changed filenames, variant keys that failed to fetch)."""
+    manifest = load_manifest(manifest_path)
+    pages = {}
+    for name in filenames:
+        with open(os.path.join(blog_dir, name), encoding="utf-8") as f:
+            pages[name] = f.read()
+    keys = [k for content in pages.values() for k in page_variants(content)]
+    if dry_run:
+        return [name for name, content in pages.items() if page_variants(content)], []
+    failed = mirror_variants(keys, manifest, source, mirror_dir)
+    save_manifest(manifest, manifest_path)
+    changed = []
+    for name, content in pages.items():
+        new_content = rewrite_page(content, manifest)
+        if new_content != content:
+            with open(os.path.join(blog_dir, name), "w", encoding="utf-8") as f:
+                f.write(new_content)
+            changed.append(name)
+    return changed, failed
+
+
+def _png(width, height, rgb):
+    """A solid-colour PNG, for the stand-in server."""
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+    row = b"\x00" + bytes(rgb) * width
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height)) + chunk(b"IEND", b""))
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """images.unsplash.com for offline runs: /photo-<id>?w=N answers a
+    w × 2w/3 PNG coloured by the ID; anything else is a 404."""
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if not re.fullmatch(r'/photo-\d{10,15}-[a-f0-9]{12}', parts.path):
+            self.send_error(404)
+            return
+        width = min(int((parse_qs(parts.query).get("w") or [DEFAULT_WIDTH])[0]), 4000)
+        body = _png(width, max(1, width * 2 // 3), hashlib.sha256(parts.path.encode()).digest()[:3])
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Self-hosted mirror of the blog's Unsplash photos.")
+    parser.add_argument("command", choices=["backfill", "serve"])
+    parser.add_argument("--blog-dir", default="blog")
+    parser.add_argument("--source", default=MIRROR_SOURCE,
+                        help="backfill: where to fetch photos from (e.g. the stand-in server)")
+    parser.add_argument("--dry-run", action="store_true", help="backfill: list the pages that would change")
+    parser.add_argument("--port", type=int, default=8765, help="serve: port (default 8765)")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        print(f"Stand-in for {UNSPLASH_ORIGIN} on http://127.0.0.1:{args.port}")
+        ThreadingHTTPServer(("127.0.0.1", args.port), StandInHandler).serve_forever()
+        return
+
+    if not os.path.isdir(args.blog_dir):
+        print(f"❌ {args.blog_dir} not found — run from repo root.")
+        sys.exit(1)
+    names = sorted(n for n in os.listdir(args.blog_dir) if n.endswith(".html"))
+    changed, failed = mirror_pages(names, args.blog_dir, args.source, dry_run=args.dry_run)
+    for name in changed:
+        print(f"  [✓] {name}")
+    for key in failed:
+        print(f"  [-] {key}: not fetched, left hotlinked")
+    print(f"{'Would rewrite' if args.dry_run else 'Rewrote'} {len(changed)} page(s)"
+          + ("" if Image else " (Pillow not installed: Unsplash's own compression kept)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -75,11 +75,9 @@ def find_html_files(root_dir):
     return html_files
 
 
-def inject_into_file(filepath):
-    """Inject gtag and conversion snippets into a single HTML file."""
-    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-        content = f.read()
-
+def inject_into_content(content):
+    """Inject gtag and conversion snippets into one page's HTML. Returns
+    (content, modified)."""
     modified = False
 
     # 1. Inject gtag after <head>
@@ -111,6 +109,15 @@ def inject_into_file(filepath):
                 modified = True
                 break
 
+    return content, modified
+
+
+def inject_into_file(filepath):
+    """Inject gtag and conversion snippets into a single HTML file."""
+    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        content = f.read()
+
+    content, modified = inject_into_content(content)
     if modified:
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(content)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Internal links between blog posts, inserted locally after writing.
+
+The content prompt used to ask the model for "2-3 internal links to
+related posts on steadiday.com/blog/" without giving it a single URL, so
+the links were guesses or missing. inject_internal_links() does it
+instead, with no LLM call:
+
+- link_targets() turns every post's SEO keywords (its title, if it has
+  none) into anchor phrases: runs of two to four words that start and
+  end on a content word and hold at least two distinctive ones, so
+  "older adults", "warning signs" or "new 2026" never qualify. A phrase
+  claimed by more than one post is dropped.
+- The article body is walked text node by text node. Text inside
+  headings, existing <a> elements, figure captions, scripts and the
+  like is never touched. Longer phrases win, each target post is
+  linked at most once (and not at all when the article already links
+  it), and an article gets at most MAX_INTERNAL_LINKS internal links
+  in total, counting the ones it already has.
+
+Links are relative (href="2026-04-27-....html"), like the related-posts
+block. The same pass backfills published posts:
+
+    python3 scripts/internal_links.py            # add links across blog/
+    python3 scripts/internal_links.py --dry-run  # only report them
+"""
+
+import argparse
+import os
+import re
+import sys
+
+from body_similarity import article_html
+from dedup_index import STOP_WORDS
+
+MAX_INTERNAL_LINKS = 3
+# Text inside these elements is never turned into a link.
+SKIP_TAGS = {"a", "h1", "h2", "h3", "h4", "h5", "h6", "figcaption", "script", "style",
+             "iframe", "button", "nav", "aside", "title", "code", "pre"}
+# Words too common across posts to make an anchor on their own, on top of
+# the dedup stop words. Numbers never count either.
+GENERIC_WORDS = {"older", "adult", "people", "person", "new", "get", "actually", "often", "need",
+                 "know", "things", "thing", "risk", "increased", "signs", "sign", "warning",
+                 "women", "men", "woman", "man", "age", "aging", "day", "daily", "life", "year",
+                 "years", "time", "week", "weeks", "old", "good", "great", "real", "right", "wrong",
+                 "work", "works", "help", "helps", "stick", "skip", "tips", "senior", "midlife",
+                 "self", "check"}
+_VOID_TAGS = {"img", "br", "hr", "meta", "link", "input", "source", "wbr"}
+_INTERNAL_HREF_RE = re.compile(r'<a\b[^>]*\bhref="(?:\.\./blog/|/blog/|https://www\.steadiday\.com/blog/)?'
+                               r'([a-z0-9][a-z0-9-]*\.html)"')
+
+
+def _words(text):
+    return re.findall(r"[a-z0-9][a-z0-9']*", text.lower())
+
+
+def _distinctive(word):
+    return word not in STOP_WORDS and word not in GENERIC_WORDS and not word.isdigit()
+
+
+def _phrases(text):
+    """Two- to four-word runs from text that start and end on a content
+    word and contain at least two distinctive words."""
+    words = _words(text)
+    out = set()
+    for n in (2, 3, 4):
+        for i in range(len(words) - n + 1):
+            run = words[i:i + n]
+            if run[0] in STOP_WORDS or run[-1] in STOP_WORDS:
+                continue
+            if sum(_distinctive(w) for w in run) >= 2:
+                out.add(" ".join(run))
+    return out
+
+
+def _singular(word):
+    return word[:-1] if word.endswith("s") and not word.endswith("ss") and len(word) > 3 else word
+
+
+def _phrase_pattern(phrase):
+    parts = [re.escape(w) + r"(?:s|es)?" for w in phrase.split()]
+    return re.compile(r"(?<![\w-])" + r"[\s-]+".join(parts) + r"(?![\w-])", re.IGNORECASE)
+
+
+def link_targets(posts):
+    """[(pattern, phrase, filename)] for every unambiguous anchor phrase,
+    longest phrases first, newer posts first among equals."""
+    owners = {}
+    for rank, post in enumerate(posts):
+        sources = list(post.get('keywords', ())) or [post.get('title', '')]
+        for phrase in set().union(*(_phrases(s) for s in sources)):
+            # "joint pain" and "joint pains" are one anchor.
+            phrase = " ".join(_singular(w) for w in phrase.split())
+            owners.setdefault(phrase, set()).add((rank, post['filename']))
+    targets = []
+    for phrase, owner in owners.items():
+        if len({fn for _, fn in owner}) == 1:
+            rank, filename = min(owner)
+            targets.append((-len(phrase.split()), rank, phrase, filename))
+    targets.sort()
+    return [(_phrase_pattern(phrase), phrase, filename) for _, _, phrase, filename in targets]
+
+
+_targets_cache = (None, 0, None)
+
+
+def link_targets_for(posts):
+    """link_targets(), reused while the same list is passed in unchanged."""
+    global _targets_cache
+    cached_posts, size, targets = _targets_cache
+    if cached_posts is not posts or size != len(posts):
+        targets = link_targets(posts)
+        _targets_cache = (posts, len(posts), targets)
+    return targets
+
+
+def _link_region(region, targets, current_filename, limit):
+    linked = set(_INTERNAL_HREF_RE.findall(region)) - {"index.html"}
+    budget = limit - len(linked)
+    if budget <= 0:
+        return region, []
+    # (text, linkable) segments; tags are never linkable.
+    segments, skip = [], 0
+    for part in re.split(r'(<[^>]+>)', region):
+        if part.startswith("<"):
+            m = re.match(r'<\s*(/)?\s*([a-zA-Z0-9]+)', part)
+            name = m.group(2).lower() if m else ""
+            if name in SKIP_TAGS and name not in _VOID_TAGS and not part.endswith("/>"):
+                skip = max(0, skip - 1) if m.group(1) else skip + 1
+            segments.append([part, False])
+        elif part:
+            segments.append([part, skip == 0])
+    added = []
+    for pattern, _, filename in targets:
+        if len(added) >= budget:
+            break
+        if filename == current_filename or filename in linked:
+            continue
+        for i, (text, linkable) in enumerate(segments):
+            m = pattern.search(text) if linkable else None
+            if m:
+                segments[i:i + 1] = [[text[:m.start()], True], [f'<a href="{filename}">', False],
+                                     [m.group(0), False], ['</a>', False], [text[m.end():], True]]
+                linked.add(filename)
+                added.append(filename)
+                break
+    return "".join(text for text, _ in segments), added
+
+
+def inject_internal_links(content, posts, current_filename=None, limit=MAX_INTERNAL_LINKS):
+    """Link anchor phrases in content to other posts. `content` is either
+    a full post page (only its article-content body is edited) or the
+    article HTML itself. Returns (content, [linked filenames])."""
+    targets = link_targets_for(posts)
+    region = article_html(content)
+    if region is content:
+        return _link_region(content, targets, current_filename, limit)
+    start = content.index(region)
+    new_region, added = _link_region(region, targets, current_filename, limit)
+    return content[:start] + new_region + content[start + len(region):], added
+
+
+def main():
+    from post_catalog import load_posts
+
+    parser = argparse.ArgumentParser(description="Add internal links between published blog posts.")
+    parser.add_argument("--blog-dir", default="blog")
+    parser.add_argument("--dry-run", action="store_true", help="report the links without writing")
+    args = parser.parse_args()
+    if not os.path.isdir(args.blog_dir):
+        print(f"❌ {args.blog_dir} not found — run from repo root.")
+        sys.exit(1)
+    posts = load_posts(args.blog_dir)
+    total = 0
+    for post in posts:
+        path = os.path.join(args.blog_dir, post['filename'])
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        if '<div class="article-content">' not in content:
+            continue
+        new_content, added = inject_internal_links(content, posts, current_filename=post['filename'])
+        if not added:
+            continue
+        total += len(added)
+        print(f"  [✓] {post['filename']}: {', '.join(added)}")
+        if not args.dry_run:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(new_content)
+    print(f"{'Would add' if args.dry_run else 'Added'} {total} internal link(s) across {len(posts)} posts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+On-disk response cache for the Anthropic calls made by generate_blog.py.
+
+A rerun after a late failure (push conflict, sitemap error, template
+crash) used to repeat every paid call from scratch. ResponseCache stores
+each response under a content address: the SHA-256 of the full request
+(model, tools, system, messages, max_tokens), so any change to the prompt
+is automatically a miss and nothing needs invalidating by hand.
+
+- One JSON file per entry, holding msg.model_dump() plus the call type
+  and creation time; hits are rebuilt with Message.model_validate().
+- Expiry is per call type (ttls): news topics go stale in hours, study
+  and image lookups stay valid for days. Call types with no TTL are
+  never cached.
+- LRU eviction by total size: a hit touches the file's mtime, and after
+  each write the least recently used entries are removed until the
+  directory is back under max_bytes.
+- read=False skips lookups (--refresh, which still stores the fresh
+  responses); read=write=False turns the cache off (--no-cache).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from anthropic.types import Message
+
+
+class ResponseCache:
+    def __init__(self, directory, max_bytes, ttls):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self.read = True
+        self.write = True
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def configure(self, read=True, write=True):
+        self.read = read
+        self.write = write
+
+    @staticmethod
+    def key(request):
+        """Content address for a messages.create() request: every kwarg
+        that can change the response, canonically serialised."""
+        blob = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, call_type, request):
+        """Cached Message for this request, or None on a miss, an expired
+        entry, an unreadable file or a disabled cache."""
+        ttl = self.ttls.get(call_type)
+        if not (self.read and ttl):
+            return None
+        path = self._path(self.key(request))
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry["created"] > ttl:
+                os.remove(path)
+                raise FileNotFoundError(path)
+            msg = Message.model_validate(entry["message"])
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU: last use = mtime
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return msg
+
+    def put(self, call_type, request, msg):
+        if not (self.write and self.ttls.get(call_type)):
+            return
+        path = self._path(self.key(request))
+        entry = {"call_type": call_type, "model": request.get("model"),
+                 "created": time.time(), "message": msg.model_dump(mode="json")}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"  ⚠ LLM response cache write failed: {e}")
+            return
+        self.evict()
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits max_bytes."""
+        with self._lock:
+            entries = []
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Shared request scheduler for Anthropic calls made by generate_blog.py.
+
+Replaces the old call_with_retry(), which slept 30 * 2**attempt seconds
+for up to 7 retries (over an hour worst case) with no jitter, ignored the
+server's retry-after hint and had no notion of an overall deadline. Once
+the research stage started running calls concurrently, each caller also
+backed off on its own, so a 429 on one thread did nothing to slow the
+others.
+
+One RequestScheduler instance is shared by every call in the run:
+
+- Token buckets per model, sized to our requests-per-minute and
+  input-tokens-per-minute limits, pace calls before they are sent.
+- A 429/529/5xx (or connection error) is retried with full-jitter
+  exponential backoff, unless the server sent retry-after /
+  retry-after-ms, which wins. A rate-limit response pauses the whole
+  model bucket, so concurrent callers wait together instead of
+  hammering the API one by one.
+- A wall-clock budget for the run. Once it is spent, or a wait would
+  overrun it, calls marked optional raise BudgetExhausted straight away
+  so their stage can fall back instead of blocking the publish. Required
+  calls keep going.
+"""
+
+import random
+import threading
+import time
+
+from anthropic import APIConnectionError, APIStatusError
+
+
+class BudgetExhausted(Exception):
+    """Raised for an optional call when the run's wall-clock budget is spent."""
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `per_minute / 60` per
+    second, holding at most one minute's worth. reserve() books capacity
+    immediately (the balance may go negative) and returns how long the
+    caller must wait before using it, so concurrent callers queue in the
+    order they asked."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount):
+        amount = min(float(amount), self.capacity)
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.rate)
+
+
+def retry_after_seconds(error):
+    """Server retry hint from an APIStatusError, in seconds, or None."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            continue  # HTTP-date form; fall back to our own backoff
+    return None
+
+
+class RequestScheduler:
+    def __init__(self, requests_per_minute, input_tokens_per_minute, budget_seconds,
+                 max_retries=6, base_delay=2.0, max_delay=90.0):
+        self.requests_per_minute = requests_per_minute
+        self.input_tokens_per_minute = input_tokens_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._buckets = {}
+        self._paused_until = {}
+        self._lock = threading.Lock()
+        self.start_run(budget_seconds)
+
+    def start_run(self, budget_seconds):
+        """(Re)start the wall-clock budget from now."""
+        self.budget_seconds = budget_seconds
+        self.deadline = time.monotonic() + budget_seconds
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def _model_state(self, model):
+        with self._lock:
+            if model not in self._buckets:
+                self._buckets[model] = (TokenBucket(self.requests_per_minute),
+                                        TokenBucket(self.input_tokens_per_minute))
+            return self._buckets[model], self._paused_until.get(model, 0.0)
+
+    def _pause(self, model, seconds):
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._paused_until[model] = max(self._paused_until.get(model, 0.0), until)
+
+    def _wait(self, seconds, optional, label):
+        if seconds <= 0:
+            return
+        if optional and seconds >= self.remaining():
+            raise BudgetExhausted(f"{label}: run budget of {self.budget_seconds}s exhausted")
+        time.sleep(seconds)
+
+    def call(self, func, model, estimated_tokens=0, optional=False, label=""):
+        """Run func() (one API request against `model`) under the shared
+        rate limits, retrying transient failures. `estimated_tokens` is the
+        caller's input-token estimate for the bucket."""
+        for attempt in range(self.max_retries + 1):
+            if optional and self.remaining() <= 0:
+                raise BudgetExhausted(f"{label}: run budget of {self.budget_seconds}s exhausted")
+            (requests, tokens), paused_until = self._model_state(model)
+            pause = max(0.0, paused_until - time.monotonic())
+            self._wait(max(pause, requests.reserve(1), tokens.reserve(estimated_tokens)), optional, label)
+            try:
+                return func()
+            except APIStatusError as e:
+                if not (e.status_code in (429, 529) or e.status_code >= 500) or attempt == self.max_retries:
+                    raise
+                hint = retry_after_seconds(e)
+                status = e.status_code
+            except APIConnectionError:
+                if attempt == self.max_retries:
+                    raise
+                hint, status = None, "connection error"
+            # Full jitter: uniform over [0, capped exponential]. A server
+            # hint replaces it outright.
+            delay = hint if hint is not None else random.uniform(
+                0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+            if status in (429, 529):
+                self._pause(model, delay)
+            print(f"  API {status} on {label or model} (attempt {attempt + 1}/{self.max_retries + 1}), "
+                  f"retrying in {delay:.1f}s{' (server hint)' if hint is not None else ''}...")
+            self._wait(delay, optional, label)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Persistent catalog of published blog posts.
+
+get_existing_posts(), generate_rss_feed() and get_recently_used_images()
+in generate_blog.py each re-read blog/*.html with their own regexes on
+every run, and the backfill scraped blog/index.html to recover
+categories, which no post file records. All of them now read this
+catalog instead (get_recently_used_images() only without an image
+ledger, image_ledger.py).
+
+data/post_catalog.json (committed) holds one entry per post:
+filename, title, slug, category, date, meta_desc, hero, images (every
+Unsplash photo URL in the file, query string stripped), faq_count,
+keywords (the meta keywords), headings (the article's h2 / h3 text,
+for post_search.py), body_minhash (the article body's MinHash signature, body_similarity.py)
+and hash (SHA-256 of the file). It is written deterministically, so it
+only changes in git when a post does. A catalog written with an older
+CATALOG_VERSION is re-parsed in full once (categories are kept).
+
+Refresh is incremental. .cache/post_catalog_stat.json remembers each
+file's (mtime_ns, size); only files whose stat changed are hashed, and
+only files whose hash changed are parsed again. On a fresh checkout
+every mtime is new, so each file is hashed once but none is re-parsed.
+A category missing from an entry is taken from its blog/index.html card,
+which seeds the catalog the first time and after a hand edit.
+
+    python3 scripts/post_catalog.py            # refresh and summarise
+    python3 scripts/post_catalog.py --rebuild  # re-parse every post
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+from body_similarity import article_html, body_signature
+
+CATALOG_PATH = os.path.join("data", "post_catalog.json")
+STAT_CACHE_PATH = os.path.join(".cache", "post_catalog_stat.json")
+# Bumped whenever parse_post_html() gains a field.
+CATALOG_VERSION = 4
+# Files under this size are redirect stubs / placeholders, not posts.
+MIN_POST_BYTES = 1024
+
+UNSPLASH_PHOTO_RE = re.compile(r'https://images\.unsplash\.com/photo-\d{10,15}-[a-f0-9]{12}')
+
+
+def parse_index_categories(index_path):
+    """Return {filename: {"title": ..., "category": ...}} pulled from the
+    blog index cards. Only used to fill in categories the catalog doesn't
+    have yet."""
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path, encoding="utf-8") as f:
+        content = f.read()
+    out = {}
+    for card in re.findall(r'<article class="blog-card[^"]*">.*?</article>', content, re.DOTALL):
+        href_m = re.search(r'href="([^"]+\.html)"', card)
+        tag_m = re.search(r'class="blog-card-tag">([^<]+)</span>', card)
+        title_m = re.search(r'<h2><a [^>]+>([^<]+)</a></h2>', card)
+        if href_m:
+            out[href_m.group(1).strip()] = {
+                "title": title_m.group(1).strip() if title_m else "",
+                "category": tag_m.group(1).strip() if tag_m else "",
+            }
+    return out
+
+
+def parse_post_html(filename, content):
+    """Catalog fields for one post file (everything except category)."""
+    h1 = re.search(r'<h1[^>]*>(.*?)</h1>', content, re.DOTALL)
+    title = re.sub(r'<[^>]+>', '', h1.group(1)).strip() if h1 else ""
+    if not title:
+        title_tag = re.search(r'<title>(.*?)\s*(?:\||</title>)', content, re.DOTALL)
+        title = title_tag.group(1).strip() if title_tag else ""
+    desc = re.search(r'<meta\s+name="description"\s+content="([^"]*)"', content)
+    keywords = re.search(r'<meta\s+name="keywords"\s+content="([^"]*)"', content)
+    hero = re.search(r'<meta\s+property="og:image"\s+content="([^"]*)"', content)
+    date = re.match(r'(\d{4}-\d{2}-\d{2})', filename)
+    headings = [re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', '', h)).strip()
+                for h in re.findall(r'<h[23][^>]*>(.*?)</h[23]>', article_html(content), re.DOTALL)]
+    images = []
+    for url in UNSPLASH_PHOTO_RE.findall(content):
+        if url not in images:
+            images.append(url)
+    return {
+        "filename": filename,
+        "title": title,
+        "slug": re.sub(r'^\d{4}-\d{2}-\d{2}-', '', filename.replace('.html', '')),
+        "date": date.group(1) if date else "",
+        "meta_desc": desc.group(1).strip() if desc else "",
+        "keywords": [k.strip() for k in keywords.group(1).split(",") if k.strip()] if keywords else [],
+        "hero": hero.group(1).strip() if hero else "",
+        "images": images,
+        "headings": [h for h in headings if h],
+        "faq_count": len(re.findall(r'"@type"\s*:\s*"Question"', content)),
+        "body_minhash": body_signature(content),
+    }
+
+
+def _read_json(path, default):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, value, **kwargs):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, **kwargs)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def refresh_catalog(blog_dir="blog", catalog_path=CATALOG_PATH, stat_path=STAT_CACHE_PATH, rebuild=False):
+    """Bring the catalog in line with blog_dir and return it as
+    {filename: entry}. Entries for deleted posts are dropped. `rebuild`
+    re-parses every post but keeps the recorded categories."""
+    stored = _read_json(catalog_path, {})
+    previous = stored.get("posts", {})
+    rebuild = rebuild or (bool(previous) and stored.get("version") != CATALOG_VERSION)
+    catalog = {} if rebuild else dict(previous)
+    stats = {} if rebuild else _read_json(stat_path, {})
+    if not os.path.isdir(blog_dir):
+        return catalog
+    new_stats, changed, seen = {}, False, set()
+    for entry in os.scandir(blog_dir):
+        name = entry.name
+        if not name.endswith(".html") or name == "index.html":
+            continue
+        st = entry.stat()
+        if st.st_size < MIN_POST_BYTES:
+            continue
+        seen.add(name)
+        stat_key = [st.st_mtime_ns, st.st_size]
+        new_stats[name] = stat_key
+        if stats.get(name) == stat_key and name in catalog:
+            continue
+        with open(entry.path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        old = catalog.get(name)
+        if old and old.get("hash") == digest:
+            continue
+        fresh = parse_post_html(name, raw.decode("utf-8", errors="replace"))
+        fresh["category"] = previous.get(name, {}).get("category", "")
+        fresh["hash"] = digest
+        catalog[name] = fresh
+        changed = True
+    for name in set(catalog) - seen:
+        del catalog[name]
+        changed = True
+
+    missing = [n for n, e in catalog.items() if not e.get("category")]
+    if missing:
+        cards = parse_index_categories(os.path.join(blog_dir, "index.html"))
+        for name in missing:
+            category = cards.get(name, {}).get("category", "")
+            if category:
+                catalog[name]["category"] = category
+                changed = True
+
+    if changed or rebuild or not os.path.exists(catalog_path):
+        _write_json(catalog_path, {"version": CATALOG_VERSION, "posts": dict(sorted(catalog.items()))},
+                    indent=1, sort_keys=True)
+    if new_stats != stats:
+        try:
+            _write_json(stat_path, new_stats)
+        except OSError:
+            pass  # read-only checkout: next run just hashes again
+    return catalog
+
+
+def load_posts(blog_dir="blog", catalog_path=CATALOG_PATH):
+    """Refreshed catalog entries, newest first (by date, then filename).
+    An up-to-date refresh is one directory scan, no file reads."""
+    posts = [dict(e) for e in refresh_catalog(blog_dir, catalog_path).values()]
+    posts.sort(key=lambda p: (p.get("date", ""), p["filename"]), reverse=True)
+    return posts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the blog post catalog.")
+    parser.add_argument("--blog-dir", default="blog")
+    parser.add_argument("--rebuild", action="store_true", help="re-parse every post")
+    args = parser.parse_args()
+    if not os.path.isdir(args.blog_dir):
+        print(f"❌ {args.blog_dir} not found — run from repo root.")
+        sys.exit(1)
+    catalog = refresh_catalog(args.blog_dir, rebuild=args.rebuild)
+    uncategorised = sorted(n for n, e in catalog.items() if not e.get("category"))
+    print(f"{CATALOG_PATH}: {len(catalog)} posts, {len(uncategorised)} without a category")
+    for name in uncategorised:
+        print(f"  - {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+BM25 search over the post catalog.
+
+The content, title and news prompts used to list the 15 newest posts as
+"do NOT duplicate", whatever the topic. The post a new article is most
+likely to repeat is rarely among the newest, and the list only grows in
+cost with the corpus. SearchIndex ranks every post against the topic
+instead, so a prompt carries the few posts that matter.
+
+A post's document is its title (counted TITLE_WEIGHT times), meta
+description and section headings (catalog field "headings"), tokenised
+like the duplicate checks: normalised, stop words dropped, stemmed.
+Scoring is Okapi BM25 with the usual k1 / b.
+
+    python3 scripts/post_search.py "sleep and memory after 60"
+"""
+
+import math
+import os
+import sys
+from collections import Counter
+
+from dedup_index import STOP_WORDS, _stem, normalize_text
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+
+
+def tokens(text):
+    return [_stem(w) for w in normalize_text(text).split() if w not in STOP_WORDS]
+
+
+def post_document(post):
+    parts = [post.get('title', '')] * TITLE_WEIGHT + [post.get('meta_desc', '')]
+    parts.extend(post.get('headings', ()))
+    return tokens(" ".join(parts))
+
+
+class SearchIndex:
+    def __init__(self, posts):
+        self.posts = list(posts)
+        self._tf = [Counter(post_document(p)) for p in self.posts]
+        self._len = [sum(tf.values()) for tf in self._tf]
+        self._avg_len = (sum(self._len) / len(self._len)) if self._len else 0.0
+        self._postings = {}  # term -> [post index]
+        for i, tf in enumerate(self._tf):
+            for term in tf:
+                self._postings.setdefault(term, []).append(i)
+
+    def _idf(self, term):
+        n, df = len(self.posts), len(self._postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query, k=10):
+        """[(score, post)] for the k best-matching posts with a positive
+        score, best first; ties go to the earlier (newer) post."""
+        scores = Counter()
+        for term in set(tokens(query)):
+            idf = self._idf(term)
+            for i in self._postings.get(term, ()):
+                tf = self._tf[i][term]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._len[i] / (self._avg_len or 1))
+                scores[i] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(score, self.posts[i]) for i, score in ranked if score > 0]
+
+
+_index_cache = (None, 0, None)
+
+
+def search_index_for(posts):
+    """SearchIndex over posts, reused while the same list is passed in
+    unchanged."""
+    global _index_cache
+    cached_posts, size, index = _index_cache
+    if cached_posts is not posts or size != len(posts):
+        index = SearchIndex(posts)
+        _index_cache = (posts, len(posts), index)
+    return index
+
+
+def main():
+    from post_catalog import load_posts
+
+    if len(sys.argv) < 2:
+        print('usage: python3 scripts/post_search.py "query" [k]')
+        sys.exit(1)
+    if not os.path.isdir("blog"):
+        print("❌ blog/ not found — run from repo root.")
+        sys.exit(1)
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    for score, post in search_index_for(load_posts()).search(sys.argv[1], k):
+        print(f"  {score:6.2f}  [{post.get('category', '')}] {post['title']}  ({post['filename']})")
+
+
+if __name__ == "__main__":
+    main()
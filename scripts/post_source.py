@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Post source records: each post's structured data, and re-rendering from it.
+
+A template change used to reach published posts only through one more
+regex backfill over their HTML (unify_blog_style.py,
+backfill_blog_a11y.py, backfill_post_enhancements.py). Now every post
+also has a source record, data/posts/<post filename stem>.json, holding
+what the generator produced: title, meta description, keywords, date,
+read time, category, hero image, video, FAQs and the article content
+HTML. publish_posts() writes the record next to the page.
+
+`rerender` rebuilds every page from its record with the current
+get_html_template() (create_blog_html(), generate_blog.py), in a pool
+of worker processes; the related-posts block is picked afresh, as the
+publish-time refresh would, and photos the image mirror holds
+(image_mirror.py) stay pointed at it. The rendered page then gets the
+same gtag / App Store conversion snippets inject_gtag.py adds to every
+page, so a re-render and the inject-gtag workflow agree and neither
+undoes the other. Pages whose output is unchanged aren't touched, and a
+page whose re-render would still lose tracking markup the published
+page has (TRACKING_MARKERS) is reported and left alone.
+
+`import` builds records for posts published before records existed,
+from their HTML: the fields the template renders (title from the h1,
+meta tags, og:image hero, "N min read", the FAQPage JSON-LD) and the
+article-content div up to the CTA box, less any related-posts block
+inside it. Posts that already have a record are skipped unless --force,
+and so are hand-built pages (no date in the filename, like the
+medication-app guide): their layout isn't the template's, so they get
+no record and rerender leaves them alone.
+
+    python3 scripts/post_source.py import     # one-time, for existing posts
+    python3 scripts/post_source.py rerender   # rebuild blog/ from data/posts/
+    python3 scripts/post_source.py rerender --dry-run
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from inject_gtag import CONVERSION_LABEL, CONVERSION_MARKER, GTAG_MARKER, inject_into_content
+
+SOURCE_DIR = os.path.join("data", "posts")
+RECORD_FIELDS = ("filename", "title", "meta_description", "keywords", "date", "read_time", "category",
+                 "hero_image", "video", "faqs", "content")
+# Markup a re-rendered page must keep when the published one has it.
+TRACKING_MARKERS = (GTAG_MARKER, CONVERSION_MARKER, CONVERSION_LABEL)
+_RELATED_BLOCK_RE = re.compile(r'\s*<aside class="related-posts"[^>]*>.*?</aside>', re.DOTALL)
+_VIDEO_RE = re.compile(r'<iframe[^>]*src="https://www\.youtube(?:-nocookie)?\.com/embed/([\w-]+)"[^>]*title="([^"]*)"'
+                       r'.*?<p class="video-caption">Video: .*? -- (.*?)</p>', re.DOTALL)
+
+
+def record_path(filename, source_dir=SOURCE_DIR):
+    return os.path.join(source_dir, os.path.splitext(filename)[0] + ".json")
+
+
+def make_record(post_data, filename):
+    """The source record for a post the generator just rendered."""
+    record = {field: post_data.get(field) for field in RECORD_FIELDS}
+    record["filename"] = filename
+    return record
+
+
+def save_record(record, source_dir=SOURCE_DIR):
+    path = record_path(record["filename"], source_dir)
+    os.makedirs(source_dir, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    os.replace(tmp, path)
+    return path
+
+
+def load_records(source_dir=SOURCE_DIR):
+    """Every record in source_dir, by filename."""
+    records = {}
+    if not os.path.isdir(source_dir):
+        return records
+    for name in sorted(os.listdir(source_dir)):
+        if name.endswith(".json"):
+            with open(os.path.join(source_dir, name), encoding="utf-8") as f:
+                record = json.load(f)
+            records[record["filename"]] = record
+    return records
+
+
+def _meta(content, attr, name):
+    m = re.search(rf'<meta\s+{attr}="{re.escape(name)}"\s+content="([^"]*)"', content)
+    return m.group(1) if m else ""
+
+
+def import_post_html(filename, content, category=""):
+    """A source record recovered from a published page, or None when the
+    page has no article-content div to take the body from."""
+    start = content.find('<div class="article-content">')
+    end = content.find('<div class="cta-box">', start)
+    if start < 0 or end < 0:
+        return None
+    body = _RELATED_BLOCK_RE.sub("", content[start + len('<div class="article-content">'):end]).strip()
+    h1 = re.search(r'<h1[^>]*>(.*?)</h1>', content, re.DOTALL)
+    date = re.match(r'(\d{4}-\d{2}-\d{2})', filename)
+    read_time = re.search(r'(\d+)\s*min read', content)
+    faqs = []
+    for block in re.findall(r'<script type="application/ld\+json">\s*(.*?)\s*</script>', content, re.DOTALL):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and data.get("@type") == "FAQPage":
+            faqs = [{"q": q.get("name", ""), "a": q.get("acceptedAnswer", {}).get("text", "")}
+                    for q in data.get("mainEntity", [])]
+    video = _VIDEO_RE.search(body)
+    return {
+        "filename": filename,
+        "title": h1.group(1).strip() if h1 else "",
+        "meta_description": _meta(content, "name", "description"),
+        "keywords": _meta(content, "name", "keywords"),
+        "date": date.group(1) if date else _meta(content, "property", "article:published_time")[:10],
+        "read_time": read_time.group(1) if read_time else "7",
+        "category": category,
+        "hero_image": _meta(content, "property", "og:image"),
+        "video": ({"id": video.group(1), "title": html.unescape(video.group(2)), "channel": video.group(3)}
+                  if video else None),
+        "faqs": faqs,
+        "content": body,
+    }
+
+
+def _render(job):
+    """"unchanged", "changed" or "lost-tracking" for one record's page."""
+    from generate_blog import create_blog_html
+    from image_mirror import rewrite_page
+
+    record, related, blog_dir, dry_run, mirrored = job
+    page, _ = create_blog_html(dict(record, related_posts=related))
+    page, _ = inject_into_content(rewrite_page(page, mirrored))
+    path = os.path.join(blog_dir, record["filename"])
+    try:
+        with open(path, encoding="utf-8") as f:
+            old = f.read()
+    except OSError:
+        old = ""
+    if old == page:
+        return "unchanged"
+    if any(marker in old and marker not in page for marker in TRACKING_MARKERS):
+        return "lost-tracking"
+    if not dry_run:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page)
+    return "changed"
+
+
+def rerender(blog_dir="blog", source_dir=SOURCE_DIR, workers=None, dry_run=False):
+    """Rebuild every page that has a record. Returns (filenames whose page
+    changed, or would with dry_run; filenames left alone because their
+    re-render would drop tracking markup)."""
+    from generate_blog import get_existing_posts, pick_related_posts
+    from image_mirror import load_manifest
+
+    records = load_records(source_dir)
+    mirrored = load_manifest()
+    posts = get_existing_posts(blog_dir)
+    jobs = [(record, pick_related_posts(record.get("category", ""), posts, current_filename=name),
+             blog_dir, dry_run, mirrored)
+            for name, record in records.items()]
+    workers = max(1, workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_render, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    names = [job[0]["filename"] for job in jobs]
+    return ([n for n, r in zip(names, results) if r == "changed"],
+            [n for n, r in zip(names, results) if r == "lost-tracking"])
+
+
+def main():
+    from post_catalog import load_posts
+
+    parser = argparse.ArgumentParser(description="Post source records: import and re-render.")
+    parser.add_argument("command", choices=["import", "rerender"])
+    parser.add_argument("--blog-dir", default="blog")
+    parser.add_argument("--force", action="store_true", help="import: overwrite existing records")
+    parser.add_argument("--dry-run", action="store_true", help="rerender: list the pages that would change")
+    parser.add_argument("--workers", type=int, default=None, help="rerender: worker processes (default: CPU count)")
+    args = parser.parse_args()
+    if not os.path.isdir(args.blog_dir):
+        print(f"❌ {args.blog_dir} not found — run from repo root.")
+        sys.exit(1)
+
+    if args.command == "import":
+        existing = load_records()
+        imported = skipped = 0
+        for post in load_posts(args.blog_dir):
+            name = post['filename']
+            if name in existing and not args.force:
+                continue
+            if not re.match(r'\d{4}-\d{2}-\d{2}-', name):
+                print(f"  [-] {name}: hand-built page, skipped")
+                skipped += 1
+                continue
+            with open(os.path.join(args.blog_dir, name), encoding="utf-8") as f:
+                record = import_post_html(name, f.read(), post.get('category', ''))
+            if record is None:
+                print(f"  [-] {name}: no article-content div, skipped")
+                skipped += 1
+                continue
+            save_record(record)
+            imported += 1
+        print(f"{SOURCE_DIR}: {imported} record(s) imported, {skipped} skipped")
+        return
+
+    changed, lost = rerender(args.blog_dir, workers=args.workers, dry_run=args.dry_run)
+    for name in changed:
+        print(f"  [✓] {name}")
+    for name in lost:
+        print(f"  [!] {name}: re-render would drop tracking markup, left alone")
+    print(f"{'Would re-render' if args.dry_run else 'Re-rendered'} {len(changed)} page(s)")
+    if lost:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Related posts by body text: TF-IDF vectors and cosine similarity.
+
+pick_related_posts() in generate_blog.py chose the footer's "Related
+from the SteadiDay Blog" links by category alone (then the hand-written
+_RELATED_CATEGORIES graph, then recency), so a post about GLP-1 drugs
+and frailty was "related" to anything else tagged Medication Tips.
+It now asks this module first and keeps the category rules for
+filling whatever is left.
+
+- Each post's document is its title, meta description and article
+  body (article_text(), body_similarity.py), tokenised like post_search:
+  normalised, stop words dropped, stemmed.
+- RelatedIndex weighs terms by sublinear TF times smoothed IDF into one
+  L2-normalised NumPy matrix. A term that occurs in a single post
+  can't make two posts similar, so its column is dropped after it has
+  counted towards the norm, which keeps the matrix small and the
+  cosines exact.
+- neighbours() multiplies the matrix by its transpose in row blocks
+  (NEIGHBOUR_BLOCK rows at a time, so memory stays bounded at any corpus
+  size) and keeps each post's top RELATED_NEIGHBOURS. Posts that share
+  a category get a CATEGORY_TIE_BREAK nudge, which settles ties and
+  nothing else. query() scores a new, unpublished body the same way.
+- neighbour_table() caches the table in .cache/related_posts.json,
+  keyed by every post's filename, content hash and category, so it is
+  recomputed only when the corpus changes. The generator and
+  backfill_post_enhancements.py both read it.
+
+NumPy is optional: without it similar_posts() returns nothing and the
+category rules decide alone.
+
+    python3 scripts/related_posts.py            # every post's top neighbours
+    python3 scripts/related_posts.py FILENAME   # one post's
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # category-only related posts
+    np = None
+
+from body_similarity import article_text
+from post_search import tokens
+
+RELATED_NEIGHBOURS = 10
+NEIGHBOUR_BLOCK = 512
+CATEGORY_TIE_BREAK = 1e-6
+NEIGHBOUR_CACHE_PATH = os.path.join(".cache", "related_posts.json")
+_RELATED_BLOCK_RE = re.compile(r'<aside class="related-posts"[^>]*>.*?</aside>', re.DOTALL)
+
+
+def post_terms(post, blog_dir="blog"):
+    """Term counts for one published post (title, meta description and
+    article body). A related-posts block inside the body is left out, or
+    rewriting it would change the post's own neighbours."""
+    try:
+        with open(os.path.join(blog_dir, post['filename']), encoding="utf-8") as f:
+            body = article_text(_RELATED_BLOCK_RE.sub(" ", f.read()))
+    except OSError:
+        body = ""
+    return Counter(tokens(" ".join([post.get('title', ''), post.get('meta_desc', ''), body])))
+
+
+class RelatedIndex:
+    def __init__(self, posts, blog_dir="blog"):
+        self.posts = list(posts)
+        docs = [post_terms(p, blog_dir) for p in self.posts]
+        n = len(docs)
+        df = Counter(term for doc in docs for term in doc)
+        self._idf = {term: math.log((1 + n) / (1 + d)) + 1 for term, d in df.items()}
+        self._unseen_idf = math.log(1 + n) + 1
+        self.vocab = {term: col for col, term in enumerate(sorted(t for t, d in df.items() if d > 1))}
+        self.matrix = np.zeros((n, len(self.vocab)), dtype=np.float32)
+        for row, doc in enumerate(docs):
+            self.matrix[row] = self._vector(doc, self._idf.__getitem__)
+        self._categories = np.array([p.get('category', '') for p in self.posts], dtype=object)
+
+    def _vector(self, doc, idf):
+        vec = np.zeros(len(self.vocab), dtype=np.float32)
+        norm = 0.0
+        for term, tf in doc.items():
+            weight = (1 + math.log(tf)) * idf(term)
+            norm += weight * weight
+            col = self.vocab.get(term)
+            if col is not None:
+                vec[col] = weight
+        return vec / math.sqrt(norm) if norm else vec
+
+    def _ranked(self, scores, same_category, k):
+        """Indices of the k best positive scores, best first; category,
+        then position (newer first) break ties."""
+        ranked = scores + CATEGORY_TIE_BREAK * same_category
+        k = min(k, len(ranked))
+        if k <= 0:
+            return []
+        top = np.argpartition(-ranked, k - 1)[:k]
+        top = top[np.lexsort((top, -ranked[top]))]
+        return [int(i) for i in top if scores[i] > 0]
+
+    def neighbours(self, k=RELATED_NEIGHBOURS):
+        """{filename: [[neighbour filename, cosine], ...]} for every post,
+        most similar first."""
+        table = {}
+        for start in range(0, len(self.posts), NEIGHBOUR_BLOCK):
+            block = self.matrix[start:start + NEIGHBOUR_BLOCK] @ self.matrix.T
+            for offset, scores in enumerate(block):
+                row = start + offset
+                scores[row] = 0.0
+                same = self._categories == self._categories[row]
+                table[self.posts[row]['filename']] = [
+                    [self.posts[i]['filename'], round(float(scores[i]), 4)]
+                    for i in self._ranked(scores, same, k)]
+        return table
+
+    def query(self, content, category="", k=RELATED_NEIGHBOURS):
+        """[(cosine, post)] for the posts most similar to an unpublished
+        article (content: the post page or its article HTML)."""
+        doc = Counter(tokens(article_text(content)))
+        vec = self._vector(doc, lambda term: self._idf.get(term, self._unseen_idf))
+        scores = self.matrix @ vec
+        return [(float(scores[i]), self.posts[i])
+                for i in self._ranked(scores, self._categories == category, k)]
+
+
+_index_cache = (None, 0, None)
+
+
+def related_index_for(posts, blog_dir="blog"):
+    """RelatedIndex over posts, reused while the same list is passed in
+    unchanged."""
+    global _index_cache
+    cached_posts, size, index = _index_cache
+    if cached_posts is not posts or size != len(posts):
+        index = RelatedIndex(posts, blog_dir)
+        _index_cache = (posts, len(posts), index)
+    return index
+
+
+def corpus_fingerprint(posts):
+    """Changes whenever a post is added, removed, edited or recategorised."""
+    state = sorted((p['filename'], p.get('hash', ''), p.get('category', '')) for p in posts)
+    return hashlib.sha256(json.dumps([RELATED_NEIGHBOURS, state]).encode()).hexdigest()
+
+
+_table_cache = (None, None)
+
+
+def neighbour_table(posts, blog_dir="blog", cache_path=NEIGHBOUR_CACHE_PATH):
+    """RelatedIndex.neighbours() for posts, from memory or cache_path when
+    the corpus is unchanged. {} without NumPy."""
+    global _table_cache
+    if np is None:
+        return {}
+    fingerprint = corpus_fingerprint(posts)
+    if _table_cache[0] == fingerprint:
+        return _table_cache[1]
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        stored = {}
+    if stored.get("fingerprint") == fingerprint:
+        table = stored["neighbours"]
+    else:
+        table = related_index_for(posts, blog_dir).neighbours()
+        try:
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            tmp = cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": fingerprint, "neighbours": table}, f)
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass  # read-only checkout: recomputed next run
+    _table_cache = (fingerprint, table)
+    return table
+
+
+def similar_posts(posts, current_filename=None, content=None, category="", n=RELATED_NEIGHBOURS,
+                  blog_dir="blog"):
+    """Up to n posts most similar to a published post (current_filename,
+    from the neighbour table) or to an unpublished article (content).
+    [] without NumPy or when nothing shares a term."""
+    if np is None or not posts:
+        return []
+    if content is not None:
+        return [p for _, p in related_index_for(posts, blog_dir).query(content, category, n + 1)
+                if p['filename'] != current_filename][:n]
+    by_name = {p['filename']: p for p in posts}
+    row = neighbour_table(posts, blog_dir).get(current_filename, [])
+    return [by_name[name] for name, _ in row if name in by_name][:n]
+
+
+def main():
+    from post_catalog import load_posts
+
+    parser = argparse.ArgumentParser(description="Show each blog post's most similar posts.")
+    parser.add_argument("filename", nargs="?", help="only this post")
+    parser.add_argument("--blog-dir", default="blog")
+    parser.add_argument("-n", type=int, default=3, help="neighbours per post (default 3)")
+    args = parser.parse_args()
+    if not os.path.isdir(args.blog_dir):
+        print(f"❌ {args.blog_dir} not found — run from repo root.")
+        sys.exit(1)
+    if np is None:
+        print("❌ NumPy is not installed (pip install numpy).")
+        sys.exit(1)
+    posts = load_posts(args.blog_dir)
+    table = neighbour_table(posts, args.blog_dir)
+    categories = {p['filename']: p.get('category', '') for p in posts}
+    for name in ([args.filename] if args.filename else [p['filename'] for p in posts]):
+        print(f"{name} [{categories.get(name, '?')}]")
+        for other, score in table.get(name, [])[:args.n]:
+            print(f"  {score:.3f}  [{categories.get(other, '')}] {other}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Stage checkpoints for generate_blog.py runs.
+
+A run is a chain of expensive steps (topic, research lookups, content,
+dedup) followed by cheap file updates and one external side effect
+(the Buttondown draft). Before this, an exception in a late step threw
+away everything before it. Each run now gets a directory under
+.cache/runs/<run-id>/ with one JSON file per finished stage;
+`generate_blog.py --resume <run-id>` replays finished stages from disk
+and carries on from the first one that isn't there.
+
+- stage(name, fn, key=None) returns the checkpointed value when one
+  exists with the same key, otherwise runs fn() and saves its result.
+  The key guards stages whose input can change between attempts of the
+  same run (research for a different topic is recomputed, not reused).
+  A None result is treated as "not done" and never saved.
+- meta.json records the original command line and when the run started;
+  complete.json is written once the run publishes.
+- gc() drops finished runs after a day and any run after max_age_days.
+"""
+
+import json
+import os
+import random
+import shutil
+import time
+from datetime import datetime
+
+
+def _normalise(key):
+    # Tuples come back from JSON as lists; compare like with like.
+    return json.loads(json.dumps(key))
+
+
+class RunCheckpoints:
+    def __init__(self, root, run_id):
+        self.root = root
+        self.run_id = run_id
+        self.directory = os.path.join(root, run_id)
+
+    @classmethod
+    def create(cls, root, argv):
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{random.getrandbits(16):04x}"
+        run = cls(root, run_id)
+        os.makedirs(run.directory, exist_ok=True)
+        run._write("meta", {"argv": list(argv), "started": time.time()})
+        return run
+
+    @classmethod
+    def open(cls, root, run_id):
+        """Open an existing run. "latest" means the newest run, finished or
+        not (replaying a finished one re-renders the same post, e.g. after
+        a failed push), or None when there is none."""
+        if run_id == "latest":
+            runs = list_runs(root)
+            return runs[-1] if runs else None
+        run = cls(root, run_id)
+        if not os.path.exists(run._path("meta")):
+            raise SystemExit(f"--resume: no run {run_id!r} under {root}")
+        return run
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.json")
+
+    def _write(self, name, value):
+        path = self._path(name)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
+
+    @property
+    def meta(self):
+        with open(self._path("meta"), encoding="utf-8") as f:
+            return json.load(f)
+
+    @property
+    def complete(self):
+        return os.path.exists(self._path("complete"))
+
+    def completed_stages(self):
+        return sorted(f[len("stage-"):-len(".json")] for f in os.listdir(self.directory)
+                      if f.startswith("stage-") and f.endswith(".json"))
+
+    def stage(self, name, fn, key=None):
+        path = self._path(f"stage-{name}")
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry["key"] == _normalise(key):
+                print(f"  ♻ {name}: restored from checkpoint ({self.run_id})")
+                return entry["value"]
+        except (OSError, ValueError, KeyError):
+            pass
+        value = fn()
+        if value is not None:
+            self._write(f"stage-{name}", {"key": _normalise(key), "value": value, "saved": time.time()})
+        return value
+
+    def load(self, name):
+        """Value of a finished stage regardless of its key, or None."""
+        try:
+            with open(self._path(f"stage-{name}"), encoding="utf-8") as f:
+                return json.load(f)["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def mark_complete(self):
+        self._write("complete", {"finished": time.time()})
+
+
+def list_runs(root):
+    """All runs under root, oldest first (run IDs start with a timestamp)."""
+    if not os.path.isdir(root):
+        return []
+    return [RunCheckpoints(root, name) for name in sorted(os.listdir(root))
+            if os.path.exists(os.path.join(root, name, "meta.json"))]
+
+
+def gc(root, max_age_days=7, complete_age_days=1):
+    """Delete stale run directories. Returns how many were removed."""
+    now, removed = time.time(), 0
+    for run in list_runs(root):
+        try:
+            age_days = (now - os.path.getmtime(run.directory)) / 86400
+        except OSError:
+            continue
+        if age_days > max_age_days or (run.complete and age_days > complete_age_days):
+            shutil.rmtree(run.directory, ignore_errors=True)
+            removed += 1
+    return removed
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Library of verified study links and YouTube videos, searched before the
+LLM is.
+
+find_relevant_studies() and find_youtube_video() in generate_blog.py ran
+a web-search call for every post and the results went into the page and
+nowhere else, though topics repeat within a category. The library keeps
+them, the way image_catalog.py keeps photos:
+
+- data/source_library.json (committed) has a "studies" section keyed by
+  URL (title, finding) and a "videos" section keyed by video ID (title,
+  channel). Every entry also has tags, a category, the date it was last
+  verified, an expiry date and the posts that used it.
+- Tags are the content words of the entry's own title and finding or
+  channel, never the topic it was found for. Matching is
+  image_catalog.tag_matches() (IDF-weighted shared tags, least-used
+  first) with a higher bar than photos: MIN_SHARED_TAGS.
+- An entry is used as-is until it expires (TTL_DAYS after its last
+  verification: studies move slowly, videos get pulled). After that the
+  generator re-checks it before use, renewing it when it is still
+  there and dropping it on a 404 (or oEmbed 400 / 401).
+- The generator adds what its searches find and verify, and records
+  each published post's studies and video as uses.
+
+`import` seeds the videos from the post source records (data/posts/) and
+CATEGORY_VIDEOS, unverified, so their first use checks them; `search`
+shows what a topic would get.
+
+    python3 scripts/source_library.py import
+    python3 scripts/source_library.py search "Blood pressure at home" --category "Heart Health"
+"""
+
+import argparse
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+from image_catalog import tag_matches, tag_terms
+
+LIBRARY_PATH = os.path.join("data", "source_library.json")
+KINDS = ("studies", "videos")
+TTL_DAYS = {"studies": 90, "videos": 30}
+# The fields each kind keeps besides the bookkeeping ones.
+FIELDS = {"studies": ("title", "finding"), "videos": ("title", "channel")}
+# Shared tags an entry needs to match a topic. A photo needs two; a video
+# or study stands in for a search and puts a claim in the post, and two
+# words ("understanding", "blood") still pair blood work with blood
+# pressure.
+MIN_SHARED_TAGS = 3
+
+
+class SourceLibrary:
+    def __init__(self, path=LIBRARY_PATH):
+        self.path = path
+        self._data = None
+        self._lock = threading.Lock()
+
+    @property
+    def data(self):
+        if self._data is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+            for kind in KINDS:
+                self._data.setdefault(kind, {})
+        return self._data
+
+    def add(self, kind, key, fields, category="", verified=None):
+        """Add a study (key: URL) or video (key: ID), or fill in what its
+        entry lacks. fields holds FIELDS[kind]; values already stored win.
+        Tags come from the entry's own fields only: the topic a search ran
+        for says nothing about what the result covers."""
+        with self._lock:
+            entry = self.data[kind].setdefault(key, {**{f: "" for f in FIELDS[kind]}, "tags": [],
+                                                     "category": "", "verified": "", "expires": "",
+                                                     "uses": []})
+            for f in FIELDS[kind]:
+                entry[f] = entry[f] or fields.get(f, "")
+            entry["tags"] = sorted(tag_terms(" ".join(entry[f] for f in FIELDS[kind])))
+            entry["category"] = entry["category"] or category
+        if verified:
+            self.renew(kind, key, verified)
+        return key
+
+    def renew(self, kind, key, date):
+        """Mark an entry verified on date (YYYY-MM-DD)."""
+        expires = datetime.strptime(date, '%Y-%m-%d') + timedelta(days=TTL_DAYS[kind])
+        with self._lock:
+            entry = self.data[kind].get(key)
+            if entry is not None:
+                entry["verified"], entry["expires"] = date, expires.strftime('%Y-%m-%d')
+
+    def remove(self, kind, key):
+        with self._lock:
+            self.data[kind].pop(key, None)
+
+    def record_use(self, kind, key, filename):
+        with self._lock:
+            entry = self.data[kind].get(key)
+            if entry is not None and filename not in entry["uses"]:
+                entry["uses"].append(filename)
+
+    def match(self, kind, query, category="", k=3, exclude=None):
+        """[(key, entry, current)] for up to k entries that match query,
+        best first; current is False once the entry has expired (or was
+        never verified) and should be re-checked before use. exclude(key)
+        drops entries (e.g. videos recent posts showed)."""
+        today = datetime.now().strftime('%Y-%m-%d')
+        with self._lock:
+            entries = list(self.data[kind].items())
+        return [(key, entry, entry["expires"] >= today)
+                for _, key, entry in tag_matches(query, entries, category, k, exclude, MIN_SHARED_TAGS)]
+
+    def save(self):
+        with self._lock:
+            data = {kind: dict(sorted(self.data[kind].items())) for kind in KINDS}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+                f.write("\n")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # read-only checkout: the next run searches again
+
+
+def main():
+    from generate_blog import CATEGORY_VIDEOS
+    from post_source import load_records
+
+    parser = argparse.ArgumentParser(description="Library of verified study links and videos.")
+    parser.add_argument("command", choices=["import", "search"])
+    parser.add_argument("query", nargs="?", default="", help="search: the post topic")
+    parser.add_argument("--category", default="", help="search: the post category")
+    args = parser.parse_args()
+    library = SourceLibrary()
+
+    if args.command == "search":
+        for kind in KINDS:
+            hits = library.match(kind, args.query, args.category, 5)
+            print(f"{kind}: {len(hits)} match(es) in {len(library.data[kind])}")
+            for key, entry, current in hits:
+                print(f"  {'' if current else '(re-check) '}[{entry['category']}] {entry['title']} — {key}")
+        return
+
+    before = len(library.data["videos"])
+    for name, record in load_records().items():
+        video = record.get("video")
+        if video and video.get("id"):
+            library.add("videos", video["id"], video, record.get("category", ""))
+            library.record_use("videos", video["id"], name)
+    for category, videos in CATEGORY_VIDEOS.items():
+        for video in videos:
+            library.add("videos", video["id"], video, category)
+    library.save()
+    print(f"{LIBRARY_PATH}: {len(library.data['videos']) - before} video(s) added, "
+          f"{len(library.data['videos'])} in total")
+
+
+if __name__ == "__main__":
+    main()
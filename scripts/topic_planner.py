@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Editorial planner: a precomputed schedule of pool topics.
+
+select_unique_topic() in generate_blog.py shuffles TOPIC_CATEGORIES on
+every run and probes topics one at a time against the category cooldown
+and is_duplicate(), then relaxes the cooldown, then gives up to the
+news path, and nobody learns the pool is running low until it has.
+The planner does that work ahead of time:
+
+- plan_schedule() fills the next N slots. Each slot takes a category
+  outside the cooldown window (the last CATEGORY_COOLDOWN_WINDOW posts'
+  and planned slots' categories), preferring the category planned least
+  so far, then the one with the most topics left, so categories stay
+  balanced and the pool lasts as long as it can. Within the category
+  it takes the first topic that duplicates neither a published post nor
+  an earlier slot (is_duplicate(), with planned slots treated as
+  published today, so the strict recent-theme rule applies between
+  them). Planning stops at the first slot no category can fill;
+  "exhausted" then records that the pool has run dry.
+- data/topic_schedule.json (committed, like the post catalog) holds the
+  slots in order. next_topic() hands the generator the first slot that
+  still passes the cooldown and duplicate checks against the corpus as
+  it is now (a news post may have taken its category or story since);
+  normally that is the head, one index lookup. It only reads the file:
+  a batch plans spares it may not use, and a topic whose post is
+  rejected must still be there next run.
+- remove_topics() takes slots out once their posts are published,
+  together with any slot the corpus now duplicates. A slot held back by
+  the cooldown stays.
+
+    python3 scripts/topic_planner.py             # plan PLAN_SLOTS slots
+    python3 scripts/topic_planner.py --slots 40
+    python3 scripts/topic_planner.py --show      # print the schedule
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+from dedup_index import is_duplicate
+
+SCHEDULE_PATH = os.path.join("data", "topic_schedule.json")
+PLAN_SLOTS = 26
+# remove_topics() warns once this few planned slots are left.
+LOW_SCHEDULE_WARNING = 4
+
+
+def topic_slug(topic):
+    """The slug select_unique_topic() checks a pool topic under."""
+    return '-'.join(re.sub(r'[^a-z0-9\s]', '', topic.lower()).split()[:5])
+
+
+def _as_post(td, date):
+    return {"title": td["topic"], "slug": topic_slug(td["topic"]), "filename": "(planned)",
+            "category": td["category"], "date": date}
+
+
+def plan_schedule(pool, existing_posts, slots=PLAN_SLOTS, cooldown=4):
+    """(entries, exhausted): up to `slots` pool topics in publishing order,
+    and whether planning stopped because no category could fill a slot."""
+    today = datetime.now().strftime('%Y-%m-%d')
+    remaining = {}
+    for td in pool:
+        if not is_duplicate(td["topic"], topic_slug(td["topic"]), existing_posts)[0]:
+            remaining.setdefault(td["category"], []).append(td)
+    recent = [p.get('category', '') for p in existing_posts[:cooldown] if p.get('category')]
+    planned, planned_posts, uses = [], [], {}
+    while len(planned) < slots:
+        blocked = set(([td["category"] for td in reversed(planned)] + recent)[:cooldown])
+        order = sorted((c for c in remaining if remaining[c] and c not in blocked),
+                       key=lambda c: (uses.get(c, 0), -len(remaining[c]), c))
+        for category in order:
+            topics = remaining[category]
+            while topics:
+                td = topics.pop(0)
+                if not is_duplicate(td["topic"], topic_slug(td["topic"]), planned_posts)[0]:
+                    break
+            else:
+                continue
+            planned.append({"topic": td["topic"], "keyword": td["keyword"], "category": category})
+            planned_posts.append(_as_post(td, today))
+            uses[category] = uses.get(category, 0) + 1
+            break
+        else:
+            return planned, True
+    return planned, False
+
+
+def load_schedule(path=SCHEDULE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_schedule(schedule, path=SCHEDULE_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(schedule, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def next_topic(existing_posts, cooldown=4, path=SCHEDULE_PATH, skip=()):
+    """The next planned topic dict that is still publishable and not in
+    skip (topics this run already took); None when there is no schedule
+    or no usable slot (the caller falls back to probing the pool). The
+    schedule file is not changed."""
+    schedule = load_schedule(path)
+    if not schedule or not schedule.get("entries"):
+        return None
+    recent = [p.get('category', '') for p in existing_posts[:cooldown] if p.get('category')]
+    for td in schedule["entries"]:
+        if td["topic"] in skip or td["category"] in recent:
+            continue
+        if not is_duplicate(td["topic"], topic_slug(td["topic"]), existing_posts)[0]:
+            return td
+    return None
+
+
+def remove_topics(topics, existing_posts, path=SCHEDULE_PATH):
+    """Take the published topics out of the schedule, and every slot that
+    now duplicates existing_posts (the new posts included). Returns how
+    many slots were removed."""
+    schedule = load_schedule(path)
+    if not schedule or not schedule.get("entries"):
+        return 0
+    keep = []
+    for td in schedule["entries"]:
+        if td["topic"] in topics:
+            continue
+        dup, reason, _ = is_duplicate(td["topic"], topic_slug(td["topic"]), existing_posts)
+        if dup:
+            print(f"  📅 Dropping planned topic {td['topic']!r}: {reason}")
+            continue
+        keep.append(td)
+    removed = len(schedule["entries"]) - len(keep)
+    if not removed:
+        return 0
+    schedule["entries"] = keep
+    save_schedule(schedule, path)
+    left = len(keep)
+    if left <= LOW_SCHEDULE_WARNING:
+        print(f"  ⚠ {left} planned topic(s) left" + (
+            " and the pool is exhausted — add topics or rely on --news" if schedule.get("exhausted")
+            else " — run scripts/topic_planner.py"))
+    return removed
+
+
+def main():
+    from generate_blog import CATEGORY_COOLDOWN_WINDOW, TOPIC_CATEGORIES
+    from post_catalog import load_posts
+
+    parser = argparse.ArgumentParser(description="Plan the next pool topics for the blog generator.")
+    parser.add_argument("--slots", type=int, default=PLAN_SLOTS, help=f"slots to plan (default {PLAN_SLOTS})")
+    parser.add_argument("--show", action="store_true", help="print the current schedule and exit")
+    args = parser.parse_args()
+    if args.show:
+        schedule = load_schedule() or {}
+        for n, td in enumerate(schedule.get("entries", []), 1):
+            print(f"  {n:3}. [{td['category']}] {td['topic']}")
+        print(f"{len(schedule.get('entries', []))} slot(s) planned"
+              + (" — pool exhausted after these" if schedule.get("exhausted") else ""))
+        return
+    if not os.path.isdir("blog"):
+        print("❌ blog/ not found — run from repo root.")
+        sys.exit(1)
+    existing = load_posts()
+    entries, exhausted = plan_schedule(TOPIC_CATEGORIES, existing, args.slots, CATEGORY_COOLDOWN_WINDOW)
+    save_schedule({"planned": datetime.now().strftime('%Y-%m-%d'), "posts": len(existing),
+                   "exhausted": exhausted, "entries": entries})
+    for n, td in enumerate(entries, 1):
+        print(f"  {n:3}. [{td['category']}] {td['topic']}")
+    print(f"{SCHEDULE_PATH}: {len(entries)} of {args.slots} slot(s) planned")
+    if exhausted:
+        print(f"⚠ The topic pool runs dry after {len(entries)} more pool post(s).")
+
+
+if __name__ == "__main__":
+    main()
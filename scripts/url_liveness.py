@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+URL liveness checks for generate_blog.py: cached, pooled, batched.
+
+unsplash_url_is_live() and verify_youtube_video() each opened a new
+urllib connection (fresh DNS + TLS) per URL with a 10 s timeout, and
+find_unsplash_images() checked its candidates one after another, so a
+slow network made verification alone take minutes. The same photo IDs
+were checked again on every run.
+
+- Verdicts are LIVE (2xx / 3xx), DEAD (a status the caller names as
+  proof the resource is gone: 404 for Unsplash photos, 400 / 401 / 404
+  for YouTube oEmbed) or INCONCLUSIVE (other statuses, timeouts, DNS and
+  proxy failures). Callers keep their old rule: only DEAD rejects.
+- LivenessChecker.check_many() answers what it can from an on-disk
+  cache (.cache/url_liveness.json, TTL per verdict; inconclusive
+  results are never stored) and checks the rest concurrently, so a
+  batch costs about one round trip. Requests go over keep-alive
+  http.client connections, pooled per host, with at most max_per_host
+  in flight to any one host.
+- read=False skips cache lookups (--refresh); read=write=False turns the
+  cache off (--no-cache), like the LLM response cache.
+"""
+
+import http.client
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+LIVE, DEAD, INCONCLUSIVE = "live", "dead", "inconclusive"
+DAY = 24 * 3600
+DEFAULT_TTLS = {LIVE: 7 * DAY, DEAD: 30 * DAY}
+MAX_PER_HOST = 6
+REQUEST_TIMEOUT = 10
+_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+class _HostPool:
+    """Idle keep-alive connections to one host, and a cap on how many
+    requests to it run at once."""
+
+    def __init__(self, scheme, host, limit, timeout):
+        self._cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        self.host, self.timeout = host, timeout
+        self._slots = threading.BoundedSemaphore(limit)
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def request(self, method, path):
+        """Status code of one request. A reused connection the server has
+        since closed is retried once on a fresh one."""
+        with self._slots:
+            for attempt in range(2):
+                with self._lock:
+                    conn = self._idle.pop() if self._idle else None
+                reused = conn is not None
+                if conn is None:
+                    conn = self._cls(self.host, timeout=self.timeout)
+                try:
+                    conn.request(method, path, headers=_HEADERS)
+                    resp = conn.getresponse()
+                    resp.read()
+                except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                    conn.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except Exception:
+                    conn.close()
+                    raise
+                if resp.will_close:
+                    conn.close()
+                else:
+                    with self._lock:
+                        self._idle.append(conn)
+                return resp.status
+
+
+class LivenessChecker:
+    def __init__(self, path, ttls=None, max_per_host=MAX_PER_HOST, timeout=REQUEST_TIMEOUT):
+        self.path = path
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.read = self.write = True
+        self.cached = self.fetched = 0
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._data = None
+
+    def configure(self, read=True, write=True):
+        self.read, self.write = read, write
+
+    def _load(self):
+        if self._data is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def _save(self):
+        now = time.time()
+        data = {url: (verdict, at) for url, (verdict, at) in self._data.items()
+                if now - at < self.ttls.get(verdict, 0)}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # read-only checkout: nothing is cached
+
+    def _pool(self, scheme, host):
+        with self._lock:
+            pool = self._pools.get((scheme, host))
+            if pool is None:
+                pool = self._pools[(scheme, host)] = _HostPool(scheme, host, self.max_per_host, self.timeout)
+            return pool
+
+    def _fetch(self, url, method, dead_statuses):
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        try:
+            status = self._pool(parts.scheme, parts.netloc).request(method, path)
+        except Exception:
+            return INCONCLUSIVE
+        if 200 <= status < 400:
+            return LIVE
+        return DEAD if status in dead_statuses else INCONCLUSIVE
+
+    def check_many(self, urls, method="HEAD", dead_statuses=(404,)):
+        """{url: verdict} for every URL, from the cache where possible and
+        concurrently for the rest."""
+        urls = list(dict.fromkeys(u for u in urls if u))
+        verdicts, todo = {}, []
+        now = time.time()
+        with self._lock:
+            data = self._load() if self.read else {}
+            for url in urls:
+                verdict, at = data.get(url, (None, 0))
+                if verdict and now - at < self.ttls.get(verdict, 0):
+                    verdicts[url] = verdict
+                else:
+                    todo.append(url)
+            self.cached += len(verdicts)
+            self.fetched += len(todo)
+        if not todo:
+            return verdicts
+        hosts = {urlsplit(u).netloc for u in todo}
+        with ThreadPoolExecutor(max_workers=min(len(todo), self.max_per_host * len(hosts))) as pool:
+            for url, verdict in zip(todo, pool.map(lambda u: self._fetch(u, method, dead_statuses), todo)):
+                verdicts[url] = verdict
+        if self.write:
+            with self._lock:
+                data = self._load()
+                for url in todo:
+                    if verdicts[url] in self.ttls:
+                        data[url] = (verdicts[url], now)
+                self._save()
+        return verdicts
+
+    def check(self, url, method="HEAD", dead_statuses=(404,)):
+        return self.check_many([url], method, dead_statuses).get(url, INCONCLUSIVE)